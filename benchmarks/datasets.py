@@ -0,0 +1,61 @@
+"""
+Seeded, realistic looking version datasets for the benchmarks.
+
+Real version histories are dominated by plain X.Y.Z releases with small
+major and minor numbers, a sprinkling of pre-releases and the odd build
+metadata, the generators here follow that shape so the benchmarks
+exercise the same paths real data does.
+"""
+
+from __future__ import annotations
+
+import random
+
+from madonna import Version
+
+SEED = 20240101
+
+PRERELEASES = ("alpha", "alpha.1", "alpha.2", "beta", "beta.2", "beta.11", "rc.1", "rc.2", "rc.10", "dev.20240101")
+BUILDS = ("build.1", "build.123", "sha.5114f85", "20130313144700", "exp.sha.5114f85")
+
+
+def _fields(
+    rng: random.Random, prerelease_rate: float, build_rate: float
+) -> tuple[int, int, int, str | None, str | None]:
+    """
+    Draw one version's fields.
+    """
+    major = min(int(rng.expovariate(0.7)), 40)
+    minor = min(int(rng.expovariate(0.15)), 120)
+    patch = min(int(rng.expovariate(0.2)), 300)
+    prerelease = rng.choice(PRERELEASES) if rng.random() < prerelease_rate else None
+    build = rng.choice(BUILDS) if rng.random() < build_rate else None
+    return major, minor, patch, prerelease, build
+
+
+def versions(n: int, *, prerelease_rate: float = 0.15, build_rate: float = 0.05, seed: int = SEED) -> list[Version]:
+    """
+    Generate `n` versions with the given share of pre-releases and
+    build metadata.
+    """
+    rng = random.Random(seed)
+    return [Version(*_fields(rng, prerelease_rate, build_rate)) for _ in range(n)]
+
+
+def simple_strings(n: int, *, seed: int = SEED) -> list[str]:
+    """
+    Generate `n` plain 'X.Y.Z' strings, half of them with a 'v' prefix.
+    """
+    rng = random.Random(seed)
+    return [
+        ("v" if rng.random() < 0.5 else "") + f"{major}.{minor}.{patch}"
+        for major, minor, patch, _, _ in (_fields(rng, 0, 0) for _ in range(n))
+    ]
+
+
+def complex_strings(n: int, *, seed: int = SEED) -> list[str]:
+    """
+    Generate `n` strings that all have a pre-release and most
+    of which have build metadata too.
+    """
+    return [version.to_string() for version in versions(n, prerelease_rate=1, build_rate=0.7, seed=seed)]
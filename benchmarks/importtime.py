@@ -0,0 +1,107 @@
+"""
+Benchmark for the time it takes to `import madonna`.
+
+Runs `python -X importtime -c "import madonna"` in a fresh interpreter
+`--repeat` times and reports the best cumulative import time of the
+package, along with the modules it pulled in that took the longest.
+
+Python's own startup imports (site, encodings etc.) happen before the
+package is imported and are excluded, so the number is what
+`import madonna` adds to a program's cold start.
+
+- `--max-ms MS` exits with status 1 if the best import time is over
+    MS milliseconds, to keep it in check in CI.
+- `--import STATEMENT` times something other than `import madonna`,
+    e.g. `--import "from madonna import parse_many"`.
+
+Run with `hatch run bench:importtime` or `python benchmarks/importtime.py`,
+see `--help` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+class Timing(NamedTuple):
+    """
+    One line of `-X importtime` output, the times are in microseconds.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(statement: str) -> list[Timing]:
+    """
+    Run `statement` in a fresh interpreter and return the modules it
+    imported, in the order `-X importtime` reports them.
+    """
+    # Fall back to the source tree when madonna isn't installed
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))}
+
+    # Flush everything imported at startup first, so only the lines
+    # after the marker belong to the statement
+    code = f"import sys; sys.stderr.write('--\\n'); sys.stderr.flush(); {statement}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+
+    timings = []
+    _, _, output = result.stderr.partition("--\n")
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # The header line
+            continue
+        # Drop the space after the '|', leaving the indent that shows nesting
+        timings.append(Timing(module[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def total(timings: list[Timing]) -> int:
+    """
+    Return the cumulative time of the top level imports in microseconds.
+    """
+    # Nested imports are indented, their time is already in their parent's
+    return sum(timing.cumulative_us for timing in timings if not timing.module.startswith(" "))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the import time benchmark, returns the process exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import", dest="statement", default="import madonna", help="the import statement to time")
+    parser.add_argument("--repeat", type=int, default=10, help="runs, the best is kept (default 10)")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list (default 10)")
+    parser.add_argument("--max-ms", type=float, help="fail if the import takes longer than this")
+    args = parser.parse_args(argv)
+
+    best = min((measure(args.statement) for _ in range(args.repeat)), key=total)
+    best_ms = total(best) / 1000
+
+    print(f"{args.statement!r}: {best_ms:.2f}ms, {len(best)} modules imported (best of {args.repeat})\n")
+    print(f"{'module':<48} {'self ms':>8} {'cumulative ms':>14}")
+    for timing in sorted(best, key=lambda timing: timing.self_us, reverse=True)[: args.top]:
+        print(f"{timing.module.strip():<48} {timing.self_us / 1000:>8.2f} {timing.cumulative_us / 1000:>14.2f}")
+
+    if args.max_ms is not None and best_ms > args.max_ms:
+        print(f"\n{args.statement!r} took {best_ms:.2f}ms, over the {args.max_ms}ms limit")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
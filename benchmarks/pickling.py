@@ -0,0 +1,71 @@
+"""
+Benchmark for pickling versions.
+
+Compares the compact `Version.__reduce__` against the generic `__slots__`
+state pickling `Version` fell back to before it had one, in pickle size
+and in the time to dump and load a list of versions, for plain versions
+and versions with pre-release and build metadata.
+
+Run with `hatch run bench:pickling` or `python benchmarks/pickling.py`.
+"""
+
+from __future__ import annotations
+
+import pickle
+import timeit
+
+import datasets
+
+from madonna import Version
+
+SIZE = 100_000
+REPEAT = 5
+
+
+class SlotStateVersion(Version):
+    """
+    A Version pickled the generic way, by its class and all its slots.
+    """
+
+    __slots__ = ()
+    # Has to be object's own __reduce__, not a wrapper with Version's
+    # signature, for pickle to fall back to the class and slots
+    __reduce__ = object.__reduce__  # type: ignore[assignment]
+
+
+def best(stmt: str, namespace: dict[str, object]) -> float:
+    """
+    Return the best time of `stmt` in seconds.
+    """
+    return min(timeit.repeat(stmt, globals=namespace, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    """
+    Run the pickling benchmarks and print a table of results.
+    """
+    datasets_by_name = {
+        "plain": datasets.versions(SIZE, prerelease_rate=0, build_rate=0),
+        "pre-release+build": datasets.versions(SIZE, prerelease_rate=1, build_rate=1),
+    }
+
+    print(f"{'dataset':<18} {'pickling':<10} {'bytes/version':>14} {'dumps us':>9} {'loads us':>9}")
+    for name, versions in datasets_by_name.items():
+        generic = [SlotStateVersion(*version.to_tuple()) for version in versions]
+        # Hashed, as versions that have been in a set or dict will be
+        for version in (*versions, *generic):
+            hash(version)
+
+        for label, data in (("slots", generic), ("compact", versions)):
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            assert pickle.loads(blob) == data
+
+            namespace: dict[str, object] = {"pickle": pickle, "data": data, "blob": blob}
+            size = len(blob) / SIZE
+            dumps = best("pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)", namespace) / SIZE * 1e6
+            loads = best("pickle.loads(blob)", namespace) / SIZE * 1e6
+            print(f"{name:<18} {label:<10} {size:>14.1f} {dumps:>9.2f} {loads:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
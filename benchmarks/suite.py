@@ -0,0 +1,316 @@
+"""
+Benchmark suite for the hot paths of `Version`.
+
+Covers parsing simple and complex strings, every rich comparison plus
+`compare`, sorting 10^5 and 10^6 versions with `sorted()` and with
+`sort_versions`, picking the top few or the latest of each release line
+out of 10^5, building sets (which is all `__hash__`), diffing two
+snapshots with `set` and with `VersionSet` and the dict/JSON round trips,
+on the seeded datasets in `datasets.py`.
+
+Each case is timed `--repeat` times and the best run is reported per
+operation (per string parsed, per comparison, per sort etc.), then:
+
+- `--save FILE` writes the results out as a JSON baseline.
+- `--compare FILE` checks the results against a saved baseline and
+    exits with status 1 if any case got slower by more than
+    `--threshold` (10% by default).
+
+Run with `hatch run bench:suite` or `python benchmarks/suite.py`, see
+`--help` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import io
+import json
+import operator
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import datasets
+
+import madonna
+from madonna import LazyVersion, Version, compare
+
+# Items per batch for the per-item cases
+BATCH = 20_000
+
+
+class Case(NamedTuple):
+    """
+    A benchmark case.
+
+    `make` builds a fresh zero argument callable for each run so cases
+    can start from cold state, and `ops` is the number of operations
+    one call of it performs.
+    """
+
+    name: str
+    make: Callable[[], Callable[[], object]]
+    ops: int
+    large: bool = False
+
+
+def _parse_cases() -> list[Case]:
+    simple = datasets.simple_strings(BATCH)
+    complex_ = datasets.complex_strings(BATCH)
+    from_string = Version.from_string
+    return [
+        Case("parse/simple", lambda: lambda: list(map(from_string, simple)), BATCH),
+        Case("parse/complex", lambda: lambda: list(map(from_string, complex_)), BATCH),
+        Case("parse/lazy passthrough", lambda: lambda: [str(LazyVersion(string)) for string in complex_], BATCH),
+        Case("validate/simple", lambda: lambda: madonna.validate_many(simple), BATCH),
+        Case("validate/complex", lambda: lambda: madonna.validate_many(complex_), BATCH),
+    ]
+
+
+def _compare_cases() -> list[Case]:
+    # Neighbouring pairs of a sorted dataset, so most pairs share a
+    # prefix and the comparison has to look past the major version
+    ordered = sorted(datasets.versions(BATCH + 1), key=Version.sort_key)
+    left, right = ordered[:-1], ordered[1:]
+    operators: dict[str, Callable[[Version, Version], object]] = {
+        "eq": operator.eq,
+        "ne": operator.ne,
+        "lt": operator.lt,
+        "le": operator.le,
+        "gt": operator.gt,
+        "ge": operator.ge,
+        "compare": compare,
+    }
+    return [
+        Case(f"compare/{name}", functools.partial(lambda op: lambda: list(map(op, left, right)), op), BATCH)
+        for name, op in operators.items()
+    ]
+
+
+def _sort_cases() -> list[Case]:
+    versions = datasets.versions(100_000)
+
+    def large() -> Callable[[], object]:
+        # Only generated when the large cases are asked for
+        data = _large_versions()
+        return lambda: sorted(data)
+
+    def large_sort_versions() -> Callable[[], object]:
+        data = _large_versions()
+        return lambda: madonna.sort_versions(data)
+
+    return [
+        Case("sort/100000", lambda: lambda: sorted(versions), 1),
+        Case("sort/100000 key=sort_key", lambda: lambda: sorted(versions, key=Version.sort_key), 1),
+        Case("sort/100000 cmp_to_key(compare)", lambda: lambda: sorted(versions, key=functools.cmp_to_key(compare)), 1),
+        Case("sort/100000 sort_versions", lambda: lambda: madonna.sort_versions(versions), 1),
+        Case("sort/1000000", large, 1, large=True),
+        Case("sort/1000000 sort_versions", large_sort_versions, 1, large=True),
+    ]
+
+
+def _select_cases() -> list[Case]:
+    versions = datasets.versions(100_000)
+    return [
+        Case("select/sorted[-5:]", lambda: lambda: sorted(versions)[-5:], 1),
+        Case("select/nlargest 5", lambda: lambda: madonna.nlargest(5, versions), 1),
+        Case("select/nsmallest 5", lambda: lambda: madonna.nsmallest(5, versions), 1),
+        Case("select/latest_by major", lambda: lambda: madonna.latest_by(versions), 1),
+        Case("select/latest_by minor", lambda: lambda: madonna.latest_by(versions, "minor"), 1),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _large_versions() -> list[Version]:
+    return datasets.versions(1_000_000)
+
+
+def _hash_cases() -> list[Case]:
+    fields = [version.to_tuple() for version in datasets.versions(BATCH)]
+    warm = [Version(*field) for field in fields]
+    for version in warm:
+        hash(version)
+
+    def cold() -> Callable[[], object]:
+        # Fresh objects, so nothing is hashed yet
+        versions = [Version(*field) for field in fields]
+        return lambda: set(versions)
+
+    return [
+        Case("hash/set cold", cold, BATCH),
+        Case("hash/set warm", lambda: lambda: set(warm), BATCH),
+    ]
+
+
+def _set_cases() -> list[Case]:
+    # Two snapshots of a registry, a tenth of the versions replaced between them
+    old = [version.to_tuple() for version in datasets.versions(BATCH)]
+    new = old[BATCH // 10 :] + [version.to_tuple() for version in datasets.versions(BATCH // 10, seed=1)]
+
+    def diff(make_set: Callable[[list[Version]], Any]) -> Callable[[], Callable[[], object]]:
+        def make() -> Callable[[], object]:
+            # Each snapshot parsed separately, so fresh unhashed objects
+            before = [Version(*field) for field in old]
+            after = [Version(*field) for field in new]
+
+            def fn() -> object:
+                a, b = make_set(before), make_set(after)
+                return b - a, a - b
+
+            return fn
+
+        return make
+
+    return [
+        Case("set/diff set()", diff(set), BATCH),
+        Case("set/diff VersionSet", diff(madonna.VersionSet), BATCH),
+    ]
+
+
+def _serialise_cases() -> list[Case]:
+    versions = datasets.versions(BATCH, prerelease_rate=0.3, build_rate=0.3)
+    dicts = [version.to_dict() for version in versions]
+    jsons = [version.to_json() for version in versions]
+    blobs = [version.to_bytes() for version in versions]
+    packed = madonna.pack_many(versions)
+    ndjson = io.StringIO()
+    madonna.dump_many(versions, ndjson)
+    return [
+        Case("serialise/to_dict", lambda: lambda: [version.to_dict() for version in versions], BATCH),
+        Case("serialise/from_dict", lambda: lambda: list(map(Version.from_dict, dicts)), BATCH),
+        Case("serialise/to_json", lambda: lambda: [version.to_json() for version in versions], BATCH),
+        Case("serialise/from_json", lambda: lambda: list(map(Version.from_json, jsons)), BATCH),
+        Case(
+            "serialise/json round trip",
+            lambda: lambda: [Version.from_json(version.to_json()) for version in versions],
+            BATCH,
+        ),
+        Case("serialise/to_bytes", lambda: lambda: [version.to_bytes() for version in versions], BATCH),
+        Case("serialise/from_bytes", lambda: lambda: list(map(Version.from_bytes, blobs)), BATCH),
+        Case("serialise/pack_many", lambda: lambda: madonna.pack_many(versions), BATCH),
+        Case("serialise/unpack_many", lambda: lambda: madonna.unpack_many(packed), BATCH),
+        Case("serialise/dump_many", lambda: lambda: madonna.dump_many(versions, io.StringIO()), BATCH),
+        Case(
+            "serialise/iter_load",
+            lambda: lambda: list(madonna.iter_load(io.StringIO(ndjson.getvalue()))),
+            BATCH,
+        ),
+    ]
+
+
+def cases() -> list[Case]:
+    """
+    Build every benchmark case.
+    """
+    return [
+        *_parse_cases(),
+        *_compare_cases(),
+        *_sort_cases(),
+        *_select_cases(),
+        *_hash_cases(),
+        *_set_cases(),
+        *_serialise_cases(),
+    ]
+
+
+def run(case: Case, repeat: int) -> float:
+    """
+    Return the best time per operation of a case in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        fn = case.make()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) / case.ops
+
+
+def human(seconds: float) -> str:
+    """
+    Format a time per operation with a sensible unit.
+    """
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def check(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    Print each case against the baseline and return the names of
+    the cases that regressed by more than `threshold`.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name:<36} {human(seconds)}   (not in baseline)")
+            continue
+        ratio = seconds / baseline[name]
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = ""
+        print(f"{name:<36} {human(seconds)}   {human(baseline[name])}   {ratio:5.2f}x {status}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmark suite, returns the process exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the best is kept (default 5)")
+    parser.add_argument("--large", action="store_true", help="also run the 10^6 version cases")
+    parser.add_argument("--save", type=Path, metavar="FILE", help="save the results as a baseline")
+    parser.add_argument("--compare", type=Path, metavar="FILE", help="compare the results against a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="slowdown flagged as a regression (default 0.1, 10%%)"
+    )
+    args = parser.parse_args(argv)
+
+    # Make sure parsing is measured without the optional cache
+    madonna.set_cache_size(0)
+
+    results: dict[str, float] = {}
+    for case in cases():
+        if args.filter not in case.name or (case.large and not args.large):
+            continue
+        results[case.name] = run(case, args.repeat)
+        if args.compare is None:
+            print(f"{case.name:<36} {human(results[case.name])}/op")
+
+    if args.save is not None:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "madonna": madonna.__version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        print(f"{'case':<36} {'current':>11}   {'baseline':>11}")
+        regressions = check(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
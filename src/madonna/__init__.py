@@ -4,9 +4,113 @@ Python semver parsing library.
 
 from __future__ import annotations
 
-from madonna.version import Version
+import importlib
+from typing import TYPE_CHECKING
+
+from madonna.version import (
+    CacheInfo,
+    LazyVersion,
+    Version,
+    cache_clear,
+    cache_info,
+    compare,
+    is_valid_string,
+    set_cache_size,
+    validate_many,
+)
+
+if TYPE_CHECKING:
+    from madonna import git as git
+    from madonna import instrument as instrument
+    from madonna.binary import iter_unpack, pack_many, unpack_many
+    from madonna.columnar import VersionArray
+    from madonna.extract import scan
+    from madonna.index import VersionIndex
+    from madonna.jsonstream import dump_many, iter_load
+    from madonna.parallel import ParseResult, parse_many
+    from madonna.range import Range
+    from madonna.selection import latest_by, nlargest, nsmallest
+    from madonna.sort import sort_versions
+    from madonna.store import VersionStore, write_store
+    from madonna.versionset import VersionSet
 
 __version__ = "0.2.0"
 
+# Everything outside of madonna.version is imported on first use, so that
+# `import madonna` only pays for what it needs e.g. not for
+# concurrent.futures unless parse_many is actually used
+_LAZY = {
+    "ParseResult": "madonna.parallel",
+    "Range": "madonna.range",
+    "VersionArray": "madonna.columnar",
+    "VersionIndex": "madonna.index",
+    "VersionSet": "madonna.versionset",
+    "VersionStore": "madonna.store",
+    "dump_many": "madonna.jsonstream",
+    "iter_load": "madonna.jsonstream",
+    "iter_unpack": "madonna.binary",
+    "latest_by": "madonna.selection",
+    "nlargest": "madonna.selection",
+    "nsmallest": "madonna.selection",
+    "pack_many": "madonna.binary",
+    "parse_many": "madonna.parallel",
+    "scan": "madonna.extract",
+    "sort_versions": "madonna.sort",
+    "unpack_many": "madonna.binary",
+    "write_store": "madonna.store",
+}
+
+# Submodules used through their namespace e.g. madonna.git.latest_tag(...),
+# available on first use without importing them explicitly
+_SUBMODULES = ("git", "instrument")
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        # Importing it sets it as an attribute of the package
+        return importlib.import_module(f"{__name__}.{name}")
+
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module), name)
+    # Only looked up once, from then on it's a plain module attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY, *_SUBMODULES})
+
 
-__all__ = ("Version",)
+__all__ = (
+    "CacheInfo",
+    "LazyVersion",
+    "ParseResult",
+    "Range",
+    "Version",
+    "VersionArray",
+    "VersionIndex",
+    "VersionSet",
+    "VersionStore",
+    "cache_clear",
+    "cache_info",
+    "compare",
+    "dump_many",
+    "is_valid_string",
+    "iter_load",
+    "iter_unpack",
+    "latest_by",
+    "nlargest",
+    "nsmallest",
+    "pack_many",
+    "parse_many",
+    "scan",
+    "set_cache_size",
+    "sort_versions",
+    "unpack_many",
+    "validate_many",
+    "write_store",
+)
@@ -0,0 +1,120 @@
+"""
+Bulk binary encoding of many versions at once.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Iterator
+
+from madonna.version import BytesLike, Version, _unpack_from
+
+# Magic bytes and the number of versions that follow, each one
+# encoded as by Version.to_bytes
+_MAGIC = b"MDV\x01"
+_MANY_HEADER = struct.Struct("<4sQ")
+
+
+def pack_many(versions: Iterable[Version]) -> bytes:
+    """
+    Encode many versions into a single compact binary blob.
+
+    The blob is a small header (magic bytes and the number of versions)
+    followed by each version encoded as by `Version.to_bytes`, typically
+    28 bytes for a plain version, less than half the size of its JSON.
+
+    Args:
+        versions (Iterable[Version]): The versions to encode.
+
+    Returns:
+        bytes: The encoded versions.
+
+    Raises:
+        OverflowError: If a version cannot be encoded, see `Version.to_bytes`.
+
+    Examples:
+    ```python
+    >>> data = pack_many([Version(1, 2, 4), Version(1, 3, 0, "rc.1")])
+    >>> len(data)
+    72
+    >>> [str(v) for v in unpack_many(data)]
+    ['v1.2.4', 'v1.3.0-rc.1']
+
+    ```
+
+    """
+    return _pack_records([version.to_bytes() for version in versions])
+
+
+def _pack_records(records: list[bytes]) -> bytes:
+    """
+    Join versions already encoded with `Version.to_bytes` into a blob.
+    """
+    return _MANY_HEADER.pack(_MAGIC, len(records)) + b"".join(records)
+
+
+def iter_unpack(data: BytesLike) -> Iterator[Version]:
+    """
+    Lazily decode the versions in a blob made by `pack_many`.
+
+    The data is read in place through a memoryview so nothing is copied,
+    which makes this a good fit for an `mmap` of a large file.
+
+    Args:
+        data (BytesLike): The encoded versions, as bytes, a bytearray,
+            a memoryview or an mmap.
+
+    Yields:
+        Version: The decoded versions, in the order they were packed.
+
+    Raises:
+        ValueError: If `data` is not a valid blob of versions.
+
+    Examples:
+    ```python
+    >>> data = pack_many(Version(1, minor, 0) for minor in range(3))
+    >>> [str(v) for v in iter_unpack(data)]
+    ['v1.0.0', 'v1.1.0', 'v1.2.0']
+
+    ```
+
+    """
+    view = memoryview(data).cast("B")
+    try:
+        magic, count = _MANY_HEADER.unpack_from(view)
+    except struct.error:
+        raise ValueError("Truncated header, not a blob of versions") from None
+    if magic != _MAGIC:
+        raise ValueError(f"Bad magic bytes {magic!r}, not a blob of versions")
+
+    offset = _MANY_HEADER.size
+    for _ in range(count):
+        version, offset = _unpack_from(view, offset)
+        yield version
+
+    if offset != len(view):
+        raise ValueError(f"{len(view) - offset} unexpected trailing bytes after {count} versions")
+
+
+def unpack_many(data: BytesLike) -> list[Version]:
+    """
+    Decode all the versions in a blob made by `pack_many`.
+
+    Args:
+        data (BytesLike): The encoded versions, see `iter_unpack`.
+
+    Returns:
+        list[Version]: The decoded versions, in the order they were packed.
+
+    Raises:
+        ValueError: If `data` is not a valid blob of versions.
+
+    Examples:
+    ```python
+    >>> unpack_many(pack_many([Version(0, 7, 6, None, "build.1")]))
+    [Version(major=0, minor=7, patch=6, prerelease=None, buildmetadata='build.1')]
+
+    ```
+
+    """
+    return list(iter_unpack(data))
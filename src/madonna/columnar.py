@@ -0,0 +1,468 @@
+"""
+Columnar storage for very large collections of versions.
+"""
+
+from __future__ import annotations
+
+import bisect
+import operator
+import sys
+from array import array
+from itertools import repeat
+from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, overload
+
+from madonna.version import _ABSENT, IdentifiersKey, Version
+
+# Unsigned 64 bit, the numeric version parts live in these
+_TYPECODE = "Q"
+
+# Unsigned int, for the pre-release/build ranks
+_RANK_TYPECODE = "I"
+
+_BACKENDS = ("array", "numpy")
+
+# A stdlib array, numpy ndarray or, for ranks, an iterable of ints
+Column = Any
+
+# Either a list of bools or, with the numpy backend, a boolean ndarray
+Mask = Any
+
+# Either a list of ints or, with the numpy backend, an integer ndarray
+Indices = Any
+
+# The pre-release and build rank columns (None if no version has one), plus
+# the sorted distinct keys each rank refers to
+_Ranks = Tuple[Optional[Column], Optional[Column], List[IdentifiersKey], List[IdentifiersKey]]
+
+
+def _numpy() -> ModuleType:
+    """
+    Import and return numpy, which is only needed for the
+    numpy backend.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("The 'numpy' backend requires numpy, install it with `pip install madonna[numpy]`") from None
+    return numpy
+
+
+def _scalar_rank(distinct: list[IdentifiersKey], key: IdentifiersKey) -> int:
+    """
+    Rank a single pre-release or build key against the sorted
+    distinct keys of an array.
+
+    Array ranks are doubled so a key that is not in the array
+    gets the odd rank between its neighbours.
+    """
+    index = bisect.bisect_left(distinct, key)
+    if index < len(distinct) and distinct[index] == key:
+        return 2 * index
+    return 2 * index - 1
+
+
+class VersionArray:
+    """
+    A compact, columnar array of versions.
+    """
+
+    __slots__ = (
+        "_backend",
+        "_build",
+        "_build_keys",
+        "_major",
+        "_minor",
+        "_patch",
+        "_pre",
+        "_pre_keys",
+        "_ranks",
+    )
+
+    def __init__(self, versions: Iterable[Version] = (), *, backend: str = "array") -> None:
+        """
+        Store versions column by column rather than as a list of objects.
+
+        The major, minor and patch versions are packed into unsigned 64 bit
+        integer arrays and the (usually rare) pre-release and build metadata
+        strings are kept in side tables keyed by position, so an array costs
+        roughly 24 bytes per version instead of a whole `Version` object.
+
+        `Version` objects are only built on demand when indexing or iterating,
+        comparisons, sorting, `min` and `max` all work on the columns directly.
+
+        Args:
+            versions (Iterable[Version]): The versions to store.
+                Defaults to an empty array.
+            backend (str, optional): Either 'array' for the standard library
+                `array` module or 'numpy' to back the columns with numpy
+                arrays and vectorise the operations. Defaults to 'array'.
+
+        Raises:
+            ValueError: If `backend` is not a known backend.
+            ImportError: If the 'numpy' backend is requested but numpy is
+                not installed.
+            OverflowError: If a numeric version part does not fit in 64 bits.
+
+        Examples:
+        ```python
+        >>> arr = VersionArray([Version(1, 2, 4), Version(1, 2, 4, "rc.1"), Version(0, 7, 6)])
+        >>> len(arr)
+        3
+        >>> arr[1]
+        Version(major=1, minor=2, patch=4, prerelease='rc.1', buildmetadata=None)
+
+        ```
+
+        """
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, must be one of {_BACKENDS}")
+
+        major = array(_TYPECODE)
+        minor = array(_TYPECODE)
+        patch = array(_TYPECODE)
+        pre: dict[int, str] = {}
+        build: dict[int, str] = {}
+        pre_keys: dict[int, IdentifiersKey] = {}
+        build_keys: dict[int, IdentifiersKey] = {}
+
+        for index, version in enumerate(versions):
+            key = version._key
+            major.append(key[0])
+            minor.append(key[1])
+            patch.append(key[2])
+            if version._prerelease is not None:
+                # Interned as the same few pre-releases tend to repeat a lot
+                pre[index] = sys.intern(version._prerelease)
+                pre_keys[index] = key[3]
+            if version._buildmetadata is not None:
+                build[index] = sys.intern(version._buildmetadata)
+                build_keys[index] = key[4]
+
+        if backend == "numpy":
+            np = _numpy()
+            columns = tuple(np.frombuffer(column, dtype=np.uint64) for column in (major, minor, patch))
+        else:
+            columns = (major, minor, patch)
+
+        self._backend = backend
+        self._major, self._minor, self._patch = columns
+        self._pre = pre
+        self._build = build
+        self._pre_keys = pre_keys
+        self._build_keys = build_keys
+        self._ranks: _Ranks | None = None
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str], *, backend: str = "array") -> VersionArray:
+        """
+        Construct a `VersionArray` by parsing semver strings.
+
+        Args:
+            strings (Iterable[str]): The semver strings.
+            backend (str, optional): The backend to use, see `VersionArray`.
+                Defaults to 'array'.
+
+        Raises:
+            ValueError: If any string is not a valid semver string.
+
+        Returns:
+            VersionArray: The constructed VersionArray.
+
+        Examples:
+        ```python
+        >>> arr = VersionArray.from_strings(["v1.2.4", "v0.7.6-rc.1"])
+        >>> [str(v) for v in arr]
+        ['v1.2.4', 'v0.7.6-rc.1']
+
+        ```
+
+        """
+        return cls((Version.from_string(string) for string in strings), backend=backend)
+
+    @property
+    def backend(self) -> str:
+        """
+        The backend storing the columns, 'array' or 'numpy'.
+        """
+        return self._backend
+
+    def __len__(self) -> int:
+        return len(self._major)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(<{len(self)} versions>, backend={self._backend!r})"
+
+    def _version(self, index: int) -> Version:
+        """
+        Materialise the `Version` at a (non-negative) index.
+        """
+        return Version(
+            int(self._major[index]),
+            int(self._minor[index]),
+            int(self._patch[index]),
+            self._pre.get(index),
+            self._build.get(index),
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Version: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> VersionArray: ...
+
+    def __getitem__(self, index: int | slice) -> Version | VersionArray:
+        if isinstance(index, slice):
+            return self._take(index)
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"VersionArray index out of range: {index}")
+
+        return self._version(index)
+
+    def __iter__(self) -> Iterator[Version]:
+        for index in range(len(self)):
+            yield self._version(index)
+
+    def _take(self, index: slice) -> VersionArray:
+        """
+        Return a new array of the versions in a slice, without
+        materialising any of them.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new._backend = self._backend
+        new._major = self._major[index]
+        new._minor = self._minor[index]
+        new._patch = self._patch[index]
+
+        new._pre = {}
+        new._build = {}
+        new._pre_keys = {}
+        new._build_keys = {}
+        for position, old in enumerate(range(len(self))[index]):
+            if old in self._pre:
+                new._pre[position] = self._pre[old]
+                new._pre_keys[position] = self._pre_keys[old]
+            if old in self._build:
+                new._build[position] = self._build[old]
+                new._build_keys[position] = self._build_keys[old]
+
+        new._ranks = None
+        return new
+
+    def _rank_column(self, keys: dict[int, IdentifiersKey]) -> tuple[Column | None, list[IdentifiersKey]]:
+        """
+        Replace the pre-release or build keys with integer ranks so the
+        whole precedence can be compared column by column.
+
+        Ranks are doubled (see `_scalar_rank`) and a version without one
+        gets the highest rank, as it has the higher precedence.
+        """
+        if not keys:
+            # Everything ranks the same, don't spend memory on a column of zeros
+            return None, [_ABSENT]
+
+        distinct = sorted({*keys.values(), _ABSENT})
+        ranks = {key: 2 * rank for rank, key in enumerate(distinct)}
+        absent = ranks[_ABSENT]
+
+        if self._backend == "numpy":
+            np = _numpy()
+            column = np.full(len(self), absent, dtype=np.uint32)
+            column[list(keys)] = [ranks[key] for key in keys.values()]
+        else:
+            column = array(_RANK_TYPECODE, [absent]) * len(self)
+            for index, key in keys.items():
+                column[index] = ranks[key]
+
+        return column, distinct
+
+    def _get_ranks(self) -> _Ranks:
+        """
+        Return the rank columns, computing them on first use.
+        """
+        if self._ranks is None:
+            pre_ranks, pre_distinct = self._rank_column(self._pre_keys)
+            build_ranks, build_distinct = self._rank_column(self._build_keys)
+            self._ranks = (pre_ranks, build_ranks, pre_distinct, build_distinct)
+        return self._ranks
+
+    def _columns(self) -> tuple[Column, Column, Column, Column, Column]:
+        """
+        The five columns that together give the precedence of each version.
+        """
+        pre_ranks, build_ranks, _, _ = self._get_ranks()
+        return (
+            self._major,
+            self._minor,
+            self._patch,
+            self._empty_ranks() if pre_ranks is None else pre_ranks,
+            self._empty_ranks() if build_ranks is None else build_ranks,
+        )
+
+    def _empty_ranks(self) -> Column:
+        """
+        A rank column for when no version has a pre-release or build,
+        they all rank equally.
+        """
+        if self._backend == "numpy":
+            np = _numpy()
+            return np.zeros(len(self), dtype=np.uint32)
+        return repeat(0, len(self))
+
+    def _rows(self) -> Iterator[tuple[int, int, int, int, int]]:
+        """
+        Iterate over the precedence of each version as a tuple of ints.
+        """
+        columns = self._columns()
+        if self._backend == "numpy":
+            return zip(*(column.tolist() for column in columns))
+        return zip(*columns)
+
+    def _scalar(self, other: Version) -> tuple[int, int, int, int, int]:
+        """
+        The precedence of `other` in the same terms as `_rows`.
+        """
+        _, _, pre_distinct, build_distinct = self._get_ranks()
+        key = other._key
+        return (
+            key[0],
+            key[1],
+            key[2],
+            _scalar_rank(pre_distinct, key[3]),
+            _scalar_rank(build_distinct, key[4]),
+        )
+
+    def _compare(self, other: object, op: Callable[[Any, Any], Any]) -> Mask:
+        """
+        Compare every version in the array against a single `Version`.
+        """
+        if not isinstance(other, Version):
+            raise TypeError(f"Cannot compare object of type VersionArray and {type(other)}")
+
+        scalar = self._scalar(other)
+
+        if self._backend == "numpy":
+            np = _numpy()
+            # Lexicographic comparison, one column at a time, of only
+            # the elements still tied on every column so far
+            result = np.zeros(len(self), dtype=np.int8)
+            tied = np.ones(len(self), dtype=bool)
+            for column, value in zip(self._columns(), scalar):
+                less = tied & (column < value)
+                greater = tied & (column > value)
+                result[less] = -1
+                result[greater] = 1
+                tied &= ~(less | greater)
+            return op(result, 0)
+
+        return list(map(op, self._rows(), repeat(scalar)))
+
+    # Elementwise, like numpy, so these return masks rather than bools
+    def __eq__(self, other: object) -> Mask:
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other: object) -> Mask:
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other: object) -> Mask:
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other: object) -> Mask:
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other: object) -> Mask:
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other: object) -> Mask:
+        return self._compare(other, operator.ge)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def argsort(self) -> Indices:
+        """
+        Return the indices that would sort the array by precedence.
+
+        Returns:
+            list[int] | numpy.ndarray: The sorting indices, a numpy
+                array with the numpy backend.
+
+        Examples:
+        ```python
+        >>> arr = VersionArray.from_strings(["v1.2.4", "v1.2.4-rc.1", "v0.7.6"])
+        >>> arr.argsort()
+        [2, 1, 0]
+
+        ```
+
+        """
+        if self._backend == "numpy":
+            np = _numpy()
+            # lexsort sorts by the last key first
+            return np.lexsort(self._columns()[::-1])
+
+        rows = list(self._rows())
+        return sorted(range(len(rows)), key=rows.__getitem__)
+
+    def _extreme(self, highest: bool) -> Version:
+        """
+        Find the version with the highest or lowest precedence.
+        """
+        if not len(self):
+            raise ValueError(f"{'max' if highest else 'min'}() of an empty VersionArray")
+
+        if self._backend == "numpy":
+            np = _numpy()
+            # Narrow down the candidates one column at a time
+            candidates = np.arange(len(self))
+            for column in self._columns():
+                values = column[candidates]
+                candidates = candidates[values == (values.max() if highest else values.min())]
+            return self._version(int(candidates[0]))
+
+        pick = max if highest else min
+        *_, index = pick(zip(*self._columns(), range(len(self))))
+        return self._version(index)
+
+    def max(self) -> Version:
+        """
+        Return the version with the highest precedence.
+
+        Raises:
+            ValueError: If the array is empty.
+
+        Returns:
+            Version: The highest Version.
+
+        Examples:
+        ```python
+        >>> VersionArray.from_strings(["v1.2.4-rc.1", "v1.2.4", "v0.7.6"]).max()
+        Version(major=1, minor=2, patch=4, prerelease=None, buildmetadata=None)
+
+        ```
+
+        """
+        return self._extreme(highest=True)
+
+    def min(self) -> Version:
+        """
+        Return the version with the lowest precedence.
+
+        Raises:
+            ValueError: If the array is empty.
+
+        Returns:
+            Version: The lowest Version.
+
+        Examples:
+        ```python
+        >>> VersionArray.from_strings(["v1.2.4-rc.1", "v1.2.4", "v0.7.6"]).min()
+        Version(major=0, minor=7, patch=6, prerelease=None, buildmetadata=None)
+
+        ```
+
+        """
+        return self._extreme(highest=False)
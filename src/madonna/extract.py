@@ -0,0 +1,151 @@
+"""
+Finding semver versions embedded in large amounts of text.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, TextIO, Union
+
+from madonna.version import Version
+
+# The semver regex without its anchors, instead a version must not be part
+# of a longer word or dotted number, so nothing is found in e.g. 'x1.2.3'
+# or '1.2.3.4' and nothing but the whole of '1.2.3-rc.1' is ever found.
+# Matching is ASCII only so every match is also valid for Version.from_string
+_TOKEN = re.compile(
+    r"""
+    (?<![0-9A-Za-z.])
+    v?(?P<major>0|[1-9][0-9]*)\.
+    (?P<minor>0|[1-9][0-9]*)\.
+    (?P<patch>0|[1-9][0-9]*)
+    (?:-(?P<prerelease>
+        (?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*)
+        (?:\.(?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*))*
+    ))?
+    (?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?
+    (?![0-9A-Za-z-]|\.[0-9])
+    """,
+    flags=re.VERBOSE,
+)
+
+# The characters a version is made of. Until the text following a match
+# has a character that isn't one of these, more text could still change it,
+# e.g. '1.2.4-rc.0' could turn out to be '1.2.4-rc.01' which isn't valid
+_RUN = re.compile(r"[0-9A-Za-z.+-]*")
+
+Source = Union[TextIO, Iterable[str]]
+
+
+def _chunks(source: Source, chunk_size: int) -> Iterator[str]:
+    """
+    Read text from a file or iterable of strings in chunks of about
+    `chunk_size`, joining small pieces e.g. lines together.
+    """
+    if hasattr(source, "read"):
+        read = source.read
+        while True:
+            chunk = read(chunk_size)
+            if isinstance(chunk, bytes):
+                raise TypeError("Can only scan text, open the file in text mode")
+            if not chunk:
+                return
+            yield chunk
+
+    pieces: list[str] = []
+    size = 0
+    for piece in source:
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pieces)
+            pieces.clear()
+            size = 0
+    if pieces:
+        yield "".join(pieces)
+
+
+def scan(source: Source, *, chunk_size: int = 64 * 1024, max_length: int = 256) -> Iterator[tuple[int, Version]]:
+    """
+    Find every semver version mentioned in a stream of text.
+
+    The text is read `chunk_size` characters at a time, carrying just the
+    end of each chunk over to the next so that versions straddling two
+    chunks are still found, which keeps memory use constant however
+    large the input is, e.g. a multi gigabyte build log.
+
+    A version is found wherever it is not part of a longer word or
+    dotted number: 'v1.2.4', 'pkg-1.2.4.tar.gz' and '(1.3.0-rc.1)' all
+    mention one but 'x1.2.4' and '1.2.4.5' do not. An optional 'v' is
+    included in the match, and the version is always the longest one
+    at that position, e.g. '1.2.4-rc.1', never just the '1.2.4' of it.
+
+    Args:
+        source (TextIO | Iterable[str]): A file opened in text mode,
+            or any iterable of strings e.g. lines.
+        chunk_size (int, optional): The number of characters to scan at
+            a time. Defaults to 64K.
+        max_length (int, optional): The longest version to look for
+            across chunk boundaries. Longer ones straddling two chunks
+            are missed, and may be found in part. Defaults to 256.
+
+    Yields:
+        tuple[int, Version]: The character offset into the text of each
+            version found, in order, and the parsed `Version`.
+
+    Raises:
+        ValueError: If `chunk_size` or `max_length` is less than 1.
+        TypeError: If `source` is a file opened in binary mode.
+
+    Examples:
+    ```python
+    >>> text = "Bumped foo from v1.2.4 to 1.3.0-rc.1 (see build 1.2.3.4)"
+    >>> [(offset, str(v)) for offset, v in scan([text])]
+    [(16, 'v1.2.4'), (26, 'v1.3.0-rc.1')]
+
+    ```
+
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    if max_length < 1:
+        raise ValueError(f"max_length must be >= 1, got {max_length}")
+
+    finditer = _TOKEN.finditer
+    run_to_end = _RUN.fullmatch
+    # The text that might still hold (the start of) a version, its offset
+    # in the stream and where in it to start looking, everything before
+    # that is only there for the regex's lookbehind
+    buffer = ""
+    offset = 0
+    start = 0
+
+    chunks = _chunks(source, chunk_size)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        buffer += chunk
+        chunk = next(chunks, None)
+        at_end = chunk is None
+
+        resume = None
+        for match in finditer(buffer, start):
+            if not at_end and run_to_end(buffer, match.end()):
+                # Might be changed by the next chunk, look at it again then
+                resume = match.start()
+                break
+            major, minor, patch, prerelease, buildmetadata = match.groups()
+            yield offset + match.start(), Version(int(major), int(minor), int(patch), prerelease, buildmetadata)
+            start = match.end()
+
+        if at_end:
+            return
+
+        # Keep the end of the buffer from the unfinished match, or all of it
+        # after the last match that could still hold the start of a version,
+        # either way no more than the longest version
+        keep = max(len(buffer) - max_length, start if resume is None else resume)
+        if keep > 0:
+            # Along with the character before it, for the lookbehind
+            buffer = buffer[keep - 1 :]
+            offset += keep - 1
+            start = 1
@@ -0,0 +1,226 @@
+"""
+Finding the semver tags of a local git repository, straight from its refs.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from madonna.version import Version, _parse
+
+_TAGS = "refs/tags/"
+
+
+class Tag(NamedTuple):
+    """
+    A git tag whose name is a semver version.
+
+    `sha` is the object the tag points to, which for an annotated tag
+    is the tag object rather than the commit.
+    """
+
+    name: str
+    version: Version
+    sha: str
+
+
+def _git_dir(repo_path: str | os.PathLike[str]) -> Path:
+    """
+    Find the directory holding a repository's refs.
+
+    That's the '.git' directory of a normal clone, the repository itself
+    if bare, or for a linked worktree or submodule, where '.git' is a file
+    pointing elsewhere, the directory it points to or the common directory
+    shared by all the worktrees.
+    """
+    path = Path(repo_path)
+    git_dir = path / ".git"
+
+    if git_dir.is_file():
+        # 'gitdir: <path>', relative to the worktree
+        content = git_dir.read_text(encoding="utf-8").strip()
+        if not content.startswith("gitdir:"):
+            raise ValueError(f"{os.fspath(repo_path)!r} is not a git repository")
+        git_dir = path / content[len("gitdir:") :].strip()
+    elif not git_dir.is_dir():
+        if not ((path / "HEAD").is_file() and (path / "refs").is_dir()):
+            raise ValueError(f"{os.fspath(repo_path)!r} is not a git repository")
+        git_dir = path
+
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        git_dir = git_dir / commondir.read_text(encoding="utf-8").strip()
+    return git_dir
+
+
+def _tag_refs(git_dir: Path) -> dict[str, Path | str]:
+    """
+    Map every tag name to its sha, or for a loose ref the file to read
+    it from, without reading any of them yet.
+    """
+    refs: dict[str, Path | str] = {}
+
+    try:
+        with (git_dir / "packed-refs").open(encoding="utf-8", errors="surrogateescape") as fp:
+            for line in fp:
+                # Skipping the '# pack-refs with:' header and the '^<sha>'
+                # lines with the commit an annotated tag above them peels to
+                sha, _, ref = line.rstrip("\n").partition(" ")
+                if ref.startswith(_TAGS):
+                    refs[ref[len(_TAGS) :]] = sha
+    except FileNotFoundError:
+        pass
+
+    # Loose refs are newer than packed ones, so take precedence
+    tags_dir = git_dir / _TAGS
+    for directory, _, files in os.walk(tags_dir):
+        prefix = Path(directory).relative_to(tags_dir).as_posix()
+        prefix = "" if prefix == "." else prefix + "/"
+        for file in files:
+            # Git never names a ref '*.lock', they're only ever a ref being updated
+            if not file.endswith(".lock"):
+                refs[prefix + file] = Path(directory, file)
+
+    return refs
+
+
+def _read_sha(ref: Path | str) -> str | None:
+    """
+    Return the sha of a tag ref, None if it turns out not to be one.
+    """
+    if isinstance(ref, str):
+        return ref
+    try:
+        sha = ref.read_text(encoding="utf-8", errors="surrogateescape").strip()
+    except FileNotFoundError:
+        # Deleted since the directory was listed
+        return None
+    # A symbolic ref
+    return None if sha.startswith("ref:") else sha
+
+
+def _versions(refs: dict[str, Path | str], prefix: str, include_prerelease: bool) -> Iterator[tuple[Version, str]]:
+    """
+    Parse the tags that are semver, after `prefix`, and yield their
+    versions and names.
+    """
+    # Bypassing the parse cache, which would only be flooded with tags
+    for name in refs:
+        if not name.startswith(prefix):
+            continue
+        try:
+            version = _parse(name[len(prefix) :])
+        except ValueError:
+            continue
+        if include_prerelease or version.prerelease is None:
+            yield version, name
+
+
+def iter_tags(
+    repo_path: str | os.PathLike[str] = ".", *, prefix: str = "", include_prerelease: bool = True
+) -> Iterator[Tag]:
+    """
+    Iterate over the tags of a local git repository that are semver.
+
+    The tags are read straight from the repository's 'packed-refs' file
+    and 'refs/tags' directory, without running git. Tags whose name isn't
+    a valid semver string are skipped.
+
+    Args:
+        repo_path (str | os.PathLike[str], optional): The repository,
+            a working tree, linked worktree or bare repository.
+            Defaults to the current directory.
+        prefix (str, optional): Only tags starting with this, which is
+            removed before parsing the rest of the name, e.g. 'mypkg/' for
+            'mypkg/1.2.4' in a monorepo. Defaults to '', every tag.
+        include_prerelease (bool, optional): Whether to include versions
+            with a pre-release. Defaults to True.
+
+    Yields:
+        Tag: Each semver tag, in no particular order.
+
+    Raises:
+        ValueError: If `repo_path` is not a git repository.
+
+    """
+    refs = _tag_refs(_git_dir(repo_path))
+    for version, name in _versions(refs, prefix, include_prerelease):
+        sha = _read_sha(refs[name])
+        if sha is not None:
+            yield Tag(name, version, sha)
+
+
+def latest_tags(
+    repo_path: str | os.PathLike[str] = ".", n: int = 1, *, prefix: str = "", include_prerelease: bool = True
+) -> list[Tag]:
+    """
+    Find the `n` tags of a local git repository with the highest versions.
+
+    Like `iter_tags`, except that the highest versions are picked out in
+    a single pass over the tags rather than by sorting them all, and only
+    the refs of those tags are read.
+
+    Args:
+        repo_path (str | os.PathLike[str], optional): The repository.
+            Defaults to the current directory.
+        n (int, optional): How many tags to return. Defaults to 1.
+        prefix (str, optional): See `iter_tags`. Defaults to ''.
+        include_prerelease (bool, optional): See `iter_tags`.
+            Defaults to True.
+
+    Returns:
+        list[Tag]: Up to `n` tags, highest version first.
+
+    Raises:
+        ValueError: If `repo_path` is not a git repository, or `n` < 0.
+
+    """
+    if n < 0:
+        raise ValueError(f"n must be >= 0, got {n}")
+
+    refs = _tag_refs(_git_dir(repo_path))
+
+    tags: list[Tag] = []
+    while len(tags) < n:
+        wanted = n - len(tags)
+        best = heapq.nlargest(wanted, _versions(refs, prefix, include_prerelease), key=lambda pair: pair[0]._key)
+        for version, name in best:
+            sha = _read_sha(refs.pop(name))
+            if sha is not None:
+                tags.append(Tag(name, version, sha))
+
+        if len(best) < wanted:
+            # There are no more
+            break
+        # Otherwise some of the refs weren't tags after all e.g. they were
+        # deleted while reading them, rare enough to just go round again
+        # for the next highest ones
+    return tags
+
+
+def latest_tag(
+    repo_path: str | os.PathLike[str] = ".", *, prefix: str = "", include_prerelease: bool = True
+) -> Tag | None:
+    """
+    Find the tag of a local git repository with the highest version.
+
+    Args:
+        repo_path (str | os.PathLike[str], optional): The repository.
+            Defaults to the current directory.
+        prefix (str, optional): See `iter_tags`. Defaults to ''.
+        include_prerelease (bool, optional): See `iter_tags`.
+            Defaults to True.
+
+    Returns:
+        Tag | None: The tag with the highest version, None if there
+            are no semver tags.
+
+    Raises:
+        ValueError: If `repo_path` is not a git repository.
+
+    """
+    tags = latest_tags(repo_path, 1, prefix=prefix, include_prerelease=include_prerelease)
+    return tags[0] if tags else None
@@ -0,0 +1,267 @@
+"""
+A sorted index of versions for fast range queries.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Iterable, Iterator
+
+from madonna.range import Range
+from madonna.version import PrecedenceKey, Version
+
+
+class VersionIndex:
+    """
+    A set of versions kept sorted by precedence.
+    """
+
+    __slots__ = ("_keys", "_versions")
+
+    def __init__(self, versions: Iterable[Version] = ()) -> None:
+        """
+        Index versions for "highest version satisfying a range" style queries.
+
+        The versions are kept in a list sorted by their precedence key, so all
+        the queries are a bisection (O(log n)) rather than a scan, and `add`
+        and `remove` keep the order without re-sorting everything.
+
+        Like a set, each version is stored once. Versions that only differ in
+        build metadata are distinct, and ordered as `sorted` would order them.
+
+        Args:
+            versions (Iterable[Version]): The versions to index.
+                Defaults to an empty index.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex([Version(1, 2, 4), Version(2, 0, 0), Version(1, 9, 0)])
+        >>> index.max_satisfying(Range("^1.2"))
+        Version(major=1, minor=9, patch=0, prerelease=None, buildmetadata=None)
+
+        ```
+
+        """
+        by_key = {version._key: version for version in versions}
+        self._keys: list[PrecedenceKey] = sorted(by_key)
+        self._versions: list[Version] = [by_key[key] for key in self._keys]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(<{len(self)} versions>)"
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Version]:
+        return iter(self._versions)
+
+    def __reversed__(self) -> Iterator[Version]:
+        return reversed(self._versions)
+
+    def __contains__(self, version: object) -> bool:
+        if not isinstance(version, Version):
+            return False
+        key = version._key
+        index = bisect.bisect_left(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
+
+    def add(self, version: Version) -> None:
+        """
+        Add a version to the index, does nothing if it is already there.
+
+        Args:
+            version (Version): The version to add.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex()
+        >>> index.add(Version(1, 2, 4))
+        >>> index.add(Version(1, 2, 4))
+        >>> len(index)
+        1
+
+        ```
+
+        """
+        key = version._key
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return
+        self._keys.insert(index, key)
+        self._versions.insert(index, version)
+
+    def remove(self, version: Version) -> None:
+        """
+        Remove a version from the index.
+
+        Args:
+            version (Version): The version to remove.
+
+        Raises:
+            KeyError: If `version` is not in the index.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex([Version(1, 2, 4)])
+        >>> index.remove(Version(1, 2, 4))
+        >>> len(index)
+        0
+
+        ```
+
+        """
+        key = version._key
+        index = bisect.bisect_left(self._keys, key)
+        if index == len(self._keys) or self._keys[index] != key:
+            raise KeyError(version)
+        del self._keys[index]
+        del self._versions[index]
+
+    def discard(self, version: Version) -> None:
+        """
+        Remove a version from the index if it is there.
+
+        Args:
+            version (Version): The version to remove.
+
+        """
+        if version in self:
+            self.remove(version)
+
+    def max_satisfying(self, constraint: Range) -> Version | None:
+        """
+        Return the highest version in the index that satisfies a range.
+
+        Args:
+            constraint (Range): The range to satisfy.
+
+        Returns:
+            Version | None: The highest matching version, or None if
+                no version matches.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex([Version(1, 2, 4), Version(2, 0, 0, "rc.1"), Version(2, 1, 0)])
+        >>> str(index.max_satisfying(Range("<2.1.0")))
+        'v2.0.0-rc.1'
+        >>> index.max_satisfying(Range(">3.0.0")) is None
+        True
+
+        ```
+
+        """
+        keys = self._keys
+        for low, high in reversed(constraint._intervals):
+            # The last version below the interval's (exclusive) upper bound
+            index = bisect.bisect_left(keys, high) - 1
+            if index < 0:
+                # Every remaining interval is lower still
+                return None
+            if keys[index] >= low:
+                return self._versions[index]
+        return None
+
+    def min_satisfying(self, constraint: Range) -> Version | None:
+        """
+        Return the lowest version in the index that satisfies a range.
+
+        Args:
+            constraint (Range): The range to satisfy.
+
+        Returns:
+            Version | None: The lowest matching version, or None if
+                no version matches.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex([Version(1, 2, 4), Version(2, 0, 0, "rc.1"), Version(2, 1, 0)])
+        >>> str(index.min_satisfying(Range(">=2.0.0")))
+        'v2.1.0'
+
+        ```
+
+        """
+        keys = self._keys
+        for low, high in constraint._intervals:
+            # The first version at or above the interval's lower bound
+            index = bisect.bisect_left(keys, low)
+            if index == len(keys):
+                return None
+            if keys[index] < high:
+                return self._versions[index]
+        return None
+
+    def between(self, low: Version, high: Version) -> list[Version]:
+        """
+        Return the versions from `low` to `high` (both inclusive), in order.
+
+        Args:
+            low (Version): The lowest version to return.
+            high (Version): The highest version to return.
+
+        Returns:
+            list[Version]: The versions in between, empty if `low` is
+                greater than `high`.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex(Version(1, minor, 0) for minor in range(5))
+        >>> [str(v) for v in index.between(Version(1, 1, 0), Version(1, 3, 0))]
+        ['v1.1.0', 'v1.2.0', 'v1.3.0']
+
+        ```
+
+        """
+        start = bisect.bisect_left(self._keys, low._key)
+        stop = bisect.bisect_right(self._keys, high._key)
+        return self._versions[start:stop]
+
+    def next_after(self, version: Version) -> Version | None:
+        """
+        Return the lowest version in the index greater than `version`.
+
+        `version` itself does not have to be in the index.
+
+        Args:
+            version (Version): The version to start from.
+
+        Returns:
+            Version | None: The next version, or None if there is none.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex([Version(1, 2, 4), Version(1, 3, 0)])
+        >>> str(index.next_after(Version(1, 2, 4)))
+        'v1.3.0'
+        >>> index.next_after(Version(1, 3, 0)) is None
+        True
+
+        ```
+
+        """
+        index = bisect.bisect_right(self._keys, version._key)
+        return self._versions[index] if index < len(self._versions) else None
+
+    def prev_before(self, version: Version) -> Version | None:
+        """
+        Return the highest version in the index less than `version`.
+
+        `version` itself does not have to be in the index.
+
+        Args:
+            version (Version): The version to start from.
+
+        Returns:
+            Version | None: The previous version, or None if there is none.
+
+        Examples:
+        ```python
+        >>> index = VersionIndex([Version(1, 2, 4), Version(1, 3, 0)])
+        >>> str(index.prev_before(Version(1, 3, 0, "rc.1")))
+        'v1.2.4'
+
+        ```
+
+        """
+        index = bisect.bisect_left(self._keys, version._key) - 1
+        return self._versions[index] if index >= 0 else None
@@ -0,0 +1,232 @@
+"""
+Opt-in counting and timing of the hot paths of `Version`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import time
+from typing import Any, Callable, Iterator, NamedTuple
+
+from madonna.version import Version
+
+# The instrumented methods of Version, grouped by what they do
+_OPERATIONS = (
+    # Parsing
+    "from_string",
+    # Comparison, `madonna.compare` goes through Version.compare
+    "__eq__",
+    "__ne__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "compare",
+    # Hashing
+    "__hash__",
+    # Serialisation
+    "__str__",
+    "__reduce__",
+    "to_string",
+    "to_tuple",
+    "to_dict",
+    "to_json",
+    "to_bytes",
+    "from_tuple",
+    "from_dict",
+    "from_json",
+    "from_bytes",
+)
+
+Callback = Callable[[str, int], None]
+
+# [calls, total ns, max ns] per operation, lists so the wrappers can
+# update them in place
+_records: dict[str, list[int]] = {name: [0, 0, 0] for name in _OPERATIONS}
+
+# The original class attributes while instrumentation is enabled
+_originals: dict[str, Any] = {}
+
+_callback: Callback | None = None
+
+
+class OpStats(NamedTuple):
+    """
+    The calls to, and time spent in, one instrumented operation.
+    """
+
+    calls: int
+    total_ns: int
+    max_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        """
+        The mean time per call in nanoseconds, 0 if never called.
+        """
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+def _wrap(name: str, function: Callable[..., object]) -> Callable[..., object]:
+    """
+    Wrap a method so that each call is counted, timed and reported.
+    """
+    record = _records[name]
+    now = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        start = now()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = now() - start
+            record[0] += 1
+            record[1] += elapsed
+            if elapsed > record[2]:
+                record[2] = elapsed
+            if _callback is not None:
+                _callback(name, elapsed)
+
+    return wrapper
+
+
+def enable(callback: Callback | None = None) -> None:
+    """
+    Start counting and timing calls to the hot paths of `Version`.
+
+    The instrumented methods are swapped in on the `Version` class
+    itself, so this covers every `Version` and subclass including ones
+    that already exist, and `disable` swaps the originals back in, which
+    means instrumentation costs nothing at all while disabled.
+
+    Calls are counted when they return or raise, a method that calls
+    another one (e.g. `to_string` calls `__str__`) counts as both. The
+    counters are not locked, so with several threads calling into
+    `Version` at once they are approximate.
+
+    Calling `enable` again while enabled just replaces the callback.
+
+    Args:
+        callback (Callable[[str, int], None] | None, optional): Called
+            after every instrumented call with the name of the operation
+            and its duration in nanoseconds, e.g. to feed a histogram in
+            a metrics system. Defaults to None.
+
+    Examples:
+    ```python
+    >>> enable()
+    >>> sorted([Version(1, 2, 4), Version(0, 7, 6)]) == [Version(0, 7, 6), Version(1, 2, 4)]
+    True
+    >>> stats()["__lt__"].calls
+    1
+    >>> disable()
+    >>> reset()
+
+    ```
+
+    """
+    global _callback
+    _callback = callback
+
+    if _originals:
+        return
+
+    for name in _OPERATIONS:
+        original = Version.__dict__[name]
+        if isinstance(original, classmethod):
+            wrapped: Any = classmethod(_wrap(name, original.__func__))
+        else:
+            wrapped = _wrap(name, original)
+        _originals[name] = original
+        setattr(Version, name, wrapped)
+
+
+def disable() -> None:
+    """
+    Stop instrumenting `Version`, restoring its original methods.
+
+    The statistics gathered so far are kept until `reset`.
+    """
+    global _callback
+    _callback = None
+
+    for name, original in _originals.items():
+        setattr(Version, name, original)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    """
+    Report whether instrumentation is enabled.
+
+    Returns:
+        bool: True if `Version` is being instrumented, else False.
+
+    """
+    return bool(_originals)
+
+
+@contextlib.contextmanager
+def instrumented(callback: Callback | None = None) -> Iterator[None]:
+    """
+    Enable instrumentation for the duration of a `with` block.
+
+    Args:
+        callback (Callable[[str, int], None] | None, optional): See
+            `enable`. Defaults to None.
+
+    Yields:
+        None
+
+    Examples:
+    ```python
+    >>> with instrumented():
+    ...     _ = Version.from_string("v1.2.4-rc.1")
+    >>> stats()["from_string"].calls
+    1
+    >>> is_enabled()
+    False
+    >>> reset()
+
+    ```
+
+    """
+    enable(callback)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def stats() -> dict[str, OpStats]:
+    """
+    Take a snapshot of the statistics for every instrumented operation.
+
+    The operations are named after the `Version` methods they cover:
+    'from_string' for parsing, the rich comparisons ('__lt__' etc.) and
+    'compare', '__hash__', and for serialisation the `to_*` and `from_*`
+    conversions along with '__str__' and '__reduce__' (pickling).
+
+    Returns:
+        dict[str, OpStats]: The calls, total and maximum time in
+            nanoseconds of each operation, including those never called.
+
+    Examples:
+    ```python
+    >>> stats()["__hash__"]
+    OpStats(calls=0, total_ns=0, max_ns=0)
+
+    ```
+
+    """
+    return {name: OpStats(*record) for name, record in _records.items()}
+
+
+def reset() -> None:
+    """
+    Zero the statistics of every operation.
+    """
+    for record in _records.values():
+        record[:] = [0, 0, 0]
@@ -0,0 +1,236 @@
+"""
+Streaming JSON encoding and decoding of many versions at once.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from typing import Any, Iterable, Iterator, TextIO
+
+from madonna.version import Version
+
+_FORMATS = ("ndjson", "array")
+
+# Records are written and (for NDJSON) parsed this many at a time, enough to
+# amortise the per call overhead while keeping memory use constant
+_BATCH = 1024
+
+# Characters read from the file at a time when decoding a JSON array
+_CHUNK = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# A literal, number or escape cut off by the end of the buffer fails to decode
+# within this many characters of the end
+_TOKEN_TAIL = 16
+
+
+def _check_format(format: str) -> None:
+    if format not in _FORMATS:
+        raise ValueError(f"Unknown format {format!r}, must be one of {_FORMATS}")
+
+
+def _positional(version: Version) -> str:
+    """
+    Encode a version as a compact JSON array of its fields.
+    """
+    prerelease = "null" if version._prerelease is None else json.dumps(version._prerelease)
+    buildmetadata = "null" if version._buildmetadata is None else json.dumps(version._buildmetadata)
+    return f"[{version._major},{version._minor},{version._patch},{prerelease},{buildmetadata}]"
+
+
+def _version(record: Any) -> Version:  # noqa: ANN401
+    """
+    Build a version from a decoded positional or dict record.
+    """
+    if isinstance(record, list):
+        return Version(*record)
+    if isinstance(record, dict):
+        return Version(**record)
+    raise ValueError(f"Expected a JSON array or object for a version, got {record!r}")
+
+
+def dump_many(versions: Iterable[Version], fp: TextIO, *, format: str = "ndjson", positional: bool = True) -> int:
+    """
+    Write versions to a text file as JSON, incrementally.
+
+    Versions are encoded and written in small batches, so memory use stays
+    constant however many there are and `versions` can be a generator.
+
+    Args:
+        versions (Iterable[Version]): The versions to write.
+        fp (TextIO): The file to write to.
+        format (str, optional): 'ndjson' for one JSON value per line or
+            'array' for a single JSON array. Defaults to 'ndjson'.
+        positional (bool, optional): Encode each version in the compact
+            positional form `[1,2,4,"rc.1",null]` rather than as a dict
+            like `Version.to_json`. Defaults to True.
+
+    Returns:
+        int: The number of versions written.
+
+    Raises:
+        ValueError: If `format` is not a known format.
+
+    Examples:
+    ```python
+    >>> import io
+    >>> fp = io.StringIO()
+    >>> dump_many([Version(1, 2, 4), Version(1, 3, 0, "rc.1")], fp)
+    2
+    >>> print(fp.getvalue(), end="")
+    [1,2,4,null,null]
+    [1,3,0,"rc.1",null]
+
+    ```
+
+    """
+    _check_format(format)
+    encode = _positional if positional else Version.to_json
+    separator = "\n" if format == "ndjson" else ",\n"
+
+    if format == "array":
+        fp.write("[")
+
+    count = 0
+    iterator = iter(versions)
+    while True:
+        batch = [encode(version) for version in itertools.islice(iterator, _BATCH)]
+        if not batch:
+            break
+        if format == "ndjson":
+            fp.write(separator.join(batch) + "\n")
+        else:
+            fp.write(("\n" if count == 0 else separator) + separator.join(batch))
+        count += len(batch)
+
+    if format == "array":
+        fp.write("\n]\n" if count else "]\n")
+
+    return count
+
+
+def _truncated(err: json.JSONDecodeError, buffer: str) -> bool:
+    """
+    Whether a failed decode could just be a record running off the end of
+    the buffer, rather than a malformed one.
+    """
+    # A cut off string fails at its opening quote, however long it is
+    return err.pos >= len(buffer) - _TOKEN_TAIL or err.msg.startswith("Unterminated string")
+
+
+def _iter_ndjson(fp: TextIO) -> Iterator[Version]:
+    """
+    Decode a file of one JSON version per line.
+    """
+    lines = (line for line in fp if not line.isspace())
+    while True:
+        batch = list(itertools.islice(lines, _BATCH))
+        if not batch:
+            return
+        # One json.loads call per batch rather than per line
+        records = json.loads("[" + ",".join(batch) + "]")
+        if len(records) != len(batch):
+            raise ValueError("Expected exactly one JSON value per line")
+        yield from map(_version, records)
+
+
+def _iter_array(fp: TextIO) -> Iterator[Version]:
+    """
+    Decode a file holding a single JSON array of versions, a chunk at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    # Characters of the file before the start of the buffer, for error offsets
+    offset = 0
+
+    def next_char() -> str:
+        """
+        Skip whitespace, reading more as needed, and return the next
+        character or '' at the end of the file.
+        """
+        nonlocal buffer, position, offset
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            offset += len(buffer)
+            buffer, position = fp.read(_CHUNK), 0
+            if not buffer:
+                return ""
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array of versions")
+    position += 1
+
+    first = True
+    while True:
+        char = next_char()
+        if char == "]":
+            return
+        if not first:
+            if char != ",":
+                raise ValueError(
+                    f"Expected ',' or ']' in JSON array of versions at character {offset + position}, got {char!r}"
+                )
+            position += 1
+            char = next_char()
+        if not char:
+            raise ValueError("Unterminated JSON array of versions")
+
+        # Records are arrays or objects, so a failed decode at the end of the
+        # buffer just means the record is split across chunks, read more. Any
+        # other failure is a malformed record, so fail without reading on
+        while True:
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError as err:
+                chunk = fp.read(_CHUNK) if _truncated(err, buffer) else ""
+                if not chunk:
+                    raise ValueError(
+                        f"Invalid JSON array of versions at character {offset + err.pos}: {err.msg}"
+                    ) from err
+                offset += position
+                buffer, position = buffer[position:] + chunk, 0
+
+        yield _version(record)
+        first = False
+
+
+def iter_load(fp: TextIO, *, format: str = "ndjson") -> Iterator[Version]:
+    """
+    Lazily read versions from a text file of JSON, incrementally.
+
+    Both the positional and the dict forms of a version are accepted, and
+    the file is read a chunk at a time, so memory use stays constant.
+
+    Args:
+        fp (TextIO): The file to read from.
+        format (str, optional): 'ndjson' for one JSON value per line or
+            'array' for a single JSON array. Defaults to 'ndjson'.
+
+    Yields:
+        Version: The versions, in the order they appear in the file.
+
+    Raises:
+        ValueError: If `format` is not a known format or the file
+            is not valid JSON of the expected format.
+
+    Examples:
+    ```python
+    >>> import io
+    >>> fp = io.StringIO('[[1,2,4,null,null], {"major": 1, "minor": 3, "patch": 0}]')
+    >>> [str(v) for v in iter_load(fp, format="array")]
+    ['v1.2.4', 'v1.3.0']
+
+    ```
+
+    """
+    _check_format(format)
+    if format == "ndjson":
+        return _iter_ndjson(fp)
+    return _iter_array(fp)
@@ -0,0 +1,173 @@
+"""
+Parsing very large numbers of version strings across processes.
+"""
+
+from __future__ import annotations
+
+import collections
+import heapq
+import itertools
+import operator
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Tuple
+
+from madonna.binary import _pack_records, unpack_many
+from madonna.version import Version
+
+# Chunks queued up per worker, enough to keep them all busy while
+# the results of earlier chunks are unpacked
+_IN_FLIGHT_PER_WORKER = 2
+
+# What a worker sends back for a chunk: the packed versions, the (index,
+# string) of each failure and the (index, version) of each version that
+# couldn't be packed
+_ParsedChunk = Tuple[bytes, List[Tuple[int, str]], List[Tuple[int, Version]]]
+
+
+class ParseResult(NamedTuple):
+    """
+    The outcome of `parse_many`.
+
+    `versions` lines up with the input, with None for each string that
+    failed to parse, and `errors` holds the (index, string) of each of
+    those in order.
+    """
+
+    versions: list[Version | None]
+    errors: list[tuple[int, str]]
+
+
+def _parse_chunk(start: int, strings: list[str]) -> _ParsedChunk:
+    """
+    Parse a chunk of strings in a worker process.
+
+    The versions go back to the parent packed with `pack_many` rather than
+    pickled one object at a time, along with the (index, string) of any
+    string that failed to parse. The rare valid version the binary encoding
+    can't hold, e.g. with a part that doesn't fit in 64 bits, goes back
+    pickled with its index instead.
+    """
+    records = []
+    errors = []
+    unencodable = []
+    for index, string in enumerate(strings, start):
+        try:
+            version = Version.from_string(string)
+        except ValueError:
+            errors.append((index, string))
+            continue
+        try:
+            records.append(version.to_bytes())
+        except OverflowError:
+            unencodable.append((index, version))
+    return _pack_records(records), errors, unencodable
+
+
+def _merge(
+    result: ParseResult,
+    versions: list[Version],
+    errors: list[tuple[int, str]],
+    unencodable: list[tuple[int, Version]],
+) -> None:
+    """
+    Append a parsed chunk to the result, putting a None in place of each
+    error and each unencodable version back in its place.
+    """
+    if not errors and not unencodable:
+        result.versions.extend(versions)
+        return
+
+    parsed = iter(versions)
+    failed: Iterable[tuple[int, Version | None]] = ((index, None) for index, _ in errors)
+    for index, version in heapq.merge(failed, unencodable, key=operator.itemgetter(0)):
+        # Everything before it was packed
+        result.versions.extend(itertools.islice(parsed, index - len(result.versions)))
+        result.versions.append(version)
+    result.versions.extend(parsed)
+    result.errors.extend(errors)
+
+
+def parse_many(strings: Iterable[str], *, workers: int | None = None, chunksize: int = 10_000) -> ParseResult:
+    """
+    Parse many version strings in parallel across a pool of processes.
+
+    The strings are split into chunks of `chunksize` which are parsed with
+    `Version.from_string` in worker processes. Only a few chunks per worker
+    are in flight at once, so `strings` can be a lazy iterable over a
+    manifest far larger than memory allows to hold twice over.
+
+    Strings that are not valid semver do not stop the parse, they are
+    reported by index in the result instead.
+
+    As with any use of `multiprocessing`, on platforms that spawn
+    rather than fork worker processes the calling script's entry point
+    must be guarded by `if __name__ == "__main__":`.
+
+    Args:
+        strings (Iterable[str]): The version strings to parse.
+        workers (int | None, optional): The number of worker processes.
+            Defaults to the number of CPUs. With 1 worker, or if everything
+            fits in a single chunk, the strings are parsed in this process.
+        chunksize (int, optional): The number of strings sent to a worker
+            at a time. Defaults to 10,000.
+
+    Returns:
+        ParseResult: The parsed versions in the same order as `strings`,
+            and the index and string of any that failed to parse.
+
+    Raises:
+        ValueError: If `workers` or `chunksize` is less than 1.
+
+    Examples:
+    ```python
+    >>> result = parse_many(["v1.2.4", "not a version", "1.3.0-rc.1"], workers=1)
+    >>> [str(v) for v in result.versions]
+    ['v1.2.4', 'None', 'v1.3.0-rc.1']
+    >>> result.errors
+    [(1, 'not a version')]
+
+    ```
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be >= 1, got {chunksize}")
+
+    result = ParseResult([], [])
+    iterator = iter(strings)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunksize)), [])
+
+    first = next(chunks, None)
+    if first is None:
+        return result
+
+    second = next(chunks, None) if workers > 1 else None
+    if second is None:
+        # Not worth starting any processes
+        for start, chunk in zip(itertools.count(0, chunksize), itertools.chain([first], chunks)):
+            for index, string in enumerate(chunk, start):
+                try:
+                    result.versions.append(Version.from_string(string))
+                except ValueError:
+                    result.versions.append(None)
+                    result.errors.append((index, string))
+        return result
+
+    starts = itertools.count(0, chunksize)
+    pending: collections.deque[Future[_ParsedChunk]] = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in itertools.chain([first, second], chunks):
+            pending.append(executor.submit(_parse_chunk, next(starts), chunk))
+            if len(pending) >= workers * _IN_FLIGHT_PER_WORKER:
+                packed, errors, unencodable = pending.popleft().result()
+                _merge(result, unpack_many(packed), errors, unencodable)
+
+        while pending:
+            packed, errors, unencodable = pending.popleft().result()
+            _merge(result, unpack_many(packed), errors, unencodable)
+
+    return result
@@ -0,0 +1,317 @@
+"""
+Version range constraints e.g. '>=1.2.0,<2.0.0', '^1.4' or '~2.3.1'.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+from typing import Any, Iterable, Tuple
+
+from madonna.version import Version, _identifiers_key
+
+# A range is normalised to a sorted list of disjoint half open [low, high)
+# intervals of precedence keys. The bounds are chosen so that inclusive and
+# exclusive comparisons collapse into those two, and build metadata is ignored:
+#
+# (M, m, p, pre)          sorts before every version with that precedence
+# (M, m, p, pre, _AFTER)  sorts after every version with that precedence
+# (M, m, p, _FIRST)       sorts before every version (and pre-release) of M.m.p
+Bound = Tuple[Any, ...]
+Interval = Tuple[Bound, Bound]
+
+_MIN: Bound = ()
+_MAX: Bound = (math.inf,)
+_FIRST = (0,)
+_AFTER = (2,)
+
+_EVERYTHING: list[Interval] = [(_MIN, _MAX)]
+
+_COMPARATOR = re.compile(
+    r"""
+    (?P<op><=|>=|!=|==|<|>|=|\^|~>|~)?\s*
+    v?(?P<major>0|[1-9]\d*|[xX*])
+    (?:\.(?P<minor>0|[1-9]\d*|[xX*]))?
+    (?:\.(?P<patch>0|[1-9]\d*|[xX*]))?
+    (?:-(?P<prerelease>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?
+    (?:\+[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*)?
+    (?=[\s,]|$)
+    """,
+    flags=re.VERBOSE | re.ASCII,
+)
+
+_HYPHEN = re.compile(r"^\s*(?P<low>\S+)\s+-\s+(?P<high>\S+)\s*$")
+
+
+def _intersect(a: list[Interval], b: list[Interval]) -> list[Interval]:
+    """
+    Intersect two sorted lists of disjoint intervals.
+    """
+    result: list[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        low = max(a[i][0], b[j][0])
+        high = min(a[i][1], b[j][1])
+        if low < high:
+            result.append((low, high))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _union(intervals: Iterable[Interval]) -> list[Interval]:
+    """
+    Merge any intervals into a sorted list of disjoint ones.
+    """
+    result: list[Interval] = []
+    for low, high in sorted(intervals):
+        if result and low <= result[-1][1]:
+            if high > result[-1][1]:
+                result[-1] = (result[-1][0], high)
+        else:
+            result.append((low, high))
+    return result
+
+
+def _skip_separators(string: str, position: int) -> int:
+    """
+    Return the position of the next non separator character.
+    """
+    while position < len(string) and (string[position].isspace() or string[position] == ","):
+        position += 1
+    return position
+
+
+def _compatible_upper(op: str, major: int, minor: int, patch: int, specified: int) -> Bound:
+    """
+    The (exclusive) upper bound of a tilde or caret range.
+    """
+    if op in {"~", "~>"}:
+        # Patch level changes if a minor version is given, else minor level
+        return (major + 1, 0, 0, _FIRST) if specified == 1 else (major, minor + 1, 0, _FIRST)
+
+    # Caret, changes that do not modify the left-most non-zero part
+    if major != 0 or specified == 1:
+        return (major + 1, 0, 0, _FIRST)
+    if minor != 0 or specified == 2:
+        return (0, minor + 1, 0, _FIRST)
+    return (0, 0, patch + 1, _FIRST)
+
+
+def _comparator(match: re.Match[str], spec: str) -> list[Interval]:
+    """
+    Turn a single parsed comparator e.g. '>=1.2' into its intervals.
+    """
+    op = match.group("op") or "="
+    prerelease = match.group("prerelease")
+
+    # Everything after the first wildcard or missing part is unspecified
+    parts: list[int] = []
+    for name in ("major", "minor", "patch"):
+        part = match.group(name)
+        if part is None or part in "xX*":
+            break
+        parts.append(int(part))
+
+    specified = len(parts)
+    if prerelease is not None and specified < 3:
+        raise ValueError(f"Invalid range {spec!r}: a pre-release needs a full version")
+
+    if specified == 0:
+        # '*', '>=*' etc. match everything while '<*' and '>*' match nothing
+        return [] if op in {"<", ">", "!="} else _EVERYTHING
+
+    major, minor, patch = (*parts, 0, 0)[:3]
+
+    # The version the comparator starts from and the first one after it
+    # e.g. '1.2' -> 1.2.0 and 1.3.0, '1.2.3' -> 1.2.3 and 1.2.4
+    floor: Bound = (major, minor, patch, _identifiers_key(prerelease))
+    if specified == 1:
+        following: Bound = (major + 1, 0, 0, _FIRST)
+    elif specified == 2:
+        following = (major, minor + 1, 0, _FIRST)
+    else:
+        following = (*floor, _AFTER)
+
+    if op in {"=", "=="}:
+        return [(floor, following)]
+    if op == "!=":
+        return [(_MIN, floor), (following, _MAX)]
+    if op == ">=":
+        return [(floor, _MAX)]
+    if op == ">":
+        return [(following, _MAX)]
+    if op == "<=":
+        return [(_MIN, following)]
+    if op == "<":
+        # '<1.2' excludes the 1.2.0 pre-releases too
+        return [(_MIN, floor if specified == 3 else (major, minor, patch, _FIRST))]
+
+    # Tilde or caret
+    return [(floor, _compatible_upper(op, major, minor, patch, specified))]
+
+
+def _parse_set(spec: str, comparators: str) -> list[Interval]:
+    """
+    Parse a set of comparators that must all be satisfied, separated
+    by whitespace or commas, or a hyphen range like '1.2.3 - 2.3.4'.
+    """
+    hyphen = _HYPHEN.match(comparators)
+    if hyphen:
+        comparators = f">={hyphen.group('low')} <={hyphen.group('high')}"
+
+    intervals = _EVERYTHING
+    position = _skip_separators(comparators, 0)
+    if position == len(comparators):
+        raise ValueError(f"Invalid range {spec!r}: empty comparator set")
+
+    while position < len(comparators):
+        match = _COMPARATOR.match(comparators, position)
+        if match is None:
+            raise ValueError(f"Invalid range {spec!r}")
+        intervals = _intersect(intervals, _comparator(match, spec))
+        position = _skip_separators(comparators, match.end())
+
+    return intervals
+
+
+class Range:
+    """
+    A set of versions described by a range specifier.
+    """
+
+    __slots__ = ("_highs", "_intervals", "_lows", "_spec")
+
+    def __init__(self, spec: str) -> None:
+        """
+        Parse a range specifier once, into a form that makes checking
+        versions against it cheap.
+
+        The syntax follows the familiar npm style:
+
+        - Comparators: `>=1.2.0`, `>1.2.0`, `<=1.2.0`, `<1.2.0`, `=1.2.0`
+            (or just `1.2.0`) and `!=1.2.0`.
+        - Partial and wildcard versions: `1.2`, `1.2.x`, `1.*`, `*`.
+        - Tilde ranges: `~1.2.3` allows patch level changes, `~1` minor level.
+        - Caret ranges: `^1.2.3` allows changes that do not modify the
+            left-most non-zero part e.g. `^0.2.3` is `>=0.2.3,<0.3.0`.
+        - Hyphen ranges: `1.2.3 - 2.3.4` is `>=1.2.3,<=2.3.4`.
+        - Comparators separated by whitespace or commas must all match and
+            sets of them separated by `||` are alternatives.
+
+        Versions are matched purely on precedence with build metadata
+        ignored. The upper bounds implied by partial, tilde and caret ranges
+        exclude the pre-releases of that bound, so `^1.4` does not match
+        `2.0.0-rc.1`.
+
+        Args:
+            spec (str): The range specifier.
+
+        Raises:
+            ValueError: If `spec` is not a valid range.
+
+        Examples:
+        ```python
+        >>> Version(1, 5, 0) in Range(">=1.2.0,<2.0.0")
+        True
+
+        ```
+
+        ```python
+        >>> Range("^1.4").contains(Version(2, 0, 0, "rc.1"))
+        False
+
+        ```
+
+        """
+        intervals = _union(interval for comparators in spec.split("||") for interval in _parse_set(spec, comparators))
+
+        self._spec = spec
+        self._intervals = intervals
+        self._lows = [low for low, _ in intervals]
+        self._highs = [high for _, high in intervals]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._spec!r})"
+
+    def __str__(self) -> str:
+        return self._spec
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Range):
+            return NotImplemented
+        return self._intervals == other._intervals
+
+    def __hash__(self) -> int:
+        return hash(tuple(self._intervals))
+
+    def __contains__(self, version: object) -> bool:
+        if not isinstance(version, Version):
+            raise TypeError(f"Cannot check object of type {type(version)} against a Range")
+        return self.contains(version)
+
+    def contains(self, version: Version) -> bool:
+        """
+        Report whether a `Version` satisfies the range.
+
+        Takes a single bisection of the range's intervals (usually just one)
+        and one comparison of the version's precomputed key.
+
+        Args:
+            version (Version): The Version to check.
+
+        Returns:
+            bool: True if `version` is in the range, else False.
+
+        Examples:
+        ```python
+        >>> r = Range("~2.3.1")
+        >>> r.contains(Version(2, 3, 9))
+        True
+        >>> r.contains(Version(2, 4, 0))
+        False
+
+        ```
+
+        """
+        key = version._key
+        index = bisect.bisect_right(self._lows, key) - 1
+        return index >= 0 and key < self._highs[index]
+
+    def filter(self, versions: Iterable[Version]) -> list[Version]:
+        """
+        Return the versions that satisfy the range, in their original order.
+
+        Args:
+            versions (Iterable[Version]): The versions to filter.
+
+        Returns:
+            list[Version]: The matching versions.
+
+        Examples:
+        ```python
+        >>> versions = [Version(1, 2, 4), Version(2, 0, 0), Version(1, 9, 0, "rc.1")]
+        >>> [str(v) for v in Range("^1.2").filter(versions)]
+        ['v1.2.4', 'v1.9.0-rc.1']
+
+        ```
+
+        """
+        if len(self._intervals) == 1:
+            # By far the most common, keep the bounds in locals
+            ((low, high),) = self._intervals
+            return [version for version in versions if low <= version._key < high]
+
+        lows = self._lows
+        highs = self._highs
+        bisect_right = bisect.bisect_right
+        matched: list[Version] = []
+        for version in versions:
+            key = version._key
+            index = bisect_right(lows, key) - 1
+            if index >= 0 and key < highs[index]:
+                matched.append(version)
+        return matched
@@ -0,0 +1,125 @@
+"""
+Picking the highest or lowest versions without sorting them all.
+"""
+
+from __future__ import annotations
+
+import heapq
+import operator
+from typing import Iterable
+
+from madonna.version import Version
+
+# The leading parts of the precedence key that identify a release line
+_LEVELS = {"major": operator.itemgetter(slice(0, 1)), "minor": operator.itemgetter(slice(0, 2))}
+
+_precedence = operator.attrgetter("_key")
+
+
+def nlargest(k: int, versions: Iterable[Version]) -> list[Version]:
+    """
+    Return the `k` highest versions, highest first.
+
+    A single pass with a heap of size `k`, so O(n log k) rather than the
+    O(n log n) of sorting everything, and `versions` can be a generator.
+    The result is the same as `sorted(versions, reverse=True)[:k]`,
+    including which of any equal versions are picked.
+
+    Args:
+        k (int): How many versions to return.
+        versions (Iterable[Version]): The versions to choose from.
+
+    Returns:
+        list[Version]: Up to `k` versions, highest first.
+
+    Examples:
+    ```python
+    >>> versions = [Version(1, 2, 4), Version(0, 7, 6), Version(1, 3, 0, "rc.1"), Version(1, 2, 5)]
+    >>> [str(v) for v in nlargest(2, versions)]
+    ['v1.3.0-rc.1', 'v1.2.5']
+
+    ```
+
+    """
+    return heapq.nlargest(k, versions, key=_precedence)
+
+
+def nsmallest(k: int, versions: Iterable[Version]) -> list[Version]:
+    """
+    Return the `k` lowest versions, lowest first.
+
+    The counterpart of `nlargest`, the result is the same as
+    `sorted(versions)[:k]`.
+
+    Args:
+        k (int): How many versions to return.
+        versions (Iterable[Version]): The versions to choose from.
+
+    Returns:
+        list[Version]: Up to `k` versions, lowest first.
+
+    Examples:
+    ```python
+    >>> versions = [Version(1, 2, 4), Version(0, 7, 6), Version(1, 3, 0, "rc.1"), Version(1, 2, 5)]
+    >>> [str(v) for v in nsmallest(2, versions)]
+    ['v0.7.6', 'v1.2.4']
+
+    ```
+
+    """
+    return heapq.nsmallest(k, versions, key=_precedence)
+
+
+def latest_by(
+    versions: Iterable[Version], level: str = "major", *, include_prerelease: bool = True
+) -> dict[tuple[int, ...], Version]:
+    """
+    Find the highest version of each release line.
+
+    A single pass keeping the highest version seen so far for each line,
+    so O(n) however many lines there are. Of equal versions the first
+    one seen is kept.
+
+    Args:
+        versions (Iterable[Version]): The versions to choose from.
+        level (str, optional): 'major' for the latest of each major
+            version e.g. 1.x.x, or 'minor' for the latest patch of each
+            minor version e.g. 1.2.x. Defaults to 'major'.
+        include_prerelease (bool, optional): Whether to consider versions
+            with a pre-release. Defaults to True.
+
+    Returns:
+        dict[tuple[int, ...], Version]: The highest version of each line,
+            keyed by the line's (major,) or (major, minor) and in order
+            of those.
+
+    Raises:
+        ValueError: If `level` is not 'major' or 'minor'.
+
+    Examples:
+    ```python
+    >>> versions = [Version(1, 2, 4), Version(0, 7, 6), Version(1, 3, 0, "rc.1"), Version(1, 2, 5)]
+    >>> {line: str(v) for line, v in latest_by(versions).items()}
+    {(0,): 'v0.7.6', (1,): 'v1.3.0-rc.1'}
+    >>> {line: str(v) for line, v in latest_by(versions, "minor", include_prerelease=False).items()}
+    {(0, 7): 'v0.7.6', (1, 2): 'v1.2.5'}
+
+    ```
+
+    """
+    try:
+        release_line = _LEVELS[level]
+    except KeyError:
+        raise ValueError(f"Unknown level {level!r}, must be one of {tuple(_LEVELS)}") from None
+
+    latest: dict[tuple[int, ...], Version] = {}
+    for version in versions:
+        if not include_prerelease and version._prerelease is not None:
+            continue
+        key = version._key
+        line = release_line(key)
+        current = latest.get(line)
+        if current is None or key > current._key:
+            latest[line] = version
+
+    return dict(sorted(latest.items()))
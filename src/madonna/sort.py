@@ -0,0 +1,72 @@
+"""
+Sorting versions by bucketing them on their numeric core.
+"""
+
+from __future__ import annotations
+
+import operator
+from collections import defaultdict
+from typing import Iterable
+
+from madonna.version import Version
+
+_precedence = operator.attrgetter("_key")
+
+# How many versions to look at to judge whether bucketing will pay off,
+# it does once more than about 1 in 16 of them repeat a core already seen
+_SAMPLE = 1024
+_MIN_REPEATS = 1 / 16
+
+
+def sort_versions(versions: Iterable[Version]) -> list[Version]:
+    """
+    Sort versions into precedence order.
+
+    The result is the same as `sorted(versions)`, equal versions keep
+    their relative order, but real version histories repeat the same
+    'major.minor.patch' core over and over, across pre-releases, builds
+    and duplicates, so rather than comparing every version, they're put
+    into a bucket per core, the distinct cores sorted as plain integers
+    and only the versions within a bucket compared against one another.
+
+    When the cores are mostly distinct there's nothing to gain from
+    bucketing, so if a sample of the versions suggests as much, they're
+    sorted on their precedence key directly instead. Either way this is
+    several times faster than `sorted()` on `Version` objects, which has
+    to go through `Version.__lt__` for every comparison.
+
+    Args:
+        versions (Iterable[Version]): The versions to sort.
+
+    Returns:
+        list[Version]: The versions, lowest first.
+
+    Examples:
+    ```python
+    >>> versions = [Version(1, 2, 4), Version(1, 3, 0, "rc.1"), Version(0, 7, 6), Version(1, 2, 4, "alpha")]
+    >>> [str(v) for v in sort_versions(versions)]
+    ['v0.7.6', 'v1.2.4-alpha', 'v1.2.4', 'v1.3.0-rc.1']
+
+    ```
+
+    """
+    items = list(versions)
+
+    sample = items[:_SAMPLE]
+    cores = {(v._major, v._minor, v._patch) for v in sample}
+    if len(sample) - len(cores) <= len(sample) * _MIN_REPEATS:
+        return sorted(items, key=_precedence)
+
+    buckets: defaultdict[tuple[int, int, int], list[Version]] = defaultdict(list)
+    for version in items:
+        buckets[version._major, version._minor, version._patch].append(version)
+
+    ordered: list[Version] = []
+    extend = ordered.extend
+    for core in sorted(buckets):
+        bucket = buckets[core]
+        if len(bucket) > 1:
+            # Only the pre-releases and build metadata are left to tell them apart
+            bucket.sort(key=_precedence)
+        extend(bucket)
+    return ordered
@@ -0,0 +1,330 @@
+"""
+A memory-mapped, sorted on-disk store of versions.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from madonna.range import Bound, Range
+from madonna.version import _NO_STRING, PrecedenceKey, Version, _identifiers_key
+
+# The file is a header, then one fixed width record per version sorted by
+# precedence, then a heap of the utf-8 pre-release and build metadata strings.
+#
+# Header: magic bytes and the number of records.
+# Record: major, minor and patch, the offset into the heap of the record's
+# strings, and the byte lengths of its pre-release and build metadata with
+# _NO_STRING meaning None. The build metadata follows the pre-release.
+_MAGIC = b"MDNASTR\x01"
+_HEADER = struct.Struct("<8sQ")
+_RECORD = struct.Struct("<QQQQHH4x")
+
+
+def _encode(string: str) -> bytes:
+    """
+    Encode a pre-release or build metadata for the string heap.
+    """
+    encoded = string.encode()
+    if len(encoded) >= _NO_STRING:
+        raise OverflowError("Pre-release and build metadata must be shorter than 65535 bytes to store")
+    return encoded
+
+
+def write_store(path: str | os.PathLike[str], versions: Iterable[Version]) -> int:
+    """
+    Write versions to a file that `VersionStore` can open.
+
+    The versions are sorted by precedence and, like a set, each one
+    is only written once.
+
+    Args:
+        path (str | os.PathLike[str]): The file to write, it is replaced
+            if it already exists.
+        versions (Iterable[Version]): The versions to store.
+
+    Returns:
+        int: The number of versions written.
+
+    Raises:
+        OverflowError: If a numeric version part does not fit in 64 bits
+            or a pre-release or build metadata is longer than 65534 bytes.
+
+    Examples:
+    ```python
+    >>> import tempfile, os
+    >>> tmp = tempfile.TemporaryDirectory()
+    >>> path = os.path.join(tmp.name, "versions.bin")
+    >>> write_store(path, [Version(1, 2, 4), Version(0, 7, 6), Version(1, 2, 4)])
+    2
+    >>> tmp.cleanup()
+
+    ```
+
+    """
+    by_key = {version._key: version for version in versions}
+
+    heap = bytearray()
+    with Path(path).open("wb") as file:
+        file.write(_HEADER.pack(_MAGIC, len(by_key)))
+        for key in sorted(by_key):
+            version = by_key[key]
+            offset = len(heap)
+            pre_length = build_length = _NO_STRING
+            if version._prerelease is not None:
+                encoded = _encode(version._prerelease)
+                pre_length = len(encoded)
+                heap += encoded
+            if version._buildmetadata is not None:
+                encoded = _encode(version._buildmetadata)
+                build_length = len(encoded)
+                heap += encoded
+
+            try:
+                file.write(_RECORD.pack(key[0], key[1], key[2], offset, pre_length, build_length))
+            except struct.error:
+                raise OverflowError(f"{version!r} has a numeric part too large to store in 64 bits") from None
+
+        file.write(heap)
+
+    return len(by_key)
+
+
+class VersionStore:
+    """
+    A read-only, memory-mapped store of sorted versions.
+    """
+
+    __slots__ = ("_count", "_file", "_heap", "_map")
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """
+        Open a file written by `write_store`.
+
+        The file is memory-mapped rather than read, so opening it is
+        instant however many versions it holds and the operating system
+        pages in just the parts lookups touch. Lookups are a binary search
+        over the fixed width records and a `Version` is only built for the
+        records actually returned.
+
+        A store should be closed when done with, either with `close` or
+        by using it as a context manager.
+
+        Args:
+            path (str | os.PathLike[str]): The file to open.
+
+        Raises:
+            ValueError: If the file is not a valid version store.
+
+        Examples:
+        ```python
+        >>> import tempfile, os
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> path = os.path.join(tmp.name, "versions.bin")
+        >>> _ = write_store(path, [Version(1, 2, 4), Version(2, 0, 0), Version(1, 9, 0)])
+        >>> with VersionStore(path) as store:
+        ...     store.max_satisfying(Range("^1.2"))
+        Version(major=1, minor=9, patch=0, prerelease=None, buildmetadata=None)
+        >>> tmp.cleanup()
+
+        ```
+
+        """
+        self._file = Path(path).open("rb")  # noqa: SIM115
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file can't be mapped
+            self._file.close()
+            raise ValueError(f"{os.fspath(path)!r} is not a version store") from None
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{os.fspath(path)!r} is not a version store")
+
+        magic, count = _HEADER.unpack_from(self._map)
+        heap = _HEADER.size + count * _RECORD.size
+        if magic != _MAGIC or len(self._map) < heap:
+            self.close()
+            raise ValueError(f"{os.fspath(path)!r} is not a version store")
+
+        self._count: int = count
+        self._heap = heap
+
+    def close(self) -> None:
+        """
+        Unmap and close the underlying file.
+        """
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> VersionStore:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._file.name!r})"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, index: int) -> tuple[int, int, int, str | None, str | None]:
+        """
+        Decode the fields of the record at a (non-negative) index.
+        """
+        major, minor, patch, offset, pre_length, build_length = _RECORD.unpack_from(
+            self._map, _HEADER.size + index * _RECORD.size
+        )
+        position = self._heap + offset
+        prerelease = None
+        if pre_length != _NO_STRING:
+            prerelease = self._map[position : position + pre_length].decode()
+            position += pre_length
+        buildmetadata = None
+        if build_length != _NO_STRING:
+            buildmetadata = self._map[position : position + build_length].decode()
+        return major, minor, patch, prerelease, buildmetadata
+
+    def _key(self, index: int) -> PrecedenceKey:
+        """
+        The precedence key of the record at a (non-negative) index,
+        without building a `Version`.
+        """
+        major, minor, patch, prerelease, buildmetadata = self._record(index)
+        return (major, minor, patch, _identifiers_key(prerelease), _identifiers_key(buildmetadata))
+
+    def _bisect_left(self, bound: Bound) -> int:
+        """
+        The index of the first record whose key is not less than `bound`.
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < bound:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _bisect_right(self, bound: Bound) -> int:
+        """
+        The index of the first record whose key is greater than `bound`.
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if bound < self._key(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def __getitem__(self, index: int) -> Version:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("VersionStore index out of range")
+        return Version(*self._record(index))
+
+    def __iter__(self) -> Iterator[Version]:
+        for index in range(self._count):
+            yield Version(*self._record(index))
+
+    def __contains__(self, version: object) -> bool:
+        if not isinstance(version, Version):
+            return False
+        index = self._bisect_left(version._key)
+        return index < self._count and self._key(index) == version._key
+
+    def max_satisfying(self, constraint: Range) -> Version | None:
+        """
+        Return the highest stored version that satisfies a range.
+
+        Args:
+            constraint (Range): The range to satisfy.
+
+        Returns:
+            Version | None: The highest matching version, or None if
+                no version matches.
+
+        Examples:
+        ```python
+        >>> import tempfile, os
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> path = os.path.join(tmp.name, "versions.bin")
+        >>> _ = write_store(path, [Version(1, 2, 4), Version(2, 0, 0, "rc.1"), Version(2, 1, 0)])
+        >>> with VersionStore(path) as store:
+        ...     str(store.max_satisfying(Range("<2.1.0")))
+        'v2.0.0-rc.1'
+        >>> tmp.cleanup()
+
+        ```
+
+        """
+        for low, high in reversed(constraint._intervals):
+            index = self._bisect_left(high) - 1
+            if index < 0:
+                return None
+            if self._key(index) >= low:
+                return self[index]
+        return None
+
+    def min_satisfying(self, constraint: Range) -> Version | None:
+        """
+        Return the lowest stored version that satisfies a range.
+
+        Args:
+            constraint (Range): The range to satisfy.
+
+        Returns:
+            Version | None: The lowest matching version, or None if
+                no version matches.
+
+        """
+        for low, high in constraint._intervals:
+            index = self._bisect_left(low)
+            if index == self._count:
+                return None
+            if self._key(index) < high:
+                return self[index]
+        return None
+
+    def between(self, low: Version, high: Version) -> Iterator[Version]:
+        """
+        Scan the stored versions from `low` to `high` (both inclusive),
+        in order.
+
+        The bounds are found by binary search and the versions in between
+        are built one at a time as the iterator is consumed.
+
+        Args:
+            low (Version): The lowest version to return.
+            high (Version): The highest version to return.
+
+        Yields:
+            Version: The versions in between.
+
+        Examples:
+        ```python
+        >>> import tempfile, os
+        >>> tmp = tempfile.TemporaryDirectory()
+        >>> path = os.path.join(tmp.name, "versions.bin")
+        >>> _ = write_store(path, (Version(1, minor, 0) for minor in range(5)))
+        >>> with VersionStore(path) as store:
+        ...     [str(v) for v in store.between(Version(1, 1, 0), Version(1, 3, 0))]
+        ['v1.1.0', 'v1.2.0', 'v1.3.0']
+        >>> tmp.cleanup()
+
+        ```
+
+        """
+        start = self._bisect_left(low._key)
+        stop = self._bisect_right(high._key)
+        for index in range(start, stop):
+            yield Version(*self._record(index))
@@ -7,26 +7,44 @@ Created: 08/10/2021
 
 from __future__ import annotations
 
-import json
+import functools
+import mmap
 import re
+import struct
 
 # Compatibility with python 3.8
 from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    NamedTuple,
     Optional,
     Tuple,
     TypedDict,  # pragma: no cover
+    Union,
+    overload,
 )
 
 # See https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
 # The only thing we've added is the optional v at the start
-_SEMVER_REGEX = re.compile(
-    r"""^v?(?P<major>0|[1-9]\d*)\. # Major
+_SEMVER_PATTERN = r"""^v?(?P<major>0|[1-9]\d*)\. # Major
     (?P<minor>0|[1-9]\d*)\. # Minor
     (?P<patch>0|[1-9]\d*) # Patch
     (?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?
-    (?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$""",  # Optional build metadata
-    flags=re.VERBOSE,
-)
+    (?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"""  # Optional build metadata
+
+
+@functools.lru_cache(maxsize=None)
+def _semver_regex() -> re.Pattern[str]:
+    """
+    The compiled semver regex.
+
+    Compiled on first use rather than at import, as plenty of programs
+    only ever build versions from ints or parse plain 'X.Y.Z' strings,
+    which never need it.
+    """
+    return re.compile(_SEMVER_PATTERN, flags=re.VERBOSE)
 
 
 class VersionDict(TypedDict):
@@ -44,6 +62,155 @@ class VersionDict(TypedDict):
 
 VersionTuple = Tuple[int, int, int, Optional[str], Optional[str]]
 
+# A single dot separated identifier, tagged so that numeric identifiers
+# always sort before alphanumeric ones e.g. (0, 1) or (1, 'rc')
+Identifier = Tuple[int, Union[int, str]]
+
+# Either (0, identifiers) if the version has a pre-release/build or
+# (1,) if not, so that having one sorts before not having one
+IdentifiersKey = Tuple[Union[int, Tuple[Identifier, ...]], ...]
+
+# (major, minor, patch, pre-release key, build metadata key)
+PrecedenceKey = Tuple[int, int, int, IdentifiersKey, IdentifiersKey]
+
+_ABSENT: IdentifiersKey = (1,)
+
+# Anything the binary decoders accept
+BytesLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# The fixed header of the binary encoding: major, minor and patch as unsigned
+# 64 bit ints then the byte lengths of the utf-8 pre-release and build
+# metadata that follow it, with _NO_STRING meaning None
+_HEADER = struct.Struct("<QQQHH")
+_NO_STRING = 0xFFFF
+
+# The types a pre-release or build metadata can be
+_OPTIONAL_STR: tuple[type, ...] = (str, type(None))
+
+
+def _is_number(part: str) -> bool:
+    """
+    Whether `part` is a canonical semver number i.e. ASCII
+    digits with no leading zeros.
+    """
+    return part.isdigit() and part.isascii() and (part == "0" or part[0] != "0")
+
+
+def _split_identifiers(identifiers: str) -> tuple[Identifier, ...]:
+    """
+    Split a dot separated pre-release or build metadata string
+    into typed identifiers.
+
+    Numeric identifiers are converted to ints so they compare
+    numerically and are tagged so that they always have lower
+    precedence than alphanumeric ones, which compare lexically.
+
+    Only canonical numbers are treated as numeric, anything else
+    (e.g. '01') is compared as text so that two keys are only ever
+    equal if the strings they came from are.
+    """
+    return tuple([(0, int(part)) if _is_number(part) else (1, part) for part in identifiers.split(".")])
+
+
+def _identifiers_key(identifiers: str | None) -> IdentifiersKey:
+    """
+    Build the precedence key for an optional pre-release
+    or build metadata string.
+    """
+    if identifiers is None:
+        return _ABSENT
+
+    return (0, _split_identifiers(identifiers))
+
+
+def _is_identifier(identifier: str) -> bool:
+    """
+    Check a non-empty string is only ASCII letters, digits and hyphens.
+    """
+    # isalnum alone would allow non ASCII letters and digits
+    return identifier.isascii() and identifier.replace("-", "a").isalnum()
+
+
+def _is_valid_build(build: str) -> bool:
+    """
+    Check build metadata, dot separated non-empty [0-9a-zA-Z-] identifiers.
+    """
+    return (
+        build.isascii()
+        and build.replace("-", "a").replace(".", "a").isalnum()
+        and build[0] != "."
+        and build[-1] != "."
+        and ".." not in build
+    )
+
+
+def _is_valid_prerelease_identifier(identifier: str) -> bool:
+    """
+    Check a single pre-release identifier the way the regex does, where
+    its digits match any unicode decimal digit.
+    """
+    if identifier.isdecimal():
+        # Numeric, no leading zeros
+        return identifier == "0" or identifier[0] in "123456789"
+
+    # Alphanumeric, any digits then ASCII letters, digits and hyphens
+    # starting with a letter or hyphen
+    position = 0
+    while identifier[position].isdecimal():
+        position += 1
+    return _is_identifier(identifier[position:])
+
+
+def _is_valid_prerelease(prerelease: str) -> bool:
+    """
+    Check a pre-release, dot separated identifiers with no leading zeros
+    on the numeric ones.
+    """
+    if _is_valid_build(prerelease):
+        # The common case, plain ASCII identifiers, only numeric
+        # ones with a leading zero can still be invalid
+        if "0" not in prerelease:
+            return True
+        return all(
+            identifier == "0" or identifier[0] != "0" or not identifier.isdigit()
+            for identifier in prerelease.split(".")
+        )
+
+    if prerelease.isascii():
+        return False
+
+    return all(identifier and _is_valid_prerelease_identifier(identifier) for identifier in prerelease.split("."))
+
+
+def _is_valid_suffix(prerelease: str | None, buildmetadata: str | None) -> bool:
+    """
+    Check the pre-release and build metadata exactly as matching the regex
+    against the formatted version would.
+
+    That means empty strings are left out, a '+' in the pre-release starts
+    the build metadata and the regex's '$' allows a single trailing newline.
+    """
+    pre = prerelease or ""
+    build = buildmetadata or ""
+    has_build = bool(build)
+
+    if "+" in pre:
+        if has_build:
+            # The build metadata would end up containing a '+'
+            return False
+        pre, _, build = pre.partition("+")
+        has_build = True
+
+    if has_build:
+        if build[-1:] == "\n":
+            build = build[:-1]
+        if not _is_valid_build(build):
+            return False
+    elif pre[-1:] == "\n":
+        pre = pre[:-1]
+
+    return not prerelease or _is_valid_prerelease(pre)
+
 
 class Version:
     """
@@ -75,197 +242,222 @@ class Version:
 
         Raises:
             ValueError: If any numeric version part < 0.
+            TypeError: If `prerelease` or `buildmetadata` is not a string
+                or None.
 
         """
-        self.major = major
-        self.minor = minor
-        self.patch = patch
-        self.prerelease = prerelease
-        self.buildmetadata = buildmetadata
+        self._major = major
+        self._minor = minor
+        self._patch = patch
+        self._prerelease = prerelease
+        self._buildmetadata = buildmetadata
 
-        if any(part < 0 for part in (self.major, self.minor, self.patch)):
+        if major < 0 or minor < 0 or patch < 0:
             raise ValueError(f"Version {self!r} is invalid. Parts cannot be less than 0.")
+        # Checked up front, the precedence key below splits them
+        if not isinstance(prerelease, _OPTIONAL_STR) or not isinstance(buildmetadata, _OPTIONAL_STR):
+            raise TypeError(f"Version {self!r} is invalid. Pre-release and build metadata must be strings or None.")
+
+        # Precomputed once so comparisons and sorting are plain tuple comparisons
+        self._key: PrecedenceKey = (
+            major,
+            minor,
+            patch,
+            _ABSENT if prerelease is None else (0, _split_identifiers(prerelease)),
+            _ABSENT if buildmetadata is None else (0, _split_identifiers(buildmetadata)),
+        )
+        # Filled in by is_valid, set here as a miss is far cheaper to
+        # check for than catching the AttributeError of an unset slot
+        self._valid: bool | None = None
+
+    __slots__ = ("_buildmetadata", "_hash", "_key", "_major", "_minor", "_patch", "_prerelease", "_valid")
+
+    # The fields are read only so a Version is immutable, which is what makes
+    # it safe to precompute its key and share instances e.g. from the parse cache
+    @property
+    def major(self) -> int:
+        """
+        The major version.
+        """
+        return self._major
+
+    @property
+    def minor(self) -> int:
+        """
+        The minor version.
+        """
+        return self._minor
 
-    __slots__ = ("buildmetadata", "major", "minor", "patch", "prerelease")
+    @property
+    def patch(self) -> int:
+        """
+        The patch version.
+        """
+        return self._patch
+
+    @property
+    def prerelease(self) -> str | None:
+        """
+        The pre-release tags, if any.
+        """
+        return self._prerelease
+
+    @property
+    def buildmetadata(self) -> str | None:
+        """
+        The build metadata tags, if any.
+        """
+        return self._buildmetadata
 
     def __repr__(self) -> str:
         return (
             self.__class__.__qualname__
-            + f"(major={self.major!r}, minor={self.minor!r}, patch={self.patch!r}, "
-            + f"prerelease={self.prerelease!r}, buildmetadata={self.buildmetadata!r})"
+            + f"(major={self._major!r}, minor={self._minor!r}, patch={self._patch!r}, "
+            + f"prerelease={self._prerelease!r}, buildmetadata={self._buildmetadata!r})"
         )
 
     def __str__(self) -> str:
-        ver = f"v{self.major}.{self.minor}.{self.patch}"
+        ver = f"v{self._major}.{self._minor}.{self._patch}"
 
-        if self.prerelease:
-            ver += f"-{self.prerelease}"
+        if self._prerelease:
+            ver += f"-{self._prerelease}"
 
-        if self.buildmetadata:
-            ver += f"+{self.buildmetadata}"
+        if self._buildmetadata:
+            ver += f"+{self._buildmetadata}"
 
         return ver
 
+    # Each rich comparison is a single comparison of the precomputed
+    # precedence keys, i.e. exactly what `compare` works out
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Version):
             raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        return (
-            self.major,
-            self.minor,
-            self.patch,
-            self.prerelease,
-            self.buildmetadata,
-        ) == (
-            other.major,
-            other.minor,
-            other.patch,
-            other.prerelease,
-            other.buildmetadata,
-        )
+        return self._key == other._key
 
-    def __lt__(self, other: object) -> bool:
+    def __ne__(self, other: object) -> bool:
         if not isinstance(other, Version):
             raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        if (self.major, self.minor, self.patch) < (
-            other.major,
-            other.minor,
-            other.patch,
-        ):
-            return True
+        return self._key != other._key
 
-        if self._compare_prerelease(other) == -1:
-            return True
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, Version):
+            raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        return self._compare_build(other) == -1
+        return self._key < other._key
 
     def __gt__(self, other: object) -> bool:
         if not isinstance(other, Version):
             raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        if (self.major, self.minor, self.patch) > (
-            other.major,
-            other.minor,
-            other.patch,
-        ):
-            return True
-
-        if self._compare_prerelease(other) == 1:
-            return True
-
-        return self._compare_build(other) == 1
+        return self._key > other._key
 
     def __le__(self, other: object) -> bool:
         if not isinstance(other, Version):
             raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        return bool(self == other or self < other)
+        return self._key <= other._key
 
     def __ge__(self, other: object) -> bool:
         if not isinstance(other, Version):
             raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        return bool(self == other or self > other)
+        return self._key >= other._key
 
     def __hash__(self) -> int:
-        return hash(self.to_tuple())
-
-    def _compare_prerelease(self, other: Version) -> int:
+        # Safe to cache as a Version is immutable, the slot is only
+        # filled the first time the Version is hashed
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash: int = hash(self.to_tuple())
+            return self._hash
+
+    def __reduce__(self) -> tuple[Callable[..., Version], tuple[Any, ...]]:
+        # Pickle as just the fields, without the derived key and hash, and
+        # with trailing Nones dropped, so a plain version is 3 small ints
+        if self._buildmetadata is not None:
+            fields: tuple[Any, ...] = (self._major, self._minor, self._patch, self._prerelease, self._buildmetadata)
+        elif self._prerelease is not None:
+            fields = (self._major, self._minor, self._patch, self._prerelease)
+        else:
+            fields = (self._major, self._minor, self._patch)
+
+        if self.__class__ is Version:
+            return _restore, fields
+        return self.__class__, fields
+
+    def compare(self, other: Version) -> int:
         """
-        Helper to try and compare the pre-release versions.
+        Compare the `Version` against another in a single pass.
 
-        It will check for string equality, whether or not
-        the different versions have pre-releases, check
-        for integers in the text and compare based on them,
-        and if none of this works will raise a ValueError.
+        Works out the precedence of the two versions from their
+        precomputed keys, making it suitable for use as a comparator
+        with `functools.cmp_to_key`.
 
-        Note: This is only called if the numeric version
-        is equal.
-        """
-        if self.prerelease == other.prerelease:
-            # The pre release strings are equal
-            return 0
-        elif self.prerelease and not other.prerelease:  # noqa: RET505
-            # Ours has a pre-release but the other doesn't
-            # meaning ours is less
-            return -1
-        elif not self.prerelease and other.prerelease:
-            # Ours doesn't have a pre-release but the other
-            # does meaning ours is greater
-            return 1
+        Args:
+            other (Version): The Version to compare against.
 
-        # Try and extract a number to compare
-        if self.prerelease and other.prerelease:
-            ours = re.findall(pattern=r"\d+", string=self.prerelease)
-            others = re.findall(pattern=r"\d+", string=other.prerelease)
+        Returns:
+            int: -1 if this `Version` is less than `other`, 0 if they are
+                equal and 1 if it is greater.
 
-            if not ours or not others:
-                raise ValueError("Could not parse comparable pre-release version info.")
+        Raises:
+            TypeError: If `other` is not a `Version`.
 
-            if len(ours) > 1 or len(others) > 1:
-                raise ValueError("Multiple integers found in pre-release version.")
+        Examples:
+        ```python
+        >>> Version(1, 2, 4).compare(Version(1, 2, 4, "rc.1"))
+        1
 
-            our_version = int(ours.pop())
-            other_version = int(others.pop())
+        ```
 
-            if our_version == other_version:
-                return 0
-            elif our_version > other_version:  # noqa: RET505
-                return 1
-            elif our_version < other_version:
-                return -1
+        ```python
+        >>> Version(1, 2, 4, "rc.1").compare(Version(1, 2, 4, "rc.1"))
+        0
 
-        # If we get here, we couldn't parse the pre-release
-        raise ValueError(f"Could not compare {self.prerelease} and {other.prerelease}")  # pragma: no cover
+        ```
 
-    def _compare_build(self, other: Version) -> int:
         """
-        Helper to try and compare the build metadata versions.
+        if not isinstance(other, Version):
+            raise TypeError(f"Cannot compare object of type Version and {type(other)}")
 
-        It will check for string equality, whether or not
-        the different versions have pre-releases, check
-        for integers in the text and compare based on them,
-        and if none of this works will raise a ValueError.
+        ours = self._key
+        others = other._key
 
-        Note: This is only called if both the numeric version
-        and the pre-release strings are equal.
-        """
-        if self.buildmetadata == other.buildmetadata:
-            # The pre release strings are equal
+        if ours == others:
             return 0
-        elif self.buildmetadata and not other.buildmetadata:  # noqa: RET505
-            # Ours has a pre-release but the other doesn't
-            # meaning ours is less
-            return -1
-        elif not self.buildmetadata and other.buildmetadata:
-            # Ours doesn't have a pre-release but the other
-            # does meaning ours is greater
-            return 1
-
-        # Try and extract a number to compare
-        if self.buildmetadata and other.buildmetadata:
-            ours = re.findall(pattern=r"\d+", string=self.buildmetadata)
-            others = re.findall(pattern=r"\d+", string=other.buildmetadata)
-
-            if not ours or not others:
-                raise ValueError("Could not parse comparable build metadata version info.")
-
-            if len(ours) > 1 or len(others) > 1:
-                raise ValueError("Multiple integers found in build metadata version.")
-
-            our_version = int(ours.pop())
-            other_version = int(others.pop())
-
-            if our_version == other_version:
-                return 0
-            elif our_version > other_version:  # noqa: RET505
-                return 1
-            elif our_version < other_version:
-                return -1
-
-        # If we get here, we couldn't parse the pre-release
-        raise ValueError(f"Could not compare {self.buildmetadata} and {other.buildmetadata}")  # pragma: no cover
+        return -1 if ours < others else 1
+
+    def sort_key(self) -> PrecedenceKey:
+        """
+        Return the precedence key of the `Version`.
+
+        The key is computed once when the `Version` is created so
+        it is cheap to call, and is designed to be passed as the `key`
+        argument to `sorted`, `min`, `max` etc. or to build a list of
+        keys for use with `bisect`.
+
+        Returns:
+            PrecedenceKey: The Version precedence key.
+
+        Examples:
+        ```python
+        >>> versions = [Version(1, 2, 4), Version(1, 2, 4, "rc.1"), Version(0, 7, 6)]
+        >>> [str(v) for v in sorted(versions, key=Version.sort_key)]
+        ['v0.7.6', 'v1.2.4-rc.1', 'v1.2.4']
+
+        ```
+
+        ```python
+        >>> Version(1, 2, 4, "rc.1").sort_key()
+        (1, 2, 4, (0, ((1, 'rc'), (0, 1))), (1,))
+
+        ```
+
+        """
+        return self._key
 
     def is_valid(self) -> bool:
         """
@@ -273,6 +465,10 @@ class Version:
         semver regex pattern and reports whether or not it
         is a valid semver.
 
+        The fields are checked directly, giving the same answer as matching
+        the regex against `to_string()` without formatting the string, and
+        the result is cached.
+
         Returns:
             bool: True if `Version` is valid, else False
 
@@ -292,7 +488,20 @@ class Version:
         ```
 
         """
-        return bool(_SEMVER_REGEX.match(self.to_string()))
+        if self._valid is not None:
+            return self._valid
+
+        if type(self._major) is type(self._minor) is type(self._patch) is int:
+            # Non-negative ints always format as valid numbers, so only the
+            # pre-release and build metadata need checking
+            valid = _is_valid_suffix(self._prerelease, self._buildmetadata)
+        else:
+            # Anything unusual, e.g. a bool or float part, gets the regex
+            valid = bool(_semver_regex().match(self.to_string()))
+
+        # Safe to cache as a Version is immutable
+        self._valid = valid
+        return valid
 
     def bump_major(self) -> Version:
         """
@@ -318,7 +527,7 @@ class Version:
         ```
 
         """
-        return Version(self.major + 1, 0, 0)
+        return Version(self._major + 1, 0, 0)
 
     def bump_minor(self) -> Version:
         """
@@ -344,7 +553,7 @@ class Version:
         ```
 
         """
-        return Version(self.major, self.minor + 1, 0)
+        return Version(self._major, self._minor + 1, 0)
 
     def bump_patch(self) -> Version:
         """
@@ -370,7 +579,7 @@ class Version:
         ```
 
         """
-        return Version(self.major, self.minor, self.patch + 1)
+        return Version(self._major, self._minor, self._patch + 1)
 
     def to_string(self) -> str:
         """
@@ -422,7 +631,7 @@ class Version:
         ```
 
         """
-        return (self.major, self.minor, self.patch, self.prerelease, self.buildmetadata)
+        return (self._major, self._minor, self._patch, self._prerelease, self._buildmetadata)
 
     def to_dict(self) -> VersionDict:
         """
@@ -448,11 +657,11 @@ class Version:
 
         """
         return {
-            "major": self.major,
-            "minor": self.minor,
-            "patch": self.patch,
-            "prerelease": self.prerelease,
-            "buildmetadata": self.buildmetadata,
+            "major": self._major,
+            "minor": self._minor,
+            "patch": self._patch,
+            "prerelease": self._prerelease,
+            "buildmetadata": self._buildmetadata,
         }
 
     def to_json(self) -> str:
@@ -478,8 +687,56 @@ class Version:
         ```
 
         """
+        # Imported on first use, to keep it out of `import madonna`
+        import json
+
         return json.dumps(self.to_dict())
 
+    def to_bytes(self) -> bytes:
+        """
+        Return the `Version` in a compact binary encoding.
+
+        A fixed 28 byte little-endian header (major, minor and patch as
+        unsigned 64 bit ints and the lengths of the pre-release and build
+        metadata as unsigned 16 bit ints) followed by the utf-8 pre-release
+        and build metadata, if there are any.
+
+        Returns:
+            bytes: The encoded Version.
+
+        Raises:
+            OverflowError: If a numeric part does not fit in 64 bits or the
+                pre-release or build metadata is longer than 65534 bytes.
+
+        Examples:
+        ```python
+        >>> v = Version(1, 2, 4, "rc.1")
+        >>> len(v.to_bytes())
+        32
+        >>> Version.from_bytes(v.to_bytes()) == v
+        True
+
+        ```
+
+        """
+        prerelease = b"" if self._prerelease is None else self._prerelease.encode()
+        buildmetadata = b"" if self._buildmetadata is None else self._buildmetadata.encode()
+        if len(prerelease) >= _NO_STRING or len(buildmetadata) >= _NO_STRING:
+            raise OverflowError("Pre-release and build metadata must be shorter than 65535 bytes to encode")
+
+        try:
+            header = _HEADER.pack(
+                self._major,
+                self._minor,
+                self._patch,
+                _NO_STRING if self._prerelease is None else len(prerelease),
+                _NO_STRING if self._buildmetadata is None else len(buildmetadata),
+            )
+        except struct.error:
+            raise OverflowError(f"{self!r} has a numeric part too large to encode in 64 bits") from None
+
+        return header + prerelease + buildmetadata
+
     @classmethod
     def from_dict(cls, version_dict: VersionDict) -> Version:
         """
@@ -498,7 +755,8 @@ class Version:
 
         Raises:
             TypeError: If the passed dictionary does not
-                have keys matching the required parts.
+                have keys matching the required parts, or the
+                pre-release or build metadata is not a string.
 
         Examples:
         ```python
@@ -519,17 +777,23 @@ class Version:
         return Version(**version_dict)
 
     @classmethod
-    def from_string(cls, string: str) -> Version:
+    def from_string(cls, string: str, *, lazy: bool = False) -> Version:
         """
         Construct and return a `Version` from a valid semver
         string.
 
+        If the parse cache has been enabled with `set_cache_size`,
+        repeated strings return the same shared `Version` instance.
+
         Args:
             string (str): The semver string.
+            lazy (bool, optional): Return a `LazyVersion` that only parses
+                the string once a field is needed. Defaults to False.
 
         Raises:
             ValueError: If the semver string does not
-                pass the official semver regex.
+                pass the official semver regex. With `lazy=True` this
+                is raised on first use instead.
 
         Returns:
             Version: The constructed Version.
@@ -548,19 +812,11 @@ class Version:
         ```
 
         """
-        match = _SEMVER_REGEX.match(string)
-        if not match:
-            raise ValueError(f"{string!r} is not a valid semver string.")
-
-        return Version.from_dict(
-            VersionDict(
-                major=int(match.group("major")),
-                minor=int(match.group("minor")),
-                patch=int(match.group("patch")),
-                prerelease=match.group("prerelease"),
-                buildmetadata=match.group("buildmetadata"),
-            )
-        )
+        if lazy:
+            return LazyVersion(string)
+        if _cached_parse is not None:
+            return _cached_parse(string)
+        return _parse(string)
 
     @classmethod
     def from_tuple(cls, tup: VersionTuple) -> Version:
@@ -605,6 +861,11 @@ class Version:
         Returns:
             Version: The constructed Version.
 
+        Raises:
+            TypeError: If the json does not have keys matching the
+                required parts, or the pre-release or build metadata
+                is not a string.
+
         Examples:
         ```python
         >>> v = '{"major": 1, "minor": 2, "patch": 4}'
@@ -621,5 +882,428 @@ class Version:
         ```
 
         """
+        import json
+
         data: VersionDict = json.loads(json_string)
         return Version(**data)
+
+    @classmethod
+    def from_bytes(cls, data: BytesLike) -> Version:
+        """
+        Construct and return a `Version` from its binary encoding,
+        see `Version.to_bytes`.
+
+        Args:
+            data (BytesLike): The encoded Version, as bytes, a bytearray,
+                a memoryview or an mmap.
+
+        Returns:
+            Version: The decoded Version.
+
+        Raises:
+            ValueError: If `data` is not exactly one encoded Version.
+
+        Examples:
+        ```python
+        >>> Version.from_bytes(Version(1, 2, 4, None, "build.1").to_bytes())
+        Version(major=1, minor=2, patch=4, prerelease=None, buildmetadata='build.1')
+
+        ```
+
+        """
+        view = memoryview(data).cast("B")
+        version, end = _unpack_from(view, 0)
+        if end != len(view):
+            raise ValueError(f"Expected {end} bytes for an encoded Version, got {len(view)}")
+        return version
+
+
+class LazyVersion(Version):
+    """
+    A Version that parses its string on first use.
+    """
+
+    __slots__ = ("_string",)
+
+    def __init__(self, string: str) -> None:
+        """
+        A `Version` that keeps the string it came from and defers parsing
+        it until one of its fields is needed.
+
+        Version strings that are only passed through, e.g. read, printed
+        or written back out, are never parsed at all as `str()` returns
+        the original string unchanged. Anything else: a field, a comparison,
+        hashing or a conversion, parses it once and from then on the
+        `LazyVersion` behaves exactly like a `Version`.
+
+        Args:
+            string (str): The semver string.
+
+        Raises:
+            ValueError: When first used, if `string` is not
+                a valid semver string.
+
+        Examples:
+        ```python
+        >>> v = LazyVersion("1.2.4-rc.1")
+        >>> str(v)
+        '1.2.4-rc.1'
+        >>> v.prerelease
+        'rc.1'
+        >>> v == Version(1, 2, 4, "rc.1")
+        True
+
+        ```
+
+        """
+        self._string = string
+
+    def __getattr__(self, name: str) -> object:
+        # Only called for unset slots, which before parsing are all the fields
+        if name not in _PARSED_SLOTS:
+            raise AttributeError(name)
+
+        parsed = _parse(self._string) if _cached_parse is None else _cached_parse(self._string)
+        self._major = parsed._major
+        self._minor = parsed._minor
+        self._patch = parsed._patch
+        self._prerelease = parsed._prerelease
+        self._buildmetadata = parsed._buildmetadata
+        self._key = parsed._key
+        return getattr(self, name)
+
+    def __reduce__(self) -> tuple[Callable[..., Version], tuple[Any, ...]]:
+        # Stays lazy through a pickle round trip
+        return self.__class__, (self._string,)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._string!r})"
+
+    def __str__(self) -> str:
+        return self._string
+
+    def is_valid(self) -> bool:
+        """
+        Report whether the original string is valid semver, without
+        parsing it.
+
+        Returns:
+            bool: True if the string is valid, else False.
+
+        Examples:
+        ```python
+        >>> LazyVersion("1.2.4-rc.1").is_valid()
+        True
+        >>> LazyVersion("1.2").is_valid()
+        False
+
+        ```
+
+        """
+        return is_valid_string(self._string)
+
+
+# The slots LazyVersion fills in when it parses
+_PARSED_SLOTS = frozenset(("_major", "_minor", "_patch", "_prerelease", "_buildmetadata", "_key"))
+
+
+def _restore(
+    major: int, minor: int, patch: int, prerelease: str | None = None, buildmetadata: str | None = None
+) -> Version:
+    """
+    Rebuild an unpickled `Version`.
+
+    The fields came from a valid Version so, unlike `Version.__init__`,
+    this skips validating them and just fills in the slots.
+    """
+    version = _new_version(Version)
+    version._major = major
+    version._minor = minor
+    version._patch = patch
+    version._prerelease = prerelease
+    version._buildmetadata = buildmetadata
+    version._key = (
+        major,
+        minor,
+        patch,
+        _ABSENT if prerelease is None else _restore_identifiers_key(prerelease),
+        _ABSENT if buildmetadata is None else _restore_identifiers_key(buildmetadata),
+    )
+    version._valid = None
+    return version
+
+
+_new_version = object.__new__
+
+# Unpickling tends to see the same few pre-releases and build metadata over
+# and over, so remember their keys rather than splitting them up every time
+_restore_identifiers_key = functools.lru_cache(maxsize=1024)(_identifiers_key)
+
+
+def compare(a: Version, b: Version) -> int:
+    """
+    Compare two versions, see `Version.compare`.
+
+    Args:
+        a (Version): The first Version.
+        b (Version): The Version to compare it against.
+
+    Returns:
+        int: -1 if `a` is less than `b`, 0 if they are equal and
+            1 if it is greater.
+
+    Examples:
+    ```python
+    >>> import functools
+    >>> versions = [Version(1, 2, 4), Version(0, 7, 6), Version(1, 2, 4, "rc.1")]
+    >>> [str(v) for v in sorted(versions, key=functools.cmp_to_key(compare))]
+    ['v0.7.6', 'v1.2.4-rc.1', 'v1.2.4']
+
+    ```
+
+    """
+    return a.compare(b)
+
+
+def _plain_core(string: str) -> list[str] | None:
+    """
+    Split a plain 'X.Y.Z' or 'vX.Y.Z' string into its three numbers,
+    None if it is anything else.
+
+    The fast path of both parsing and validating, for the overwhelmingly
+    common plain versions. Anything else, including anything invalid,
+    goes to the regex so the results and errors are always the same.
+    """
+    if "-" not in string and "+" not in string:
+        core = string[1:] if string[:1] == "v" else string
+        parts = core.split(".")
+        if len(parts) == 3 and core.isascii():
+            major, minor, patch = parts
+            # Inlined rather than calling _is_number 3 times, this is the hot path
+            if (
+                major.isdigit()
+                and minor.isdigit()
+                and patch.isdigit()
+                and (major[0] != "0" or major == "0")
+                and (minor[0] != "0" or minor == "0")
+                and (patch[0] != "0" or patch == "0")
+            ):
+                return parts
+    return None
+
+
+def _parse(string: str) -> Version:
+    """
+    Parse a semver string, the implementation of `Version.from_string`.
+    """
+    core = _plain_core(string)
+    if core is not None:
+        major, minor, patch = core
+        return Version(int(major), int(minor), int(patch))
+
+    match = _semver_regex().match(string)
+    if not match:
+        raise ValueError(f"{string!r} is not a valid semver string.")
+
+    return Version(
+        int(match.group("major")),
+        int(match.group("minor")),
+        int(match.group("patch")),
+        match.group("prerelease"),
+        match.group("buildmetadata"),
+    )
+
+
+def _unpack_from(view: memoryview, offset: int) -> tuple[Version, int]:
+    """
+    Decode the binary encoded `Version` starting at `offset` in a
+    (byte format) memoryview, returns it and the offset just after it.
+    """
+    try:
+        major, minor, patch, pre_length, build_length = _HEADER.unpack_from(view, offset)
+    except struct.error:
+        raise ValueError(f"Truncated Version header at offset {offset}") from None
+
+    position = offset + _HEADER.size
+    if pre_length == _NO_STRING and build_length == _NO_STRING:
+        return Version(major, minor, patch), position
+
+    # str() decodes straight out of the buffer, without copying to bytes first
+    prerelease = None
+    if pre_length != _NO_STRING:
+        prerelease = str(view[position : position + pre_length], "utf-8")
+        position += pre_length
+    buildmetadata = None
+    if build_length != _NO_STRING:
+        buildmetadata = str(view[position : position + build_length], "utf-8")
+        position += build_length
+
+    if position > len(view):
+        # Slicing past the end silently truncates, so check afterwards
+        raise ValueError(f"Truncated Version at offset {offset}")
+
+    return Version(major, minor, patch, prerelease, buildmetadata), position
+
+
+def is_valid_string(string: str) -> bool:
+    """
+    Check whether a string is valid semver, without parsing it into a `Version`.
+
+    Exactly the strings `Version.from_string` accepts are valid, but
+    checking one allocates no `Version` and raises no exception.
+
+    Args:
+        string (str): The string to check.
+
+    Returns:
+        bool: True if `string` is valid semver, else False.
+
+    Examples:
+    ```python
+    >>> is_valid_string("v1.2.4-rc.1")
+    True
+    >>> is_valid_string("1.2")
+    False
+
+    ```
+
+    """
+    # The same fast path for plain 'X.Y.Z' as _parse
+    if _plain_core(string) is not None:
+        return True
+
+    return _semver_regex().match(string) is not None
+
+
+@overload
+def validate_many(strings: Iterable[str], *, indices: Literal[False] = ...) -> bytearray: ...
+
+
+@overload
+def validate_many(strings: Iterable[str], *, indices: Literal[True]) -> list[int]: ...
+
+
+def validate_many(strings: Iterable[str], *, indices: bool = False) -> bytearray | list[int]:
+    """
+    Check many strings for valid semver at once, see `is_valid_string`.
+
+    Args:
+        strings (Iterable[str]): The strings to check.
+        indices (bool, optional): Return the indices of the invalid strings
+            instead of a mask. Defaults to False.
+
+    Returns:
+        bytearray | list[int]: A mask with a 1 for each valid string and a 0
+            for each invalid one, one byte per string, or with `indices=True`
+            the indices of the invalid strings in ascending order.
+
+    Examples:
+    ```python
+    >>> list(validate_many(["v1.2.4", "1.2", "0.7.6-rc.1"]))
+    [1, 0, 1]
+    >>> validate_many(["v1.2.4", "1.2", "0.7.6-rc.1"], indices=True)
+    [1]
+
+    ```
+
+    """
+    if indices:
+        return [index for index, string in enumerate(strings) if not is_valid_string(string)]
+    return bytearray(map(is_valid_string, strings))
+
+
+# The optional LRU cache in front of _parse, None when disabled (the default)
+_cached_parse: functools._lru_cache_wrapper[Version] | None = None
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics for the `Version.from_string` parse cache.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def set_cache_size(maxsize: int) -> None:
+    """
+    Set the capacity of the `Version.from_string` parse cache.
+
+    The cache is disabled by default, a `maxsize` > 0 enables it so
+    that parsing a string seen recently returns the same, shared `Version`
+    instance instead of parsing it again. The least recently used entries
+    are discarded once it holds `maxsize` versions.
+
+    Changing the size clears the cache and its statistics, and a
+    `maxsize` of 0 disables it again.
+
+    Args:
+        maxsize (int): The maximum number of parsed versions to keep.
+
+    Raises:
+        ValueError: If `maxsize` < 0.
+
+    Examples:
+    ```python
+    >>> set_cache_size(1024)
+    >>> Version.from_string("v1.2.4") is Version.from_string("v1.2.4")
+    True
+    >>> cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+    >>> set_cache_size(0)
+
+    ```
+
+    """
+    global _cached_parse
+
+    if maxsize < 0:
+        raise ValueError(f"Cache size must be >= 0, got {maxsize}")
+
+    _cached_parse = functools.lru_cache(maxsize=maxsize)(_parse) if maxsize else None
+
+
+def cache_info() -> CacheInfo:
+    """
+    Report statistics for the `Version.from_string` parse cache.
+
+    Returns:
+        CacheInfo: The cache hits, misses, maximum and current size,
+            all 0 if the cache is disabled.
+
+    Examples:
+    ```python
+    >>> cache_info()
+    CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+
+    ```
+
+    """
+    if _cached_parse is None:
+        return CacheInfo(0, 0, 0, 0)
+
+    hits, misses, maxsize, currsize = _cached_parse.cache_info()
+    return CacheInfo(hits, misses, maxsize or 0, currsize)
+
+
+def cache_clear() -> None:
+    """
+    Empty the `Version.from_string` parse cache and reset
+    its statistics, keeping its size.
+
+    Examples:
+    ```python
+    >>> set_cache_size(128)
+    >>> _ = Version.from_string("v1.2.4")
+    >>> cache_clear()
+    >>> cache_info()
+    CacheInfo(hits=0, misses=0, maxsize=128, currsize=0)
+    >>> set_cache_size(0)
+
+    ```
+
+    """
+    if _cached_parse is not None:
+        _cached_parse.cache_clear()
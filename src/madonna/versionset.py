@@ -0,0 +1,387 @@
+"""
+A set of versions backed by packed integers, for fast membership and diffs.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable, Iterable, Iterator, NamedTuple
+
+from madonna.version import Version, _restore
+
+# A plain X.Y.Z version whose parts each fit in this many bits is stored as
+# a single int rather than a Version, which is most of them in practice
+_BITS = 21
+_LIMIT = 1 << _BITS
+_MASK = _LIMIT - 1
+
+
+def _member_key(version: Version) -> Hashable:
+    """
+    The key a version is stored under: its packed core if it is plain,
+    otherwise its precedence key.
+    """
+    if version._prerelease is None and version._buildmetadata is None:
+        major, minor, patch = version._major, version._minor, version._patch
+        if major < _LIMIT and minor < _LIMIT and patch < _LIMIT:
+            return (major << (2 * _BITS)) | (minor << _BITS) | patch
+    return version._key
+
+
+def _precedence_key(version: Version) -> Hashable:
+    """
+    Like `_member_key`, but ignoring build metadata.
+    """
+    if version._prerelease is None:
+        major, minor, patch = version._major, version._minor, version._patch
+        if major < _LIMIT and minor < _LIMIT and patch < _LIMIT:
+            return (major << (2 * _BITS)) | (minor << _BITS) | patch
+    return version._key[:4]
+
+
+def _unpack(packed: int) -> Version:
+    """
+    Rebuild the plain version a packed core was made from.
+    """
+    return _restore(packed >> (2 * _BITS), (packed >> _BITS) & _MASK, packed & _MASK)
+
+
+class Diff(NamedTuple):
+    """
+    The changes between two version sets, see `VersionSet.diff`.
+    """
+
+    added: VersionSet
+    removed: VersionSet
+
+
+class VersionSet:
+    """
+    A set of versions for fast membership, set algebra and diffs.
+    """
+
+    __slots__ = ("_ignore_build", "_key_of", "_others", "_plain")
+
+    def __init__(self, versions: Iterable[Version] = (), *, ignore_build: bool = False) -> None:
+        """
+        Collect versions into a set for reconciling large collections of them.
+
+        A set of `Version` objects hashes and compares every member through
+        `Version.__hash__` and `Version.__eq__`. Here plain X.Y.Z versions,
+        usually the vast majority, are instead packed into a single int
+        each and kept in a set of ints, so membership tests and the set
+        operations between them run entirely on ints, and each costs a small
+        int rather than a whole `Version` object. Versions with a pre-release
+        or build metadata are kept in a dict keyed by their precedence key.
+
+        Args:
+            versions (Iterable[Version]): The versions to collect.
+                Defaults to an empty set.
+            ignore_build (bool, optional): Treat versions that only differ
+                in build metadata as the same version, as precedence does,
+                e.g. to deduplicate. The set then holds versions without
+                their build metadata. Defaults to False.
+
+        Examples:
+        ```python
+        >>> versions = VersionSet([Version(1, 2, 4), Version(1, 2, 4), Version(1, 2, 4, buildmetadata="b1")])
+        >>> len(versions)
+        2
+        >>> len(VersionSet(versions, ignore_build=True))
+        1
+        >>> Version(1, 2, 4) in versions
+        True
+
+        ```
+
+        """
+        self._ignore_build = ignore_build
+        self._key_of: Callable[[Version], Hashable] = _precedence_key if ignore_build else _member_key
+        self._plain: set[int] = set()
+        self._others: dict[Hashable, Version] = {}
+        self.update(versions)
+
+    @classmethod
+    def _from_parts(cls, plain: set[int], others: dict[Hashable, Version], ignore_build: bool) -> VersionSet:
+        """
+        Make a set straight from its packed and other members.
+        """
+        new = cls(ignore_build=ignore_build)
+        new._plain = plain
+        new._others = others
+        return new
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(<{len(self)} versions>)"
+
+    def __len__(self) -> int:
+        return len(self._plain) + len(self._others)
+
+    def __iter__(self) -> Iterator[Version]:
+        # Plain versions are rebuilt from their packed cores, so while equal
+        # to the versions that were added they are not the same objects
+        for packed in self._plain:
+            yield _unpack(packed)
+        yield from self._others.values()
+
+    def __contains__(self, version: object) -> bool:
+        if not isinstance(version, Version):
+            return False
+        key = self._key_of(version)
+        if isinstance(key, int):
+            return key in self._plain
+        return key in self._others
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VersionSet):
+            return NotImplemented
+        return (
+            self._ignore_build == other._ignore_build
+            and self._plain == other._plain
+            and self._others.keys() == other._others.keys()
+        )
+
+    # Mutable, so unhashable like a set
+    __hash__ = None  # type: ignore[assignment]
+
+    def __or__(self, other: object) -> VersionSet:
+        if not isinstance(other, VersionSet):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other: object) -> VersionSet:
+        if not isinstance(other, VersionSet):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other: object) -> VersionSet:
+        if not isinstance(other, VersionSet):
+            return NotImplemented
+        return self.difference(other)
+
+    def _check_compatible(self, other: VersionSet) -> None:
+        """
+        Sets that do and don't ignore build metadata have different members
+        for the same versions, so can't be combined.
+        """
+        if other._ignore_build != self._ignore_build:
+            raise ValueError("Cannot combine a VersionSet that ignores build metadata with one that doesn't")
+
+    def _coerce(self, other: Iterable[Version]) -> VersionSet:
+        """
+        Turn any iterable of versions into a set like this one.
+        """
+        if isinstance(other, VersionSet):
+            self._check_compatible(other)
+            return other
+        return VersionSet(other, ignore_build=self._ignore_build)
+
+    @property
+    def ignore_build(self) -> bool:
+        """
+        Whether versions that only differ in build metadata are the same.
+        """
+        return self._ignore_build
+
+    def add(self, version: Version) -> None:
+        """
+        Add a version to the set, does nothing if it is already there.
+
+        Args:
+            version (Version): The version to add.
+
+        """
+        key = self._key_of(version)
+        if isinstance(key, int):
+            self._plain.add(key)
+        elif key not in self._others:
+            self._others[key] = self._member(version)
+
+    def update(self, versions: Iterable[Version]) -> None:
+        """
+        Add all of `versions` to the set.
+
+        Args:
+            versions (Iterable[Version]): The versions to add.
+
+        """
+        if isinstance(versions, VersionSet) and versions._ignore_build == self._ignore_build:
+            self._plain |= versions._plain
+            for key, version in versions._others.items():
+                self._others.setdefault(key, version)
+            return
+
+        # The hot loop of building a set, with the lookups hoisted out of it
+        key_of = self._key_of
+        add_plain = self._plain.add
+        others = self._others
+        member = self._member
+        for version in versions:
+            key = key_of(version)
+            if isinstance(key, int):
+                add_plain(key)
+            elif key not in others:
+                others[key] = member(version)
+
+    def _member(self, version: Version) -> Version:
+        """
+        The version to keep for `version`, stripped of its build metadata
+        if the set ignores it.
+        """
+        if self._ignore_build and version._buildmetadata is not None:
+            return Version(version._major, version._minor, version._patch, version._prerelease)
+        return version
+
+    def remove(self, version: Version) -> None:
+        """
+        Remove a version from the set.
+
+        Args:
+            version (Version): The version to remove.
+
+        Raises:
+            KeyError: If `version` is not in the set.
+
+        """
+        key = self._key_of(version)
+        try:
+            if isinstance(key, int):
+                self._plain.remove(key)
+            else:
+                del self._others[key]
+        except KeyError:
+            raise KeyError(version) from None
+
+    def discard(self, version: Version) -> None:
+        """
+        Remove a version from the set if it is there.
+
+        Args:
+            version (Version): The version to remove.
+
+        """
+        if version in self:
+            self.remove(version)
+
+    def copy(self) -> VersionSet:
+        """
+        Return a shallow copy of the set.
+
+        Returns:
+            VersionSet: The copy.
+
+        """
+        return self._from_parts(set(self._plain), dict(self._others), self._ignore_build)
+
+    def union(self, other: Iterable[Version]) -> VersionSet:
+        """
+        Return the versions in either this set or `other`, also `a | b`.
+
+        Args:
+            other (Iterable[Version]): The other versions.
+
+        Returns:
+            VersionSet: A new set.
+
+        Raises:
+            ValueError: If `other` is a `VersionSet` with a different
+                `ignore_build`.
+
+        Examples:
+        ```python
+        >>> union = VersionSet([Version(1, 2, 4)]) | VersionSet([Version(1, 3, 0, "rc.1")])
+        >>> sorted(str(v) for v in union)
+        ['v1.2.4', 'v1.3.0-rc.1']
+
+        ```
+
+        """
+        other = self._coerce(other)
+        others = dict(self._others)
+        for key, version in other._others.items():
+            others.setdefault(key, version)
+        return self._from_parts(self._plain | other._plain, others, self._ignore_build)
+
+    def intersection(self, other: Iterable[Version]) -> VersionSet:
+        """
+        Return the versions in both this set and `other`, also `a & b`.
+
+        Args:
+            other (Iterable[Version]): The other versions.
+
+        Returns:
+            VersionSet: A new set.
+
+        Raises:
+            ValueError: If `other` is a `VersionSet` with a different
+                `ignore_build`.
+
+        Examples:
+        ```python
+        >>> both = VersionSet([Version(1, 2, 4), Version(1, 2, 5)]) & VersionSet([Version(1, 2, 5)])
+        >>> [str(v) for v in both]
+        ['v1.2.5']
+
+        ```
+
+        """
+        other = self._coerce(other)
+        mine = self._others
+        others = {key: mine[key] for key in mine.keys() & other._others.keys()}
+        return self._from_parts(self._plain & other._plain, others, self._ignore_build)
+
+    def difference(self, other: Iterable[Version]) -> VersionSet:
+        """
+        Return the versions in this set but not in `other`, also `a - b`.
+
+        Args:
+            other (Iterable[Version]): The other versions.
+
+        Returns:
+            VersionSet: A new set.
+
+        Raises:
+            ValueError: If `other` is a `VersionSet` with a different
+                `ignore_build`.
+
+        Examples:
+        ```python
+        >>> only = VersionSet([Version(1, 2, 4), Version(1, 2, 5)]) - VersionSet([Version(1, 2, 5)])
+        >>> [str(v) for v in only]
+        ['v1.2.4']
+
+        ```
+
+        """
+        other = self._coerce(other)
+        mine = self._others
+        others = {key: mine[key] for key in mine.keys() - other._others.keys()}
+        return self._from_parts(self._plain - other._plain, others, self._ignore_build)
+
+    def diff(self, other: Iterable[Version]) -> Diff:
+        """
+        Compare this set, the older snapshot, against a newer one.
+
+        Args:
+            other (Iterable[Version]): The newer versions.
+
+        Returns:
+            Diff: The versions `added` in `other` and those `removed`
+                from this set.
+
+        Raises:
+            ValueError: If `other` is a `VersionSet` with a different
+                `ignore_build`.
+
+        Examples:
+        ```python
+        >>> before = VersionSet([Version(1, 2, 4), Version(1, 2, 5)])
+        >>> after = VersionSet([Version(1, 2, 5), Version(1, 3, 0, "rc.1")])
+        >>> diff = before.diff(after)
+        >>> [str(v) for v in diff.added], [str(v) for v in diff.removed]
+        (['v1.3.0-rc.1'], ['v1.2.4'])
+
+        ```
+
+        """
+        other = self._coerce(other)
+        return Diff(added=other.difference(self), removed=self.difference(other))
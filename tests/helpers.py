@@ -0,0 +1,50 @@
+"""
+Helpers shared by the tests.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Sequence, TypeVar
+
+from madonna import Version
+
+T = TypeVar("T")
+
+
+def _pick(rng: random.Random, choices: Sequence[T]) -> T:
+    # random.choice can't take the len() of a range past sys.maxsize,
+    # which some of the ranges of parts are, randrange draws the same
+    # numbers without it
+    if isinstance(choices, range):
+        return rng.randrange(choices.start, choices.stop)  # type: ignore[return-value]
+    return rng.choice(choices)
+
+
+def random_versions(
+    n: int,
+    *,
+    seed: int = 42,
+    majors: Sequence[int] = range(4),
+    minors: Sequence[int] = range(4),
+    patches: Sequence[int] = range(4),
+    prereleases: Sequence[str | None] = (None, None, "rc.1", "rc.2", "alpha"),
+    builds: Sequence[str | None] = (None, None, None, "build.1"),
+) -> list[Version]:
+    """
+    Generate `n` seeded random versions, each part drawn from its choices.
+
+    The defaults give lots of duplicates and versions that only differ in
+    their pre-release or build metadata, the cases most worth testing.
+    """
+    rng = random.Random(seed)
+    return [
+        Version(
+            _pick(rng, majors),
+            _pick(rng, minors),
+            _pick(rng, patches),
+            _pick(rng, prereleases),
+            _pick(rng, builds),
+        )
+        for _ in range(n)
+    ]
@@ -0,0 +1,69 @@
+"""
+Tests for the bulk binary encoding.
+"""
+
+from __future__ import annotations
+
+import functools
+import mmap
+from pathlib import Path
+
+import pytest
+
+from madonna import Version, iter_unpack, pack_many, unpack_many
+from tests import helpers
+
+random_versions = functools.partial(
+    helpers.random_versions,
+    majors=range(2**64),
+    minors=range(31),
+    patches=range(31),
+    prereleases=(None, None, "rc.1", "alpha.beta.10", ""),
+    builds=(None, None, None, "build.1", "sha.5114f85"),
+)
+
+
+def test_round_trip() -> None:
+    versions = random_versions(1000)
+    data = pack_many(versions)
+
+    assert unpack_many(data) == versions
+    assert [v.to_tuple() for v in unpack_many(data)] == [v.to_tuple() for v in versions]
+    assert list(iter_unpack(memoryview(data))) == versions
+    assert unpack_many(bytearray(data)) == versions
+
+
+def test_empty() -> None:
+    assert unpack_many(pack_many([])) == []
+
+
+def test_accepts_iterables() -> None:
+    assert unpack_many(pack_many(Version(1, minor, 0) for minor in range(3))) == [
+        Version(1, 0, 0),
+        Version(1, 1, 0),
+        Version(1, 2, 0),
+    ]
+
+
+def test_mmap(tmp_path: Path) -> None:
+    versions = random_versions(100)
+    path = tmp_path / "versions.bin"
+    path.write_bytes(pack_many(versions))
+
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert unpack_many(mapped) == versions
+
+
+@pytest.mark.parametrize(
+    ("data", "match"),
+    [
+        (b"", "Truncated header"),
+        (b"JSON" + bytes(8), "Bad magic"),
+        (pack_many([Version(1, 2, 4)])[:-1], "Truncated Version"),
+        (pack_many([Version(1, 2, 4, "rc.1")])[:-2], "Truncated Version"),
+        (pack_many([Version(1, 2, 4)]) + b"\x00", "trailing bytes"),
+    ],
+)
+def test_invalid(data: bytes, match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        unpack_many(data)
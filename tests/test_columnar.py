@@ -0,0 +1,175 @@
+"""
+Tests for the VersionArray class.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import operator
+import sys
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from madonna import Version, VersionArray
+from tests import helpers
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@pytest.fixture(
+    params=[
+        "array",
+        pytest.param("numpy", marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")),
+    ]
+)
+def backend(request: pytest.FixtureRequest) -> str:
+    return str(request.param)
+
+
+random_versions = functools.partial(
+    helpers.random_versions,
+    prereleases=(None, None, "rc.1", "rc.2", "rc.10", "alpha", "alpha.1"),
+    builds=(None, None, None, "build.1", "build.2"),
+)
+
+
+def to_list(mask: Iterable[object]) -> list[bool]:
+    return [bool(item) for item in mask]
+
+
+def test_init_and_getitem(backend: str) -> None:
+    versions = [Version(1, 2, 4), Version(1, 2, 4, "rc.1", "build.123"), Version(0, 7, 6, None, "build.1")]
+    arr = VersionArray(versions, backend=backend)
+
+    assert arr.backend == backend
+    assert len(arr) == 3
+    assert list(arr) == versions
+    assert arr[1] == Version(1, 2, 4, "rc.1", "build.123")
+    assert arr[-1] == Version(0, 7, 6, None, "build.1")
+
+
+@pytest.mark.parametrize("index", [3, -4])
+def test_getitem_out_of_range(backend: str, index: int) -> None:
+    arr = VersionArray([Version(1, 2, 4), Version(1, 2, 5), Version(1, 2, 6)], backend=backend)
+
+    with pytest.raises(IndexError):
+        arr[index]
+
+
+@pytest.mark.parametrize("index", [slice(1, None), slice(None, None, -1), slice(0, 4, 2), slice(5, 6)])
+def test_getitem_slice(backend: str, index: slice) -> None:
+    versions = random_versions(5)
+    arr = VersionArray(versions, backend=backend)
+
+    sliced = arr[index]
+    assert isinstance(sliced, VersionArray)
+    assert list(sliced) == versions[index]
+    assert sorted(sliced.argsort()) == list(range(len(versions[index])))
+
+
+def test_from_strings(backend: str) -> None:
+    arr = VersionArray.from_strings(["v1.2.4", "1.0.0-rc.1+build.1"], backend=backend)
+    assert list(arr) == [Version(1, 2, 4), Version(1, 0, 0, "rc.1", "build.1")]
+
+
+def test_empty(backend: str) -> None:
+    arr = VersionArray(backend=backend)
+    assert len(arr) == 0
+    assert list(arr) == []
+    assert list(arr.argsort()) == []
+
+
+def test_repr() -> None:
+    arr = VersionArray([Version(1, 2, 4), Version(1, 2, 5)])
+    assert repr(arr) == "VersionArray(<2 versions>, backend='array')"
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown backend"):
+        VersionArray(backend="pandas")
+
+
+def test_numpy_backend_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    with pytest.raises(ImportError, match="requires numpy"):
+        VersionArray([Version(1, 2, 4)], backend="numpy")
+
+
+def test_overflow() -> None:
+    with pytest.raises(OverflowError):
+        VersionArray([Version(2**64, 0, 0)])
+
+
+def test_unhashable() -> None:
+    with pytest.raises(TypeError):
+        hash(VersionArray())
+
+
+def test_argsort(backend: str) -> None:
+    versions = random_versions(500)
+    arr = VersionArray(versions, backend=backend)
+
+    order = [int(index) for index in arr.argsort()]
+    assert [versions[index] for index in order] == sorted(versions, key=Version.sort_key)
+
+
+def test_argsort_no_prerelease(backend: str) -> None:
+    versions = [Version(1, 2, 4), Version(0, 7, 6), Version(1, 0, 0), Version(0, 7, 5)]
+    arr = VersionArray(versions, backend=backend)
+    assert [int(index) for index in arr.argsort()] == [3, 1, 2, 0]
+
+
+@pytest.mark.parametrize(
+    "op",
+    [operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge],
+)
+@pytest.mark.parametrize(
+    "other",
+    [
+        Version(1, 1, 1),
+        Version(1, 1, 1, "rc.1"),
+        Version(1, 1, 1, "rc.3"),
+        Version(1, 1, 1, "beta"),
+        Version(1, 1, 1, "rc.1", "build.1"),
+        Version(1, 1, 1, None, "build.0"),
+        Version(0, 0, 0),
+        Version(9, 9, 9),
+    ],
+)
+def test_elementwise_compare(backend: str, op: Callable[[Any, Any], Any], other: Version) -> None:
+    versions = random_versions(300)
+    arr = VersionArray(versions, backend=backend)
+
+    assert to_list(op(arr, other)) == [op(version, other) for version in versions]
+
+
+def test_elementwise_compare_no_prerelease(backend: str) -> None:
+    versions = [Version(1, 2, 4), Version(0, 7, 6), Version(1, 0, 0)]
+    arr = VersionArray(versions, backend=backend)
+
+    assert to_list(arr < Version(1, 0, 0, "rc.1")) == [False, True, False]
+    assert to_list(arr == Version(1, 0, 0)) == [False, False, True]
+
+
+def test_elementwise_compare_raises_on_non_version(backend: str) -> None:
+    arr = VersionArray([Version(1, 2, 4)], backend=backend)
+
+    with pytest.raises(TypeError):
+        arr < "a string"  # noqa: B015
+
+
+def test_max_min(backend: str) -> None:
+    versions = random_versions(500)
+    arr = VersionArray(versions, backend=backend)
+
+    assert arr.max() == max(versions, key=Version.sort_key)
+    assert arr.min() == min(versions, key=Version.sort_key)
+
+
+@pytest.mark.parametrize("method", ["max", "min"])
+def test_max_min_empty(backend: str, method: str) -> None:
+    with pytest.raises(ValueError, match="empty VersionArray"):
+        getattr(VersionArray(backend=backend), method)()
@@ -0,0 +1,134 @@
+"""
+Tests for scanning text for versions.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+from pathlib import Path
+
+import pytest
+
+from madonna import Version, scan
+from madonna.extract import _TOKEN
+
+
+def found(text: str, **kwargs: int) -> list[tuple[int, str]]:
+    return [(offset, str(version)) for offset, version in scan([text], **kwargs)]
+
+
+@pytest.mark.parametrize(
+    ("text", "want"),
+    [
+        ("", []),
+        ("no versions here", []),
+        ("1.2.4", [(0, "v1.2.4")]),
+        ("v1.2.4", [(0, "v1.2.4")]),
+        ("released 1.2.4.", [(9, "v1.2.4")]),
+        ("(1.3.0-rc.1)", [(1, "v1.3.0-rc.1")]),
+        ("foo-1.2.4.tar.gz", [(4, "v1.2.4")]),
+        ("foo_1.2.4", [(4, "v1.2.4")]),
+        ("1.0.0-alpha.beta+exp.sha.5114f85,", [(0, "v1.0.0-alpha.beta+exp.sha.5114f85")]),
+        ("1.2.4 and 2.0.0", [(0, "v1.2.4"), (10, "v2.0.0")]),
+        ("1.2.4+", [(0, "v1.2.4")]),
+        # Part of a longer word or dotted number
+        ("x1.2.4", []),
+        ("vv1.2.4", []),
+        ("1.2.4.5", []),
+        ("0.1.2.4", []),
+        ("1.2.4a", []),
+        ("1.2", []),
+        # Invalid versions aren't found in part
+        ("01.2.4", []),
+        ("1.02.4", []),
+        ("1.2.4-rc.01", []),
+        ("1.2.4-", []),
+        # Unicode digits are not ASCII
+        ("1.2.٣", []),
+    ],
+)
+def test_scan(text: str, want: list[tuple[int, str]]) -> None:
+    assert found(text) == want
+
+
+def random_text(rng: random.Random) -> str:
+    pieces = [
+        "1.2.3",
+        "v1.2.4",
+        "0.0.0-rc.1",
+        "10.20.30+build.5",
+        "1.2.3.4",
+        "x1.2.3",
+        "1.2.3-rc.01",
+        "pkg-1.0.0.tar.gz",
+        "1.0.0-alpha.beta+exp.sha.5114f85",
+        "01.2.3",
+        "1.2",
+        " ",
+        "\n",
+        "-",
+        "+",
+        ".",
+        "a",
+        "v",
+        "0",
+        "1",
+    ]
+    return "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+
+
+def test_chunk_boundaries() -> None:
+    # However the text is split up, the versions found are the same as
+    # searching all of it at once
+    rng = random.Random(42)
+    for _ in range(2000):
+        text = random_text(rng)
+        want = [(match.start(), Version.from_string(match.group()).to_tuple()) for match in _TOKEN.finditer(text)]
+        chunk_size = rng.randint(1, 16)
+        pieces = [text[i : i + 3] for i in range(0, len(text), 3)]
+
+        for source in (io.StringIO(text), pieces):
+            got = [
+                (offset, version.to_tuple()) for offset, version in scan(source, chunk_size=chunk_size, max_length=2000)
+            ]
+            assert got == want, (text, chunk_size)
+
+
+def test_file(tmp_path: Path) -> None:
+    path = tmp_path / "build.log"
+    lines = [f"step {i}: installed pkg-{i}.{i % 7}.0-rc.{i}\n" for i in range(5000)]
+    path.write_text("".join(lines))
+
+    with path.open() as fp:
+        results = list(scan(fp, chunk_size=100))
+
+    assert [version for _, version in results] == [Version(i, i % 7, 0, f"rc.{i}") for i in range(5000)]
+    text = path.read_text()
+    assert all(text.startswith(str(version)[1:], offset) for offset, version in results)
+
+
+def test_lines_are_joined() -> None:
+    lines = ["before 1.", "2.4 after\n", "and v", "2.0.0\n"]
+    for chunk_size in (1, 10, 1000):
+        assert [(offset, str(v)) for offset, v in scan(lines, chunk_size=chunk_size)] == [(7, "v1.2.4"), (23, "v2.0.0")]
+
+
+def test_max_length() -> None:
+    long = "1.2.4-" + "a" * 100
+    # Fits within a chunk
+    assert found(f"x {long} y", chunk_size=1000, max_length=10) == [(2, "v" + long)]
+    # Longer than max_length and straddling chunks, not found whole
+    results = scan(io.StringIO(f"x {long} y"), chunk_size=8, max_length=10)
+    assert (2, "v" + long) not in [(offset, str(version)) for offset, version in results]
+
+
+def test_binary_file() -> None:
+    with pytest.raises(TypeError, match="text mode"):
+        list(scan(io.BytesIO(b"1.2.4")))  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(("chunk_size", "max_length"), [(0, 10), (10, 0)])
+def test_invalid_arguments(chunk_size: int, max_length: int) -> None:
+    with pytest.raises(ValueError):
+        list(scan(["1.2.4"], chunk_size=chunk_size, max_length=max_length))
@@ -0,0 +1,147 @@
+"""
+Tests for reading semver tags from a git repository.
+"""
+
+from __future__ import annotations
+
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from madonna import Version
+from madonna.git import Tag, iter_tags, latest_tag, latest_tags
+
+SHA = "a" * 40
+PEELED = "b" * 40
+
+
+def make_repo(path: Path, packed: list[str], loose: dict[str, str]) -> Path:
+    git_dir = path / ".git"
+    (git_dir / "refs" / "tags").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+
+    lines = ["# pack-refs with: peeled fully-peeled sorted"]
+    for index, name in enumerate(packed):
+        lines.append(f"{index:040x} refs/tags/{name}")
+        lines.append(f"^{PEELED}")
+    lines.append(f"{SHA} refs/heads/main")
+    (git_dir / "packed-refs").write_text("\n".join(lines) + "\n")
+
+    for name, content in loose.items():
+        ref = git_dir / "refs" / "tags" / name
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        ref.write_text(content)
+    return path
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    return make_repo(
+        tmp_path,
+        packed=["v1.2.4", "1.3.0-rc.1", "not-a-version", "v0.7.6", "v1.2", "pkg/2.0.0"],
+        loose={"v1.3.0": f"{SHA}\n", "v1.2.4": f"{'c' * 40}\n", "nested/v9.0.0": f"{SHA}\n", "v5.0.0.lock": SHA},
+    )
+
+
+def test_iter_tags(repo: Path) -> None:
+    tags = sorted(iter_tags(repo), key=lambda tag: tag.version)
+    assert tags == [
+        Tag("v0.7.6", Version(0, 7, 6), f"{3:040x}"),
+        # The loose ref wins over the packed one
+        Tag("v1.2.4", Version(1, 2, 4), "c" * 40),
+        Tag("1.3.0-rc.1", Version(1, 3, 0, "rc.1"), f"{1:040x}"),
+        Tag("v1.3.0", Version(1, 3, 0), SHA),
+    ]
+
+
+def test_iter_tags_prefix(repo: Path) -> None:
+    assert list(iter_tags(repo, prefix="pkg/")) == [Tag("pkg/2.0.0", Version(2, 0, 0), f"{5:040x}")]
+    assert list(iter_tags(repo, prefix="nested/")) == [Tag("nested/v9.0.0", Version(9, 0, 0), SHA)]
+
+
+def test_latest_tag(repo: Path) -> None:
+    assert latest_tag(repo) == Tag("v1.3.0", Version(1, 3, 0), SHA)
+    assert latest_tag(repo, prefix="pkg/") == Tag("pkg/2.0.0", Version(2, 0, 0), f"{5:040x}")
+    assert latest_tag(repo, prefix="nope/") is None
+
+
+def test_latest_tags(repo: Path) -> None:
+    assert [tag.name for tag in latest_tags(repo, 3)] == ["v1.3.0", "1.3.0-rc.1", "v1.2.4"]
+    assert [tag.name for tag in latest_tags(repo, 3, include_prerelease=False)] == ["v1.3.0", "v1.2.4", "v0.7.6"]
+    assert [tag.name for tag in latest_tags(repo, 10)] == ["v1.3.0", "1.3.0-rc.1", "v1.2.4", "v0.7.6"]
+    assert latest_tags(repo, 0) == []
+    with pytest.raises(ValueError):
+        latest_tags(repo, -1)
+
+
+def test_latest_tags_skips_refs_that_are_not_tags(tmp_path: Path) -> None:
+    repo = make_repo(tmp_path, packed=["v1.0.0"], loose={"v3.0.0": "ref: refs/tags/v1.0.0\n", "v2.0.0": SHA})
+    assert [tag.name for tag in latest_tags(repo, 2)] == ["v2.0.0", "v1.0.0"]
+    assert latest_tag(repo) == Tag("v2.0.0", Version(2, 0, 0), SHA)
+
+
+def test_latest_tags_many(tmp_path: Path) -> None:
+    rng = random.Random(42)
+    names = list({f"v{rng.randint(0, 20)}.{rng.randint(0, 20)}.{rng.randint(0, 20)}" for _ in range(2000)})
+    repo = make_repo(tmp_path, packed=names, loose={})
+
+    want = sorted(names, key=Version.from_string, reverse=True)[:10]
+    assert [tag.name for tag in latest_tags(repo, 10)] == want
+
+
+def test_no_tags(tmp_path: Path) -> None:
+    (tmp_path / ".git" / "refs").mkdir(parents=True)
+    assert list(iter_tags(tmp_path)) == []
+    assert latest_tag(tmp_path) is None
+
+
+def test_bare_and_worktree(repo: Path, tmp_path: Path) -> None:
+    bare = repo / ".git"
+    assert latest_tag(bare) == latest_tag(repo)
+
+    # A linked worktree's .git file points at its own git dir, whose
+    # commondir points back at the main one
+    worktree_git_dir = bare / "worktrees" / "other"
+    worktree_git_dir.mkdir(parents=True)
+    (worktree_git_dir / "commondir").write_text("../..\n")
+    worktree = tmp_path / "other"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {worktree_git_dir}\n")
+    assert latest_tag(worktree) == latest_tag(repo)
+
+
+def test_not_a_repository(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="not a git repository"):
+        latest_tag(tmp_path)
+    (tmp_path / ".git").write_text("nonsense")
+    with pytest.raises(ValueError, match="not a git repository"):
+        latest_tag(tmp_path)
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_real_repository(tmp_path: Path) -> None:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "initial")
+    for name in ("v1.2.4", "v1.10.0", "v1.10.0-rc.1", "release"):
+        git("tag", name)
+    git("tag", "-a", "v2.0.0-beta", "-m", "annotated")
+    git("pack-refs", "--all")
+    git("tag", "v1.11.0")
+
+    assert [tag.name for tag in latest_tags(tmp_path, 3)] == ["v2.0.0-beta", "v1.11.0", "v1.10.0"]
+    assert {tag.name: tag.sha for tag in iter_tags(tmp_path)} == {
+        name: git("rev-parse", f"refs/tags/{name}").strip()
+        for name in ("v1.2.4", "v1.10.0", "v1.10.0-rc.1", "v2.0.0-beta", "v1.11.0")
+    }
@@ -0,0 +1,88 @@
+"""
+Tests for the VersionIndex class.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from madonna import Range, Version, VersionIndex
+from tests.helpers import random_versions
+
+
+@pytest.fixture
+def versions() -> list[Version]:
+    return random_versions(300)
+
+
+def test_init_sorted_and_deduplicated(versions: list[Version]) -> None:
+    index = VersionIndex(versions)
+    assert list(index) == sorted(set(versions), key=Version.sort_key)
+    assert list(reversed(index)) == list(index)[::-1]
+    assert len(index) == len(set(versions))
+
+
+def test_repr() -> None:
+    assert repr(VersionIndex([Version(1, 2, 4)])) == "VersionIndex(<1 versions>)"
+
+
+def test_contains(versions: list[Version]) -> None:
+    index = VersionIndex(versions)
+    assert all(version in index for version in versions)
+    assert Version(9, 9, 9) not in index
+    assert "1.2.3" not in index
+
+
+def test_add_remove() -> None:
+    index = VersionIndex()
+    for version in reversed(random_versions(100)):
+        index.add(version)
+    assert list(index) == sorted(set(random_versions(100)), key=Version.sort_key)
+
+    index.add(Version(9, 9, 9))
+    index.add(Version(9, 9, 9))
+    assert index.max_satisfying(Range("*")) == Version(9, 9, 9)
+    assert len(index) == len(set(random_versions(100))) + 1
+
+    index.remove(Version(9, 9, 9))
+    assert Version(9, 9, 9) not in index
+    with pytest.raises(KeyError):
+        index.remove(Version(9, 9, 9))
+    index.discard(Version(9, 9, 9))
+
+
+@pytest.mark.parametrize(
+    "spec",
+    ["*", "^1.2", "~0.1.2", "<1.0.0 || >=3.1.0", ">=2.0.0-rc.1 <2.0.0", "1.x || 3.3.3", "<0.0.0", ">5.0.0", "!=2.2.2"],
+)
+def test_max_min_satisfying(versions: list[Version], spec: str) -> None:
+    index = VersionIndex(versions)
+    constraint = Range(spec)
+    expected = sorted(set(constraint.filter(versions)), key=Version.sort_key)
+
+    assert index.max_satisfying(constraint) == (expected[-1] if expected else None)
+    assert index.min_satisfying(constraint) == (expected[0] if expected else None)
+
+
+def test_max_min_satisfying_empty() -> None:
+    assert VersionIndex().max_satisfying(Range("*")) is None
+    assert VersionIndex().min_satisfying(Range("*")) is None
+
+
+def test_between(versions: list[Version]) -> None:
+    index = VersionIndex(versions)
+    low, high = Version(1, 0, 0, "rc.1"), Version(2, 1, 3)
+    assert index.between(low, high) == [v for v in index if low <= v <= high]
+    assert index.between(high, low) == []
+
+
+def test_next_after_prev_before(versions: list[Version]) -> None:
+    index = VersionIndex(versions)
+    ordered = list(index)
+    for position, version in enumerate(ordered):
+        assert index.next_after(version) == (ordered[position + 1] if position + 1 < len(ordered) else None)
+        assert index.prev_before(version) == (ordered[position - 1] if position > 0 else None)
+
+    assert index.next_after(Version(0, 0, 0, "0")) == ordered[0]
+    assert index.prev_before(Version(0, 0, 0, "0")) is None
+    assert index.prev_before(Version(99, 0, 0)) == ordered[-1]
@@ -0,0 +1,100 @@
+"""
+Tests for the package's lazy imports.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import madonna
+
+
+def run(code: str) -> str:
+    # A fresh interpreter, as this one has imported everything already
+    src = str(Path(madonna.__file__).parent.parent)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")]))}
+    return subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+
+
+def test_import_is_lazy() -> None:
+    code = """
+import sys
+import madonna
+from madonna.version import _semver_regex
+
+v = madonna.Version(1, 2, 4).bump_minor()
+madonna.Version.from_string("v1.2.4")
+assert v.is_valid()
+print(sorted(name for name in sys.modules if name.startswith("madonna")))
+print("json" in sys.modules, "concurrent.futures" in sys.modules, _semver_regex.cache_info().currsize)
+"""
+    assert run(code).splitlines() == ["['madonna', 'madonna.version']", "False False 0"]
+
+
+def test_regex_and_json_on_first_use() -> None:
+    code = """
+import sys
+import madonna
+from madonna.version import _semver_regex
+
+madonna.Version.from_string("v1.2.4-rc.1")
+print(_semver_regex.cache_info().currsize, "json" in sys.modules)
+madonna.Version(1, 2, 4).to_json()
+print("json" in sys.modules)
+"""
+    assert run(code).splitlines() == ["1 False", "True"]
+
+
+@pytest.mark.parametrize(
+    ("name", "module"),
+    [
+        ("ParseResult", "madonna.parallel"),
+        ("Range", "madonna.range"),
+        ("VersionArray", "madonna.columnar"),
+        ("VersionIndex", "madonna.index"),
+        ("VersionSet", "madonna.versionset"),
+        ("VersionStore", "madonna.store"),
+        ("dump_many", "madonna.jsonstream"),
+        ("iter_load", "madonna.jsonstream"),
+        ("iter_unpack", "madonna.binary"),
+        ("latest_by", "madonna.selection"),
+        ("nlargest", "madonna.selection"),
+        ("nsmallest", "madonna.selection"),
+        ("pack_many", "madonna.binary"),
+        ("parse_many", "madonna.parallel"),
+        ("scan", "madonna.extract"),
+        ("sort_versions", "madonna.sort"),
+        ("unpack_many", "madonna.binary"),
+        ("write_store", "madonna.store"),
+    ],
+)
+def test_lazy_attribute(name: str, module: str) -> None:
+    assert getattr(madonna, name) is getattr(importlib.import_module(module), name)
+    assert name in dir(madonna)
+
+
+def test_all_is_importable() -> None:
+    assert all(hasattr(madonna, name) for name in madonna.__all__)
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match="has no attribute 'nope'"):
+        madonna.nope  # noqa: B018
+
+
+@pytest.mark.parametrize("name", ["git", "instrument"])
+def test_lazy_submodule(name: str) -> None:
+    code = f"""
+import sys
+import madonna
+
+print("madonna.{name}" in sys.modules, madonna.{name} is sys.modules["madonna.{name}"])
+"""
+    assert run(code).split() == ["False", "True"]
+    assert name in dir(madonna)
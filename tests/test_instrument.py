@@ -0,0 +1,132 @@
+"""
+Tests for the opt-in instrumentation.
+"""
+
+from __future__ import annotations
+
+import pickle
+from typing import Iterator
+
+import pytest
+
+from madonna import LazyVersion, Version, compare, instrument
+
+
+@pytest.fixture(autouse=True)
+def clean() -> Iterator[None]:
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def calls() -> dict[str, int]:
+    return {name: op.calls for name, op in instrument.stats().items() if op.calls}
+
+
+def test_disabled_by_default() -> None:
+    assert not instrument.is_enabled()
+    sorted([Version(1, 2, 4), Version(0, 7, 6)])
+    assert calls() == {}
+
+
+def test_counts() -> None:
+    instrument.enable()
+    v = Version.from_string("v1.2.4-rc.1")
+    w = Version.from_tuple((1, 2, 4, None, None))
+    assert v < w
+    assert v != w
+    assert compare(v, w) == -1
+    assert len({v, w}) == 2
+    assert Version.from_json(v.to_json()) == v
+    pickle.loads(pickle.dumps(w))
+
+    assert calls() == {
+        "from_string": 1,
+        "from_tuple": 1,
+        "__lt__": 1,
+        "__ne__": 1,
+        "compare": 1,
+        "__hash__": 2,
+        # Hashing goes through to_tuple
+        "to_tuple": 2,
+        "to_json": 1,
+        "to_dict": 1,
+        "from_json": 1,
+        "__eq__": 1,
+        "__reduce__": 1,
+    }
+
+
+def test_timings() -> None:
+    instrument.enable()
+    for patch in range(10):
+        Version.from_string(f"1.2.{patch}-rc.1")
+
+    op = instrument.stats()["from_string"]
+    assert op.calls == 10
+    assert 0 < op.max_ns <= op.total_ns
+    assert op.mean_ns == op.total_ns / 10
+    assert instrument.stats()["to_bytes"].mean_ns == 0
+
+
+def test_disable_restores_originals() -> None:
+    originals = {name: Version.__dict__[name] for name in instrument._OPERATIONS}
+    instrument.enable()
+    instrument.enable()
+    assert instrument.is_enabled()
+    assert Version.__dict__["__lt__"] is not originals["__lt__"]
+
+    instrument.disable()
+    assert not instrument.is_enabled()
+    assert {name: Version.__dict__[name] for name in instrument._OPERATIONS} == originals
+
+    # Stats are kept until reset
+    assert Version(1, 2, 4) < Version(1, 2, 5)
+    assert instrument.stats()["__lt__"].calls == 0
+
+
+def test_callback() -> None:
+    seen: list[tuple[str, int]] = []
+    instrument.enable(lambda name, elapsed: seen.append((name, elapsed)))
+    str(Version(1, 2, 4))
+    Version(1, 2, 4).to_string()
+
+    assert [name for name, _ in seen] == ["__str__", "__str__", "to_string"]
+    assert all(elapsed >= 0 for _, elapsed in seen)
+
+    # Enabling again swaps the callback
+    instrument.enable()
+    str(Version(1, 2, 4))
+    assert len(seen) == 3
+
+
+def test_exceptions_are_counted() -> None:
+    instrument.enable()
+    with pytest.raises(ValueError):
+        Version.from_string("nope")
+    with pytest.raises(TypeError):
+        Version(1, 2, 4) < "1.2.5"  # noqa: B015
+
+    assert calls() == {"from_string": 1, "__lt__": 1}
+
+
+def test_classmethods_and_subclasses() -> None:
+    with instrument.instrumented():
+        v = LazyVersion.from_string("1.2.4", lazy=True)
+        assert isinstance(v, LazyVersion)
+        assert LazyVersion("1.2.4") == Version(1, 2, 4)
+        assert (
+            type(Version.from_dict({"major": 1, "minor": 2, "patch": 4, "prerelease": None, "buildmetadata": None}))
+            is Version
+        )
+
+    assert not instrument.is_enabled()
+    assert calls() == {"from_string": 1, "__eq__": 1, "from_dict": 1}
+
+
+def test_reset() -> None:
+    instrument.enable()
+    hash(Version(1, 2, 4))
+    instrument.reset()
+    assert calls() == {}
+    assert instrument.stats()["__hash__"] == instrument.OpStats(0, 0, 0)
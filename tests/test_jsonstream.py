@@ -0,0 +1,132 @@
+"""
+Tests for the streaming JSON encoder and decoder.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import json
+
+import pytest
+
+from madonna import Version, dump_many, iter_load, jsonstream
+from tests import helpers
+
+random_versions = functools.partial(
+    helpers.random_versions,
+    majors=range(2**64 + 1),
+    minors=range(31),
+    patches=range(31),
+    prereleases=(None, None, "rc.1", "alpha.beta.10", "", 'quo"te', "ünïcode"),
+    builds=(None, None, None, "build.1", "sha.5114f85"),
+)
+
+
+@pytest.fixture(params=["ndjson", "array"])
+def format_(request: pytest.FixtureRequest) -> str:
+    return str(request.param)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Force records to be split across reads and batches
+    monkeypatch.setattr(jsonstream, "_BATCH", 3)
+    monkeypatch.setattr(jsonstream, "_CHUNK", 7)
+
+
+@pytest.mark.parametrize("positional", [True, False])
+def test_round_trip(format_: str, positional: bool) -> None:
+    versions = random_versions(3000)
+    fp = io.StringIO()
+
+    assert dump_many(iter(versions), fp, format=format_, positional=positional) == len(versions)
+    fp.seek(0)
+    loaded = list(iter_load(fp, format=format_))
+    assert loaded == versions
+    assert [v.to_tuple() for v in loaded] == [v.to_tuple() for v in versions]
+
+
+def test_round_trip_small_chunks(format_: str, small_chunks: None) -> None:
+    versions = random_versions(50)
+    fp = io.StringIO()
+    dump_many(versions, fp, format=format_)
+    fp.seek(0)
+    assert list(iter_load(fp, format=format_)) == versions
+
+
+def test_empty(format_: str) -> None:
+    fp = io.StringIO()
+    assert dump_many([], fp, format=format_) == 0
+    fp.seek(0)
+    assert list(iter_load(fp, format=format_)) == []
+
+
+def test_output_is_valid_json() -> None:
+    versions = random_versions(10)
+    array = io.StringIO()
+    ndjson = io.StringIO()
+    dump_many(versions, array, format="array")
+    dump_many(versions, ndjson, format="ndjson")
+
+    assert json.loads(array.getvalue()) == [list(v.to_tuple()) for v in versions]
+    assert [json.loads(line) for line in ndjson.getvalue().splitlines()] == [list(v.to_tuple()) for v in versions]
+
+
+def test_dict_records() -> None:
+    fp = io.StringIO()
+    dump_many([Version(1, 2, 4, "rc.1")], fp, positional=False)
+    assert fp.getvalue() == Version(1, 2, 4, "rc.1").to_json() + "\n"
+
+
+def test_ndjson_blank_lines() -> None:
+    fp = io.StringIO('\n[1,2,4,null,null]\n\n   \n{"major": 1, "minor": 3, "patch": 0}\n')
+    assert list(iter_load(fp)) == [Version(1, 2, 4), Version(1, 3, 0)]
+
+
+def test_array_whitespace(small_chunks: None) -> None:
+    fp = io.StringIO('  [ [1,2,4,null,null] ,\n\n\t[1, 3, 0, "rc.1", null]  ]  ')
+    assert list(iter_load(fp, format="array")) == [Version(1, 2, 4), Version(1, 3, 0, "rc.1")]
+
+
+@pytest.mark.parametrize(
+    ("content", "format_"),
+    [
+        ("[1,2,4,null,null], [1,2,5,null,null]\n", "ndjson"),
+        ("[1,2,4,null,null\n", "ndjson"),
+        ("1\n", "ndjson"),
+        ("", "array"),
+        ("{}", "array"),
+        ("[[1,2,4,null,null]", "array"),
+        ("[[1,2,4,null,null],", "array"),
+        ("[[1,2,4,null,null],]", "array"),
+        ("[[1,2,4,null,null] [1,2,5,null,null]]", "array"),
+        ("[[1,2,4,null", "array"),
+        ('["1.2.4"]', "array"),
+    ],
+)
+def test_invalid(content: str, format_: str) -> None:
+    with pytest.raises(ValueError):
+        list(iter_load(io.StringIO(content), format=format_))
+
+
+@pytest.mark.parametrize("index", [0, 10, 5000])
+def test_array_malformed_record_fails_fast(index: int) -> None:
+    fp = io.StringIO()
+    dump_many(random_versions(20_000), fp, format="array")
+    records = fp.getvalue().split(",\n")
+    records[index + 1] = "[1,2,@,null,null]"
+    content = ",\n".join(records)
+    fp = io.StringIO(content)
+
+    with pytest.raises(ValueError, match=f"at character {content.index('@')}:"):
+        list(iter_load(fp, format="array"))
+    # Stopped at the malformed record rather than buffering the rest of the file
+    assert fp.tell() <= content.index("@") + 2 * jsonstream._CHUNK
+
+
+def test_unknown_format() -> None:
+    with pytest.raises(ValueError, match="Unknown format"):
+        dump_many([], io.StringIO(), format="csv")
+    with pytest.raises(ValueError, match="Unknown format"):
+        iter_load(io.StringIO(), format="csv")
@@ -0,0 +1,82 @@
+"""
+Tests for parallel parsing.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from madonna import ParseResult, Version, parse_many
+
+
+def random_strings(n: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    strings = []
+    for _ in range(n):
+        string = f"{rng.choice(['', 'v'])}{rng.randint(0, 9)}.{rng.randint(0, 99)}.{rng.randint(0, 999)}"
+        string += rng.choice(["", "", "-rc.1", "-alpha.beta.10", "+build.5", "-rc.2+exp.sha.5114f85"])
+        if rng.random() < 0.05:
+            string = rng.choice(["", "1.2", "01.2.3", "1.2.3-", "nope", "v1.2.3.4"])
+        strings.append(string)
+    return strings
+
+
+def expected(strings: list[str]) -> ParseResult:
+    result = ParseResult([], [])
+    for index, string in enumerate(strings):
+        try:
+            result.versions.append(Version.from_string(string))
+        except ValueError:
+            result.versions.append(None)
+            result.errors.append((index, string))
+    return result
+
+
+@pytest.mark.parametrize(("workers", "chunksize"), [(1, 10_000), (1, 7), (2, 10_000), (2, 7), (3, 1)])
+def test_parse_many(workers: int, chunksize: int) -> None:
+    strings = random_strings(500)
+    result = parse_many(strings, workers=workers, chunksize=chunksize)
+    want = expected(strings)
+
+    assert result.errors
+    assert result == want
+    assert [v and v.to_tuple() for v in result.versions] == [v and v.to_tuple() for v in want.versions]
+
+
+def test_parse_many_iterable() -> None:
+    strings = random_strings(100)
+    assert parse_many(iter(strings), workers=2, chunksize=16) == expected(strings)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_empty(workers: int) -> None:
+    assert parse_many([], workers=workers) == ParseResult([], [])
+
+
+def test_parse_many_all_invalid() -> None:
+    assert parse_many(["a", "b", "c"], workers=2, chunksize=1) == ParseResult(
+        [None, None, None], [(0, "a"), (1, "b"), (2, "c")]
+    )
+
+
+@pytest.mark.parametrize(("workers", "chunksize"), [(0, 10), (2, 0)])
+def test_parse_many_invalid_arguments(workers: int, chunksize: int) -> None:
+    with pytest.raises(ValueError):
+        parse_many(["1.2.4"], workers=workers, chunksize=chunksize)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_unencodable(workers: int) -> None:
+    # Valid versions the binary encoding the workers use can't hold
+    strings = random_strings(11)
+    strings[1] = "99999999999999999999.0.0"
+    strings[4] = "not a version"
+    strings[5] = "1.2.4-" + "a" * 70_000
+    strings[10] = "1.2.4+" + "b" * 70_000
+    result = parse_many(strings, workers=workers, chunksize=3)
+
+    assert result == expected(strings)
+    assert (4, "not a version") in result.errors
+    assert result.versions[1] == Version(99999999999999999999, 0, 0)
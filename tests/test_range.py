@@ -0,0 +1,154 @@
+"""
+Tests for the Range class.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from madonna import Range, Version
+
+
+@pytest.mark.parametrize(
+    ("spec", "version", "want"),
+    [
+        (">=1.2.0", "1.2.0", True),
+        (">=1.2.0", "1.2.0+build.1", True),
+        (">=1.2.0", "1.2.0-rc.1", False),
+        (">=1.2.0", "1.1.9", False),
+        (">1.2.0", "1.2.0", False),
+        (">1.2.0", "1.2.0+build.1", False),
+        (">1.2.0", "1.2.1-rc.1", True),
+        ("<=1.2.0", "1.2.0+build.1", True),
+        ("<=1.2.0", "1.2.1-rc.1", False),
+        ("<1.2.0", "1.2.0-rc.1", True),
+        ("<1.2.0", "1.2.0", False),
+        ("=1.2.0", "1.2.0", True),
+        ("==1.2.0", "1.2.0+build.5", True),
+        ("1.2.0", "1.2.1", False),
+        ("v1.2.0", "1.2.0", True),
+        ("1.2.0-rc.1", "1.2.0-rc.1", True),
+        ("1.2.0-rc.1", "1.2.0-rc.2", False),
+        ("!=1.2.0", "1.2.0", False),
+        ("!=1.2.0", "1.2.1", True),
+        ("!=1.2.0", "1.1.0", True),
+        ("1.2", "1.2.9", True),
+        ("1.2.x", "1.2.0", True),
+        ("1.2.*", "1.3.0", False),
+        ("1.2", "1.2.0-rc.1", False),
+        ("1", "1.9.9", True),
+        ("1.x.x", "2.0.0-rc.1", False),
+        ("*", "0.0.1-alpha", True),
+        ("x", "99.0.0", True),
+        ("<*", "1.0.0", False),
+        (">1.2", "1.3.0-rc.1", True),
+        (">1.2", "1.2.9", False),
+        ("<1.2", "1.2.0-rc.1", False),
+        ("<1.2", "1.1.99", True),
+        ("<=1.2", "1.2.99", True),
+        ("<=1.2", "1.3.0-alpha", False),
+        (">=1.2", "1.2.0", True),
+        ("!=1.2", "1.2.5", False),
+        ("!=1.2", "1.3.0", True),
+        ("~2.3.1", "2.3.1", True),
+        ("~2.3.1", "2.3.9", True),
+        ("~2.3.1", "2.3.0", False),
+        ("~2.3.1", "2.4.0", False),
+        ("~2.3.1", "2.4.0-rc.1", False),
+        ("~2.3", "2.3.0", True),
+        ("~2", "2.9.0", True),
+        ("~2", "3.0.0", False),
+        ("~>2.3", "2.3.5", True),
+        ("^1.4", "1.4.0", True),
+        ("^1.4", "1.99.0", True),
+        ("^1.4", "1.3.9", False),
+        ("^1.4", "2.0.0-rc.1", False),
+        ("^1.4", "2.0.0", False),
+        ("^0.2.3", "0.2.9", True),
+        ("^0.2.3", "0.3.0", False),
+        ("^0.0.3", "0.0.3", True),
+        ("^0.0.3", "0.0.4", False),
+        ("^0.0", "0.0.9", True),
+        ("^0.0", "0.1.0", False),
+        ("^0", "0.9.9", True),
+        ("^0", "1.0.0", False),
+        ("^*", "5.0.0", True),
+        ("^1.2.3-beta.2", "1.2.3-beta.3", True),
+        ("^1.2.3-beta.2", "1.2.3-beta.1", False),
+        ("^1.2.3-beta.2", "1.2.3", True),
+        (">=1.2.0,<2.0.0", "1.9.9", True),
+        (">=1.2.0,<2.0.0", "2.0.0", False),
+        (">=1.2.0 <2.0.0", "1.1.0", False),
+        (">= 1.2.0, < 2.0.0", "1.5.0", True),
+        (">2.0.0 <1.0.0", "1.5.0", False),
+        ("1.2.3 - 2.3.4", "2.3.4", True),
+        ("1.2.3 - 2.3.4", "1.2.2", False),
+        ("1.2.3 - 2.3", "2.3.9", True),
+        ("1.2.3 - 2.3", "2.4.0", False),
+        ("^1.0 || ^3.0", "3.1.0", True),
+        ("^1.0 || ^3.0", "2.1.0", False),
+        ("<1.0.0 || >=1.5.0 <1.6.0 || 3.x", "1.5.5", True),
+        ("<1.0.0 || >=1.5.0 <1.6.0 || 3.x", "0.9.0", True),
+        ("<1.0.0 || >=1.5.0 <1.6.0 || 3.x", "1.6.0", False),
+        ("<1.0.0 || >=1.5.0 <1.6.0 || 3.x", "4.0.0", False),
+        ("!=1.0.0, !=1.1.0", "1.1.0", False),
+        ("!=1.0.0, !=1.1.0", "1.0.5", True),
+    ],
+)
+def test_contains(spec: str, version: str, want: bool) -> None:
+    r = Range(spec)
+    v = Version.from_string(version)
+    assert r.contains(v) is want
+    assert (v in r) is want
+    assert r.filter([v]) == ([v] if want else [])
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "",
+        "   ",
+        "1.2.3 ||",
+        "nope",
+        ">=1.2.3abc",
+        "1.2-rc.1",
+        "01.2.3",
+        "=>1.2.3",
+    ],
+)
+def test_invalid(spec: str) -> None:
+    with pytest.raises(ValueError, match="Invalid range"):
+        Range(spec)
+
+
+def test_filter() -> None:
+    versions = [Version.from_string(v) for v in ["1.0.0", "1.2.3", "2.0.0-rc.1", "1.9.9+build", "0.9.0", "2.0.0"]]
+    assert [str(v) for v in Range("^1.2").filter(versions)] == ["v1.2.3", "v1.9.9+build"]
+    assert [str(v) for v in Range("<1.0.0 || >=2.0.0").filter(versions)] == ["v0.9.0", "v2.0.0"]
+    assert Range(">3.0.0").filter(versions) == []
+
+
+def test_filter_iterable() -> None:
+    versions = (Version(1, minor, 0) for minor in range(10))
+    assert Range("~1.3 || ~1.7").filter(versions) == [Version(1, 3, 0), Version(1, 7, 0)]
+
+
+def test_contains_raises_on_non_version() -> None:
+    with pytest.raises(TypeError):
+        assert "1.2.3" in Range("^1.0")
+
+
+def test_repr_str() -> None:
+    r = Range(">=1.2.0,<2.0.0")
+    assert repr(r) == "Range('>=1.2.0,<2.0.0')"
+    assert str(r) == ">=1.2.0,<2.0.0"
+
+
+def test_eq_normalised() -> None:
+    assert Range("^1.2") == Range("^1.2.0 || 1.5.x")
+    assert Range("~1.2") == Range("1.2.x")
+    assert Range("1.2.3 - 2.3.4") == Range(">=1.2.3,<=2.3.4")
+    assert Range("^1.2") != Range("^1.3")
+    assert len({Range("^1.2"), Range(">=1.2.0 || ^1.2.0 <1.9.0, ^1")}) == 2
+    assert len({Range("~1.2"), Range("1.2.x")}) == 1
+    assert Range("^1.2") != "^1.2"
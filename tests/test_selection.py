@@ -0,0 +1,85 @@
+"""
+Tests for selecting versions without sorting.
+"""
+
+from __future__ import annotations
+
+import functools
+
+import pytest
+
+from madonna import LazyVersion, Version, latest_by, nlargest, nsmallest
+from tests import helpers
+
+random_versions = functools.partial(
+    helpers.random_versions,
+    majors=range(5),
+    minors=range(5),
+    patches=range(5),
+    builds=(None, None, "build.1", "build.2"),
+)
+
+
+def same(got: list[Version], want: list[Version]) -> bool:
+    # Picks the very same objects, not just equal ones
+    return len(got) == len(want) and all(g is w for g, w in zip(got, want))
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 100, 2000])
+def test_nlargest(k: int) -> None:
+    versions = random_versions(1000)
+    assert same(nlargest(k, versions), sorted(versions, reverse=True)[:k])
+    assert same(nlargest(k, iter(versions)), sorted(versions, reverse=True)[:k])
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 100, 2000])
+def test_nsmallest(k: int) -> None:
+    versions = random_versions(1000)
+    assert same(nsmallest(k, versions), sorted(versions)[:k])
+    assert same(nsmallest(k, iter(versions)), sorted(versions)[:k])
+
+
+def test_empty() -> None:
+    assert nlargest(3, []) == []
+    assert nsmallest(3, []) == []
+    assert latest_by([]) == {}
+
+
+def expected_latest(versions: list[Version], length: int, include_prerelease: bool) -> dict[tuple[int, ...], Version]:
+    lines: dict[tuple[int, ...], list[Version]] = {}
+    for version in versions:
+        if include_prerelease or version.prerelease is None:
+            line = (version.major,) if length == 1 else (version.major, version.minor)
+            lines.setdefault(line, []).append(version)
+    return {line: sorted(lines[line], reverse=True)[0] for line in sorted(lines)}
+
+
+@pytest.mark.parametrize(("level", "length"), [("major", 1), ("minor", 2)])
+@pytest.mark.parametrize("include_prerelease", [True, False])
+def test_latest_by(level: str, length: int, include_prerelease: bool) -> None:
+    versions = random_versions(1000)
+    got = latest_by(versions, level, include_prerelease=include_prerelease)
+    want = expected_latest(versions, length, include_prerelease)
+
+    assert list(got) == list(want)
+    assert all(got[line] is want[line] for line in want)
+
+
+def test_latest_by_keeps_first_of_equals() -> None:
+    first, second = Version(1, 2, 4), Version(1, 2, 4)
+    assert latest_by([first, second])[(1,)] is first
+
+
+def test_lazy_versions() -> None:
+    versions = [LazyVersion(s) for s in ("1.2.4", "0.7.6", "1.3.0-rc.1", "1.2.5")]
+    assert [str(v) for v in nlargest(2, versions)] == ["1.3.0-rc.1", "1.2.5"]
+    assert {line: str(v) for line, v in latest_by(versions, "minor").items()} == {
+        (0, 7): "0.7.6",
+        (1, 2): "1.2.5",
+        (1, 3): "1.3.0-rc.1",
+    }
+
+
+def test_latest_by_invalid_level() -> None:
+    with pytest.raises(ValueError, match="Unknown level"):
+        latest_by([Version(1, 2, 4)], "patch")
@@ -0,0 +1,56 @@
+"""
+Tests for sorting versions by bucketing them.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from madonna import LazyVersion, Version, sort_versions
+from tests import helpers
+
+
+def random_versions(n: int, cores: int) -> list[Version]:
+    # Each part up to `cores`, so the fewer there are the more versions share one
+    parts = range(cores + 1)
+    return helpers.random_versions(
+        n,
+        majors=parts,
+        minors=parts,
+        patches=parts,
+        prereleases=(None, None, "rc.1", "rc.2", "rc.10", "alpha", "alpha.beta"),
+        builds=(None, None, "build.1", "build.2"),
+    )
+
+
+def same(got: list[Version], want: list[Version]) -> bool:
+    # The very same objects in the very same order, so equal versions
+    # must have kept their relative order too
+    return len(got) == len(want) and all(g is w for g, w in zip(got, want))
+
+
+# Few distinct cores are bucketed, many go straight to sorted()
+@pytest.mark.parametrize("cores", [0, 3, 10, 1000])
+@pytest.mark.parametrize("n", [0, 1, 2, 100, 5000])
+def test_sort_versions(n: int, cores: int) -> None:
+    versions = random_versions(n, cores)
+    assert same(sort_versions(versions), sorted(versions))
+
+
+def test_sort_versions_iterator() -> None:
+    versions = random_versions(2000, 5)
+    assert same(sort_versions(iter(versions)), sorted(versions))
+
+
+def test_duplicates_keep_their_order() -> None:
+    versions = [Version(1, 2, 4) for _ in range(2000)] + [Version(1, 2, 4, buildmetadata="b") for _ in range(10)]
+    random.Random(42).shuffle(versions)
+    assert same(sort_versions(versions), sorted(versions))
+
+
+def test_lazy_versions() -> None:
+    strings = ["1.2.4", "0.7.6", "1.3.0-rc.1", "1.2.4-alpha", "1.2.4"] * 300
+    versions = [LazyVersion(s) for s in strings]
+    assert same(sort_versions(versions), sorted(versions))
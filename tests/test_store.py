@@ -0,0 +1,107 @@
+"""
+Tests for the memory-mapped VersionStore.
+"""
+
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from madonna import Range, Version, VersionIndex, VersionStore, write_store
+from tests import helpers
+
+random_versions = functools.partial(
+    helpers.random_versions,
+    prereleases=(None, None, "rc.1", "rc.10", "alpha", "ünïcode"),
+    builds=(None, None, None, "build.1", ""),
+)
+
+
+@pytest.fixture
+def versions() -> list[Version]:
+    return random_versions(500)
+
+
+@pytest.fixture
+def store(tmp_path: Path, versions: list[Version]) -> Iterator[VersionStore]:
+    path = tmp_path / "versions.bin"
+    write_store(path, versions)
+    with VersionStore(path) as store:
+        yield store
+
+
+def test_sorted_and_deduplicated(store: VersionStore, versions: list[Version]) -> None:
+    expected = sorted(set(versions), key=Version.sort_key)
+    assert len(store) == len(expected)
+    assert list(store) == expected
+    assert [v.to_tuple() for v in store] == [v.to_tuple() for v in expected]
+
+
+def test_getitem(store: VersionStore) -> None:
+    everything = list(store)
+    assert store[0] == everything[0]
+    assert store[-1] == everything[-1]
+    with pytest.raises(IndexError):
+        store[len(store)]
+    with pytest.raises(IndexError):
+        store[-len(store) - 1]
+
+
+def test_contains(store: VersionStore, versions: list[Version]) -> None:
+    assert all(version in store for version in versions)
+    assert Version(9, 9, 9) not in store
+    assert Version(1, 1, 1, "rc.2") not in store
+    assert "1.2.3" not in store
+
+
+@pytest.mark.parametrize("spec", ["*", "^1.2", "~0.1.2", "<1.0.0 || >=3.1.0", ">=2.0.0-rc.1 <2.0.0", "<0.0.0", ">5"])
+def test_max_min_satisfying(store: VersionStore, versions: list[Version], spec: str) -> None:
+    index = VersionIndex(versions)
+    constraint = Range(spec)
+    assert store.max_satisfying(constraint) == index.max_satisfying(constraint)
+    assert store.min_satisfying(constraint) == index.min_satisfying(constraint)
+
+
+def test_between(store: VersionStore, versions: list[Version]) -> None:
+    index = VersionIndex(versions)
+    low, high = Version(1, 0, 0, "rc.1"), Version(2, 1, 3)
+    assert list(store.between(low, high)) == index.between(low, high)
+    assert list(store.between(high, low)) == []
+
+
+def test_empty(tmp_path: Path) -> None:
+    path = tmp_path / "empty.bin"
+    assert write_store(path, []) == 0
+    with VersionStore(path) as store:
+        assert len(store) == 0
+        assert list(store) == []
+        assert Version(1, 2, 4) not in store
+        assert store.max_satisfying(Range("*")) is None
+        assert store.min_satisfying(Range("*")) is None
+
+
+def test_repr(tmp_path: Path) -> None:
+    path = tmp_path / "versions.bin"
+    write_store(path, [Version(1, 2, 4)])
+    with VersionStore(path) as store:
+        assert repr(store) == f"VersionStore({str(path)!r})"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"MDNA", b"NOTASTORE" + bytes(16), b"MDNASTR\x01" + (5).to_bytes(8, "little")],
+)
+def test_invalid_file(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "bad.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="not a version store"):
+        VersionStore(path)
+
+
+@pytest.mark.parametrize("version", [Version(2**64, 0, 0), Version(1, 2, 4, "a" * 65535)])
+def test_write_overflow(tmp_path: Path, version: Version) -> None:
+    with pytest.raises(OverflowError):
+        write_store(tmp_path / "versions.bin", [version])
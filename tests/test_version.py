@@ -4,10 +4,27 @@ Tests for the Version class.
 
 from __future__ import annotations
 
+import bisect
+import copy
+import functools
+import pickle
+import random
+from typing import Iterator
+
 import pytest
 
-from madonna import Version
-from madonna.version import VersionDict, VersionTuple
+from madonna import (
+    CacheInfo,
+    LazyVersion,
+    Version,
+    cache_clear,
+    cache_info,
+    compare,
+    is_valid_string,
+    set_cache_size,
+    validate_many,
+)
+from madonna.version import VersionDict, VersionTuple, _semver_regex
 
 
 def test_version_init() -> None:
@@ -19,6 +36,68 @@ def test_version_init() -> None:
     assert v.buildmetadata == "build.123"
 
 
+@pytest.mark.parametrize("field", ["major", "minor", "patch", "prerelease", "buildmetadata"])
+def test_version_is_immutable(field: str) -> None:
+    v = Version(1, 2, 4, "rc.1", "build.123")
+
+    with pytest.raises(AttributeError):
+        setattr(v, field, 2)
+
+    with pytest.raises(AttributeError):
+        delattr(v, field)
+
+    assert v == Version(1, 2, 4, "rc.1", "build.123")
+
+
+def test_version_copy_and_pickle() -> None:
+    v = Version(1, 2, 4, "rc.1", "build.123")
+    assert copy.copy(v) == v
+    assert copy.deepcopy(v) == v
+    assert pickle.loads(pickle.dumps(v)) == v
+
+
+@pytest.mark.parametrize(
+    ("version", "fields"),
+    [
+        (Version(1, 2, 4), (1, 2, 4)),
+        (Version(1, 2, 4, "rc.1"), (1, 2, 4, "rc.1")),
+        (Version(1, 2, 4, None, "build.1"), (1, 2, 4, None, "build.1")),
+        (Version(1, 2, 4, "rc.1", "build.1"), (1, 2, 4, "rc.1", "build.1")),
+    ],
+)
+def test_version_pickle_compact(version: Version, fields: tuple[object, ...]) -> None:
+    hash(version)
+    _, args = version.__reduce__()
+    assert args == fields
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        restored = pickle.loads(pickle.dumps(version, protocol=protocol))
+        assert type(restored) is Version
+        assert restored.to_tuple() == version.to_tuple()
+        assert restored.sort_key() == version.sort_key()
+        assert hash(restored) == hash(version)
+
+
+def test_version_pickle_size() -> None:
+    versions = [Version(1, 2, patch) for patch in range(100)]
+    assert len(pickle.dumps(versions, protocol=pickle.HIGHEST_PROTOCOL)) < 100 * 16
+
+
+class SubVersion(Version):
+    """
+    A Version subclass, to check pickling keeps the type.
+    """
+
+    __slots__ = ()
+
+
+def test_version_subclass_pickle() -> None:
+    v = SubVersion(1, 2, 4, "rc.1")
+    restored = pickle.loads(pickle.dumps(v))
+    assert type(restored) is SubVersion
+    assert restored == v
+
+
 def test_version_repr() -> None:
     v = Version(1, 2, 4, "rc.1", "build.123")
     want = "Version(major=1, minor=2, patch=4, prerelease='rc.1', buildmetadata='build.123')"
@@ -31,6 +110,18 @@ def test_version_hash() -> None:
     assert hash(v) == want
 
 
+def test_version_hash_is_cached() -> None:
+    v = Version(1, 2, 4, "rc.1", "build.123")
+    assert not hasattr(v, "_hash")
+    assert hash(v) == hash(v) == v._hash
+
+
+def test_version_hash_dedup() -> None:
+    versions = [Version(1, 2, 4), Version.from_string("1.2.4"), Version(1, 2, 4, "rc.1"), Version(1, 2, 4, "rc.1")]
+    assert len(set(versions)) == 2
+    assert {v: str(v) for v in versions} == {Version(1, 2, 4): "v1.2.4", Version(1, 2, 4, "rc.1"): "v1.2.4-rc.1"}
+
+
 @pytest.mark.parametrize(
     ("major", "minor", "patch"),
     [
@@ -44,6 +135,25 @@ def test_version_raises_less_than_zero(major: int, minor: int, patch: int) -> No
         Version(major, minor, patch)
 
 
+@pytest.mark.parametrize(
+    ("prerelease", "buildmetadata"),
+    [
+        (1, None),
+        (None, 2),
+        (["rc", "1"], None),
+        (b"rc.1", "build.2"),
+    ],
+)
+def test_version_raises_if_suffix_not_str(prerelease: object, buildmetadata: object) -> None:
+    with pytest.raises(TypeError, match="must be strings or None"):
+        Version(1, 2, 4, prerelease, buildmetadata)  # type: ignore[arg-type]
+
+
+def test_from_json_raises_if_suffix_not_str() -> None:
+    with pytest.raises(TypeError, match="must be strings or None"):
+        Version.from_json('{"major": 1, "minor": 2, "patch": 3, "prerelease": 1}')
+
+
 @pytest.mark.parametrize(
     ("version", "string"),
     [
@@ -245,79 +355,166 @@ def test_ge_notimplemented() -> None:
 @pytest.mark.parametrize(
     ("v1", "v2", "want"),
     [
-        (Version(1, 0, 0, "equal"), Version(1, 0, 0, "equal"), 0),
-        (Version(1, 0, 0, "pre1"), Version(1, 0, 0, "hello1"), 0),
-        (Version(1, 0, 0, "pre"), Version(1, 0, 0), -1),
-        (Version(1, 0, 0), Version(1, 0, 0, "pre"), 1),
-        (Version(1, 0, 0, "pre1"), Version(1, 0, 0, "pre2"), -1),
-        (Version(1, 0, 0, "pre2"), Version(1, 0, 0, "pre1"), 1),
+        (Version(2, 0, 0, "pre"), Version(1, 0, 0), False),
+        (Version(1, 0, 0), Version(0, 9, 9, "pre"), False),
+        (Version(1, 0, 0, "rc.2"), Version(1, 0, 0, "rc.10"), True),
+        (Version(1, 0, 0, "1"), Version(1, 0, 0, "alpha"), True),
+        (Version(1, 0, 0, "alpha"), Version(1, 0, 0, "alpha.1"), True),
     ],
 )
-def test_compare_prerelease(v1: Version, v2: Version, want: int) -> None:
-    assert v1._compare_prerelease(v2) == want
+def test_lt_precedence(v1: Version, v2: Version, want: bool) -> None:
+    assert (v1 < v2) is want
 
 
-def test_cmp_prerelease_raises_on_non_numeric() -> None:
-    v1 = Version(1, 0, 0, "pre")
-    v2 = Version(1, 0, 0, "prepre")
+def test_sort_key() -> None:
+    v = Version(1, 2, 4, "rc.1", "build.123")
+    assert v.sort_key() == (1, 2, 4, (0, ((1, "rc"), (0, 1))), (0, ((1, "build"), (0, 123))))
+
+
+def test_sort_key_matches_operators() -> None:
+    versions = [
+        Version(1, 0, 0),
+        Version(1, 0, 0, "rc.10"),
+        Version(0, 1, 0),
+        Version(1, 0, 0, "rc.2"),
+        Version(1, 0, 0, "alpha"),
+        Version(1, 0, 0, "rc.2", "build.1"),
+        Version(0, 0, 1, None, "build.1"),
+    ]
+    by_key = sorted(versions, key=Version.sort_key)
+    assert by_key == sorted(versions)
+    assert [str(v) for v in by_key] == [
+        "v0.0.1+build.1",
+        "v0.1.0",
+        "v1.0.0-alpha",
+        "v1.0.0-rc.2+build.1",
+        "v1.0.0-rc.2",
+        "v1.0.0-rc.10",
+        "v1.0.0",
+    ]
+    assert max(versions, key=Version.sort_key) == Version(1, 0, 0)
+    assert min(versions, key=Version.sort_key) == Version(0, 0, 1, None, "build.1")
+
+
+def test_sort_key_bisect() -> None:
+    keys = [v.sort_key() for v in (Version(0, 1, 0), Version(1, 0, 0, "rc.1"), Version(1, 0, 0))]
+    assert bisect.bisect_left(keys, Version(1, 0, 0, "beta").sort_key()) == 1
+    assert bisect.bisect_right(keys, Version(1, 0, 0).sort_key()) == 3
 
-    with pytest.raises(ValueError):
-        v1._compare_prerelease(v2)
 
+@pytest.mark.parametrize(
+    ("v1", "v2", "want"),
+    [
+        (Version(1, 2, 3), Version(1, 2, 3), 0),
+        (Version(1, 2, 3, "rc.1", "build.1"), Version(1, 2, 3, "rc.1", "build.1"), 0),
+        (Version(0, 2, 3), Version(1, 2, 3), -1),
+        (Version(1, 2, 3), Version(1, 2, 2), 1),
+        (Version(1, 2, 3, "rc.1"), Version(1, 2, 3), -1),
+        (Version(1, 2, 3, "rc.10"), Version(1, 2, 3, "rc.2"), 1),
+        (Version(1, 2, 3, "rc.1", "build.1"), Version(1, 2, 3, "rc.1"), -1),
+        (Version(1, 2, 3, "rc.01"), Version(1, 2, 3, "rc.1"), 1),
+    ],
+)
+def test_compare(v1: Version, v2: Version, want: int) -> None:
+    assert v1.compare(v2) == want
+    assert compare(v1, v2) == want
+    assert v2.compare(v1) == -want
+    assert (v1 == v2) is (want == 0)
+    assert (v1 != v2) is (want != 0)
+    assert (v1 < v2) is (want < 0)
+    assert (v1 <= v2) is (want <= 0)
+    assert (v1 > v2) is (want > 0)
+    assert (v1 >= v2) is (want >= 0)
+
+
+def test_compare_raises_on_non_version() -> None:
+    with pytest.raises(TypeError):
+        Version(1, 2, 4).compare("a string")  # type: ignore[arg-type]
 
-def test_cmp_prerelease_raises_on_multiple_digits() -> None:
-    v1 = Version(1, 0, 0, "pre3")
-    v2 = Version(1, 0, 0, "pre3version4")
 
-    with pytest.raises(ValueError):
-        v1._compare_prerelease(v2)
+def test_ne_notimplemented() -> None:
+    v = Version(1, 2, 4)
 
+    with pytest.raises(TypeError):
+        assert v != "a string"
 
-def test_cmp_prerelease_rasies_if_cant_compare() -> None:
-    v1 = Version(1, 0, 0, "cantcompareme")
-    v2 = Version(1, 0, 0, "orme")
 
-    with pytest.raises(ValueError):
-        v1._compare_prerelease(v2)
+def test_compare_cmp_to_key() -> None:
+    versions = [Version(1, 0, 0), Version(1, 0, 0, "rc.1"), Version(0, 9, 0), Version(1, 0, 0, "beta.11")]
+    assert sorted(versions, key=functools.cmp_to_key(compare)) == sorted(versions, key=Version.sort_key)
+
+
+def test_equal_versions_hash_equal() -> None:
+    assert Version(1, 2, 3, "rc.01") != Version(1, 2, 3, "rc.1")
+    assert len({Version(1, 2, 3, "rc.1"), Version(1, 2, 3, "rc.1"), Version(1, 2, 3, "rc.01")}) == 2
+
+
+@pytest.mark.parametrize(
+    ("v1", "v2", "want"),
+    [
+        (Version(1, 0, 0, "equal"), Version(1, 0, 0, "equal"), 0),
+        (Version(1, 0, 0, "pre1"), Version(1, 0, 0, "hello1"), 1),
+        (Version(1, 0, 0, "pre"), Version(1, 0, 0), -1),
+        (Version(1, 0, 0), Version(1, 0, 0, "pre"), 1),
+        (Version(1, 0, 0, "pre1"), Version(1, 0, 0, "pre2"), -1),
+        (Version(1, 0, 0, "pre2"), Version(1, 0, 0, "pre1"), 1),
+        (Version(1, 0, 0, "rc.2"), Version(1, 0, 0, "rc.10"), -1),
+        (Version(1, 0, 0, "1"), Version(1, 0, 0, "alpha"), -1),
+        (Version(1, 0, 0, "alpha.1"), Version(1, 0, 0, "alpha"), 1),
+        (Version(1, 0, 0, "pre"), Version(1, 0, 0, "prepre"), -1),
+        (Version(1, 0, 0, "pre3"), Version(1, 0, 0, "pre3version4"), -1),
+        (Version(1, 0, 0, "alpha.1.2"), Version(1, 0, 0, "alpha.1.10"), -1),
+        (Version(1, 0, 0, "rc.1-hotfix.3"), Version(1, 0, 0, "rc.1-hotfix.3"), 0),
+        (Version(1, 0, 0, "rc.1-hotfix.3"), Version(1, 0, 0, "alpha.1.2"), 1),
+    ],
+)
+def test_compare_prerelease(v1: Version, v2: Version, want: int) -> None:
+    assert v1.compare(v2) == want
+    assert (v1 < v2) is (want < 0)
+    assert (v1 == v2) is (want == 0)
+    assert (v1 > v2) is (want > 0)
+
+
+def test_prerelease_precedence_spec_example() -> None:
+    # The example from https://semver.org/#spec-item-11
+    want = [
+        Version(1, 0, 0, "alpha"),
+        Version(1, 0, 0, "alpha.1"),
+        Version(1, 0, 0, "alpha.beta"),
+        Version(1, 0, 0, "beta"),
+        Version(1, 0, 0, "beta.2"),
+        Version(1, 0, 0, "beta.11"),
+        Version(1, 0, 0, "rc.1"),
+        Version(1, 0, 0),
+    ]
+    shuffled = [want[i] for i in (3, 7, 0, 5, 1, 6, 2, 4)]
+    assert sorted(shuffled) == want
+    for lower, higher in zip(want, want[1:]):
+        assert lower.compare(higher) == -1
+        assert higher.compare(lower) == 1
+        assert lower < higher
+        assert higher > lower
 
 
 @pytest.mark.parametrize(
     ("v1", "v2", "want"),
     [
         (Version(1, 0, 0, None, "equal"), Version(1, 0, 0, None, "equal"), 0),
-        (Version(1, 0, 0, None, "build1"), Version(1, 0, 0, None, "hello1"), 0),
+        (Version(1, 0, 0, None, "build1"), Version(1, 0, 0, None, "hello1"), -1),
         (Version(1, 0, 0, None, "build"), Version(1, 0, 0), -1),
         (Version(1, 0, 0), Version(1, 0, 0, None, "build"), 1),
         (Version(1, 0, 0, None, "build1"), Version(1, 0, 0, None, "build2"), -1),
         (Version(1, 0, 0, None, "build2"), Version(1, 0, 0, None, "build1"), 1),
+        (Version(1, 0, 0, None, "build"), Version(1, 0, 0, None, "buildybuild"), -1),
+        (Version(1, 0, 0, None, "build3"), Version(1, 0, 0, None, "build1ver4"), 1),
+        (Version(1, 0, 0, None, "build.9"), Version(1, 0, 0, None, "build.10"), -1),
     ],
 )
 def test_compare_build(v1: Version, v2: Version, want: int) -> None:
-    assert v1._compare_build(v2) == want
-
-
-def test_cmp_build_raises_on_non_numeric() -> None:
-    v1 = Version(1, 0, 0, None, "build")
-    v2 = Version(1, 0, 0, None, "buildybuild")
-
-    with pytest.raises(ValueError):
-        v1._compare_build(v2)
-
-
-def test_cmp_build_raises_on_multiple_digits() -> None:
-    v1 = Version(1, 0, 0, None, "build3")
-    v2 = Version(1, 0, 0, None, "build1ver4")
-
-    with pytest.raises(ValueError):
-        v1._compare_build(v2)
-
-
-def test_cmp_build_raises_if_cant_compare() -> None:
-    v1 = Version(1, 0, 0, None, "cantcompareme")
-    v2 = Version(1, 0, 0, None, "orme")
-
-    with pytest.raises(ValueError):
-        v1._compare_build(v2)
+    assert v1.compare(v2) == want
+    assert (v1 < v2) is (want < 0)
+    assert (v1 == v2) is (want == 0)
+    assert (v1 > v2) is (want > 0)
 
 
 @pytest.mark.parametrize(
@@ -464,6 +661,61 @@ def test_is_valid(version: Version, want: bool) -> None:
     assert version.is_valid() is want
 
 
+@pytest.mark.parametrize(
+    "version",
+    [
+        Version(1, 2, 4, ""),
+        Version(1, 2, 4, "", ""),
+        Version(1, 2, 4, None, ""),
+        Version(1, 2, 4, "rc.01"),
+        Version(1, 2, 4, "rc.0"),
+        Version(1, 2, 4, "rc.0a"),
+        Version(1, 2, 4, "rc..1"),
+        Version(1, 2, 4, ".rc"),
+        Version(1, 2, 4, "rc."),
+        Version(1, 2, 4, "rc.1\n"),
+        Version(1, 2, 4, "rc.1\n\n"),
+        Version(1, 2, 4, "rc.1\n", "build"),
+        Version(1, 2, 4, None, "build\n"),
+        Version(1, 2, 4, None, "01.b"),
+        Version(1, 2, 4, "rc+build"),
+        Version(1, 2, 4, "rc+build", "more"),
+        Version(1, 2, 4, "rc+"),
+        Version(1, 2, 4, "rc.\u0661"),
+        Version(1, 2, 4, "rc.\u0660\u0661"),
+        Version(1, 2, 4, "\u0661a"),
+        Version(1, 2, 4, "é"),
+        Version(1, 2, 4, None, "\u0661"),
+        Version(True, 2, 4),
+        Version(1.0, 2, 4),  # type: ignore[arg-type]
+    ],
+)
+def test_is_valid_matches_regex(version: Version) -> None:
+    assert version.is_valid() is bool(_semver_regex().match(version.to_string()))
+
+
+def test_is_valid_matches_regex_random() -> None:
+    rng = random.Random(42)
+    alphabet = "01az-.+\n\u0661é"
+
+    def identifiers() -> str | None:
+        if rng.random() < 0.2:
+            return None
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+
+    for _ in range(20_000):
+        version = Version(rng.randint(0, 10), 0, 1, identifiers(), identifiers())
+        assert version.is_valid() is bool(_semver_regex().match(version.to_string()))
+
+
+def test_is_valid_is_cached() -> None:
+    v = Version(1, 2, 4, "rc.1")
+    before = v._valid
+    assert v.is_valid()
+    assert (before, v._valid) == (None, True)
+    assert pickle.loads(pickle.dumps(v)).is_valid()
+
+
 @pytest.mark.parametrize(
     ("d", "want"),
     [
@@ -513,11 +765,98 @@ def _(string: str, want: Version) -> None:
     assert Version.from_string(string) == want
 
 
+@pytest.mark.parametrize(
+    "string",
+    [
+        "0.0.0",
+        "1.2.3",
+        "v1.2.3",
+        "v10.20.30",
+        "999999999999999999999.0.1",
+        "1.2.3\n",
+        "1.2.\u0663",
+        "01.2.3",
+        "1.02.3",
+        "1.2.03",
+        "1.2",
+        "1.2.3.4",
+        "1..3",
+        "vv1.2.3",
+        "V1.2.3",
+        " 1.2.3",
+        "1.2.3 ",
+        "a.b.c",
+        "",
+        "v",
+    ],
+)
+def test_from_string_fast_path_matches_regex(string: str) -> None:
+    match = _semver_regex().match(string)
+    if match is None:
+        with pytest.raises(ValueError, match="is not a valid semver string"):
+            Version.from_string(string)
+    else:
+        want = Version(int(match.group("major")), int(match.group("minor")), int(match.group("patch")))
+        assert Version.from_string(string) == want
+
+
 def test_from_string_raises_if_invalid() -> None:
     with pytest.raises(ValueError):
         Version.from_string("I'm not a version")
 
 
+VALIDITY_STRINGS = [
+    "0.0.0",
+    "v1.2.3",
+    "1.2.3\n",
+    "1.2.\u0663",
+    "01.2.3",
+    "1.2",
+    "1.2.3.4",
+    "",
+    "v",
+    "1.2.3-rc.1",
+    "v1.2.3-rc.1+build.123",
+    "1.0.0-alpha.beta.11",
+    "1.0.0-0A.is.legal",
+    "1.0.0-01",
+    "1.0.0-",
+    "1.0.0+",
+    "1.0.0+build..1",
+    "1.0.0-rc.1+build.1\n",
+    "1.0.0-rc\u0663",
+    "1.2.3-rc.1 ",
+    "I'm not a version",
+]
+
+
+def is_parsable(string: str) -> bool:
+    try:
+        Version.from_string(string)
+    except ValueError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("string", VALIDITY_STRINGS)
+def test_is_valid_string(string: str) -> None:
+    assert is_valid_string(string) is is_parsable(string)
+
+
+def test_validate_many() -> None:
+    mask = validate_many(iter(VALIDITY_STRINGS))
+    assert isinstance(mask, bytearray)
+    assert list(mask) == [int(is_parsable(string)) for string in VALIDITY_STRINGS]
+
+    invalid = validate_many(VALIDITY_STRINGS, indices=True)
+    assert invalid == [index for index, string in enumerate(VALIDITY_STRINGS) if not is_parsable(string)]
+
+
+def test_validate_many_empty() -> None:
+    assert validate_many([]) == bytearray()
+    assert validate_many([], indices=True) == []
+
+
 @pytest.mark.parametrize("string", ["v1.2.4", "v1.2.4-rc.1", "v1.2.4-rc.1+build.123"])
 def test_to_string_from_string_round_trip(string: str) -> None:
     assert Version.from_string(string).to_string() == string
@@ -551,3 +890,200 @@ def test_from_tuple(tup: VersionTuple, want: Version) -> None:
 )
 def test_from_json(json_string: str, want: Version) -> None:
     assert Version.from_json(json_string) == want
+
+
+@pytest.mark.parametrize(
+    "version",
+    [
+        Version(1, 2, 4),
+        Version(0, 0, 0),
+        Version(1, 2, 4, "rc.1"),
+        Version(1, 2, 4, None, "build.2"),
+        Version(1, 2, 4, "rc.1", "build.2"),
+        Version(2**64 - 1, 0, 0, "", ""),
+        Version(1, 2, 4, "ünïcode"),
+    ],
+)
+def test_bytes_round_trip(version: Version) -> None:
+    data = version.to_bytes()
+    assert Version.from_bytes(data) == version
+    assert Version.from_bytes(bytearray(data)) == version
+    assert Version.from_bytes(memoryview(data)) == version
+    assert Version.from_bytes(data).to_tuple() == version.to_tuple()
+
+
+def test_to_bytes_layout() -> None:
+    assert Version(1, 2, 4).to_bytes() == (
+        b"\x01\x00\x00\x00\x00\x00\x00\x00"
+        b"\x02\x00\x00\x00\x00\x00\x00\x00"
+        b"\x04\x00\x00\x00\x00\x00\x00\x00"
+        b"\xff\xff\xff\xff"
+    )
+    assert Version(1, 2, 4, "rc.1", "b").to_bytes()[24:] == b"\x04\x00\x01\x00rc.1b"
+
+
+@pytest.mark.parametrize(
+    "version",
+    [Version(2**64, 0, 0), Version(1, 2, 4, "a" * 65535), Version(1, 2, 4, None, "b" * 70000)],
+)
+def test_to_bytes_overflow(version: Version) -> None:
+    with pytest.raises(OverflowError):
+        version.to_bytes()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        Version(1, 2, 4).to_bytes()[:-1],
+        Version(1, 2, 4, "rc.1").to_bytes()[:-1],
+        Version(1, 2, 4, "rc.1").to_bytes() + b"\x00",
+        Version(1, 2, 4, "rc.1").to_bytes()[:-4] + b"\xff\xfe\xfd\xfc",
+    ],
+)
+def test_from_bytes_invalid(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        Version.from_bytes(data)
+
+
+@pytest.fixture
+def parse_cache() -> Iterator[None]:
+    set_cache_size(4)
+    yield
+    set_cache_size(0)
+
+
+def test_parse_cache_disabled_by_default() -> None:
+    assert Version.from_string("v1.2.4") is not Version.from_string("v1.2.4")
+    assert cache_info() == CacheInfo(0, 0, 0, 0)
+
+
+def test_parse_cache_shares_instances(parse_cache: None) -> None:
+    v = Version.from_string("v1.2.4-rc.1")
+    assert Version.from_string("v1.2.4-rc.1") is v
+    assert Version.from_string("v1.2.4") is not v
+    assert cache_info() == CacheInfo(hits=1, misses=2, maxsize=4, currsize=2)
+
+
+def test_parse_cache_is_bounded(parse_cache: None) -> None:
+    first = Version.from_string("v0.0.0")
+    for patch in range(1, 10):
+        Version.from_string(f"v0.0.{patch}")
+
+    assert cache_info().currsize == 4
+    assert Version.from_string("v0.0.0") is not first
+
+
+def test_parse_cache_does_not_cache_errors(parse_cache: None) -> None:
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            Version.from_string("I'm not a version")
+
+    assert cache_info().currsize == 0
+
+
+def test_parse_cache_clear(parse_cache: None) -> None:
+    Version.from_string("v1.2.4")
+    Version.from_string("v1.2.4")
+    cache_clear()
+    assert cache_info() == CacheInfo(hits=0, misses=0, maxsize=4, currsize=0)
+
+
+def test_parse_cache_resize(parse_cache: None) -> None:
+    Version.from_string("v1.2.4")
+    set_cache_size(16)
+    assert cache_info() == CacheInfo(hits=0, misses=0, maxsize=16, currsize=0)
+    set_cache_size(0)
+    assert cache_info() == CacheInfo(0, 0, 0, 0)
+    cache_clear()
+
+
+def test_set_cache_size_raises_if_negative() -> None:
+    with pytest.raises(ValueError):
+        set_cache_size(-1)
+
+
+def test_lazy_from_string() -> None:
+    v = Version.from_string("1.2.4-rc.1+build.2", lazy=True)
+    assert isinstance(v, LazyVersion)
+    assert repr(v) == "LazyVersion('1.2.4-rc.1+build.2')"
+
+
+@pytest.mark.parametrize("string", ["1.2.4", "v1.2.4", "v0.7.6-rc.1", "1.2.4-rc.1+build.2", "10.20.30+meta"])
+def test_lazy_str_is_not_reformatted(string: str) -> None:
+    v = LazyVersion(string)
+    assert str(v) == string
+    assert v.to_string() == string
+    # Passing through never parses
+    with pytest.raises(AttributeError):
+        object.__getattribute__(v, "_key")
+
+
+@pytest.mark.parametrize("string", ["1.2.4", "v0.7.6-rc.1", "1.2.4-rc.1+build.2", "1.0.0-alpha.beta.11"])
+def test_lazy_behaves_like_version(string: str) -> None:
+    lazy = LazyVersion(string)
+    eager = Version.from_string(string)
+
+    assert lazy.major == eager.major
+    assert lazy.minor == eager.minor
+    assert lazy.patch == eager.patch
+    assert lazy.prerelease == eager.prerelease
+    assert lazy.buildmetadata == eager.buildmetadata
+    assert lazy.to_tuple() == eager.to_tuple()
+    assert lazy.to_dict() == eager.to_dict()
+    assert lazy.sort_key() == eager.sort_key()
+    assert lazy.bump_minor() == eager.bump_minor()
+    assert hash(lazy) == hash(eager)
+    assert len({lazy, eager}) == 1
+
+
+def test_lazy_compare_and_sort() -> None:
+    strings = ["1.2.4", "0.7.6", "1.2.4-rc.1", "1.10.0", "1.2.4+build.1"]
+    lazy = [LazyVersion(string) for string in strings]
+    eager = [Version.from_string(string) for string in strings]
+
+    assert [str(v) for v in sorted(lazy)] == ["0.7.6", "1.2.4-rc.1", "1.2.4+build.1", "1.2.4", "1.10.0"]
+    assert sorted(lazy) == sorted(eager)
+    assert LazyVersion("1.2.4") < Version(1, 3, 0)
+    assert Version(1, 3, 0) > LazyVersion("1.2.4")
+
+
+def test_lazy_invalid_raises_on_use() -> None:
+    v = LazyVersion("I'm not a version")
+    assert str(v) == "I'm not a version"
+    assert not v.is_valid()
+    with pytest.raises(ValueError, match="not a valid semver string"):
+        v.major  # noqa: B018
+    with pytest.raises(ValueError, match="not a valid semver string"):
+        v < Version(1, 2, 4)  # noqa: B015
+
+
+def test_lazy_is_valid_does_not_parse() -> None:
+    v = LazyVersion("1.2.4-rc.1")
+    assert v.is_valid()
+    assert repr(v) == "LazyVersion('1.2.4-rc.1')"
+    with pytest.raises(AttributeError):
+        object.__getattribute__(v, "_major")
+
+
+def test_lazy_copy_pickle() -> None:
+    v = LazyVersion("1.2.4-rc.1")
+    for clone in (copy.copy(v), copy.deepcopy(v), pickle.loads(pickle.dumps(v))):
+        assert isinstance(clone, LazyVersion)
+        assert str(clone) == "1.2.4-rc.1"
+        assert clone == v
+
+    # And once parsed, still lazy
+    assert v.to_tuple() == (1, 2, 4, "rc.1", None)
+    clone = pickle.loads(pickle.dumps(v))
+    with pytest.raises(AttributeError):
+        object.__getattribute__(clone, "_key")
+    assert clone.to_tuple() == (1, 2, 4, "rc.1", None)
+
+
+def test_lazy_immutable() -> None:
+    v = LazyVersion("1.2.4")
+    with pytest.raises(AttributeError):
+        v.major = 2  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        v.unknown  # noqa: B018
@@ -0,0 +1,149 @@
+"""
+Tests for the packed integer backed VersionSet.
+"""
+
+from __future__ import annotations
+
+import functools
+import pickle
+
+import pytest
+
+from madonna import LazyVersion, Version, VersionSet
+from madonna.versionset import Diff
+from tests import helpers
+
+random_versions = functools.partial(
+    helpers.random_versions,
+    majors=range(5),
+    minors=range(5),
+    patches=(0, 1, 2, 2**21 - 1, 2**21, 2**40),
+    prereleases=(None, None, None, "rc.1", "rc.2", "alpha"),
+    builds=(None, None, None, "build.1", "build.2"),
+)
+
+
+def strip_build(version: Version) -> Version:
+    return Version(version.major, version.minor, version.patch, version.prerelease)
+
+
+def as_set(versions: VersionSet) -> set[Version]:
+    members = list(versions)
+    # Each version is only there once
+    assert len(members) == len(set(members)) == len(versions)
+    return set(members)
+
+
+def test_versionset() -> None:
+    versions = random_versions(2000)
+    vs = VersionSet(versions)
+
+    assert as_set(vs) == set(versions)
+    assert all(version in vs for version in versions)
+    assert all((version in vs) == (version in set(versions)) for version in random_versions(500, seed=7))
+
+
+def test_ignore_build() -> None:
+    versions = random_versions(2000)
+    vs = VersionSet(versions, ignore_build=True)
+
+    assert vs.ignore_build
+    assert as_set(vs) == {strip_build(version) for version in versions}
+    assert all(version in vs for version in versions)
+    assert Version(1, 2, 4, buildmetadata="build.1") in VersionSet([Version(1, 2, 4)], ignore_build=True)
+    assert Version(1, 2, 4, buildmetadata="build.1") not in VersionSet([Version(1, 2, 4)])
+
+
+@pytest.mark.parametrize("ignore_build", [False, True])
+def test_set_algebra(ignore_build: bool) -> None:
+    a, b = random_versions(500, seed=1), random_versions(500, seed=2)
+    va, vb = VersionSet(a, ignore_build=ignore_build), VersionSet(b, ignore_build=ignore_build)
+    normalise = strip_build if ignore_build else (lambda version: version)
+    sa, sb = {normalise(v) for v in a}, {normalise(v) for v in b}
+
+    assert as_set(va | vb) == sa | sb
+    assert as_set(va & vb) == sa & sb
+    assert as_set(va - vb) == sa - sb
+    # Plain iterables work with the methods
+    assert as_set(va.union(b)) == sa | sb
+    assert as_set(va.intersection(iter(b))) == sa & sb
+    assert as_set(va.difference(b)) == sa - sb
+
+    diff = va.diff(vb)
+    assert isinstance(diff, Diff)
+    assert as_set(diff.added) == sb - sa
+    assert as_set(diff.removed) == sa - sb
+
+
+def test_operations_leave_operands_alone() -> None:
+    va, vb = VersionSet(random_versions(100, seed=1)), VersionSet(random_versions(100, seed=2))
+    before_a, before_b = as_set(va), as_set(vb)
+    va | vb, va & vb, va - vb, va.diff(vb)
+    assert as_set(va) == before_a
+    assert as_set(vb) == before_b
+
+
+def test_mutation() -> None:
+    vs = VersionSet()
+    assert len(vs) == 0
+    assert not vs
+
+    for version in (Version(1, 2, 4), Version(1, 2, 4), Version(1, 3, 0, "rc.1"), Version(1, 3, 0, "rc.1")):
+        vs.add(version)
+    assert len(vs) == 2
+
+    copy = vs.copy()
+    vs.remove(Version(1, 2, 4))
+    vs.discard(Version(1, 3, 0, "rc.1"))
+    vs.discard(Version(9, 9, 9))
+    assert len(vs) == 0
+    assert len(copy) == 2
+    for version in (Version(1, 2, 4), Version(1, 3, 0, "rc.1")):
+        with pytest.raises(KeyError):
+            vs.remove(version)
+
+    vs.update(copy)
+    assert vs == copy
+
+
+def test_equality() -> None:
+    versions = random_versions(200)
+    assert VersionSet(versions) == VersionSet(reversed(versions))
+    assert VersionSet(versions) != VersionSet([*versions[1:], Version(9, 9, 9)])
+    assert VersionSet(versions) != VersionSet(versions, ignore_build=True)
+    assert VersionSet() != set()
+    with pytest.raises(TypeError):
+        hash(VersionSet())
+
+
+def test_mixing_ignore_build() -> None:
+    va, vb = VersionSet([Version(1, 2, 4, None, "b")]), VersionSet([Version(1, 2, 4)], ignore_build=True)
+    with pytest.raises(ValueError, match="ignores build metadata"):
+        va | vb
+    with pytest.raises(ValueError, match="ignores build metadata"):
+        va.diff(vb)
+    # Building or updating from one converts it
+    assert VersionSet(va, ignore_build=True) == vb
+    assert Version(1, 2, 4) in VersionSet(vb)
+
+
+def test_not_versions() -> None:
+    vs = VersionSet([Version(1, 2, 4)])
+    assert "1.2.4" not in vs
+    assert (1, 2, 4) not in vs
+    with pytest.raises(TypeError):
+        vs | {Version(1, 2, 4)}
+
+
+def test_lazy_versions() -> None:
+    vs = VersionSet([LazyVersion("1.2.4"), LazyVersion("1.3.0-rc.1")])
+    assert Version(1, 2, 4) in vs
+    assert LazyVersion("1.3.0-rc.1") in vs
+    assert sorted(vs) == [Version(1, 2, 4), Version(1, 3, 0, "rc.1")]
+
+
+def test_members_are_real_versions() -> None:
+    (version,) = VersionSet([Version(1, 2, 4)])
+    assert type(version) is Version
+    assert pickle.loads(pickle.dumps(version)) == version
+    assert version.is_valid()